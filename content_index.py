@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+정규화 본문 해시 + 영구 해시 인덱스
+- 본문을 NFC 정규화 → 소문자화 → 공백 정리한 뒤 해시 (content_hash)
+- 회사/크롤링 실행을 가리지 않고 한 번 적재된 본문 해시를 SQLite 에 기록
+- 새로 수집한 행 중 이미 코퍼스 어딘가에 있는 본문은 저장 전에 제거
+
+사용법:
+    python content_index.py build                 # 기존 코퍼스(10개사 + 링글 수집분)로 인덱스 채우기
+    python content_index.py info                  # 인덱스 현황
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+import pandas as pd
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_PATH = os.path.join(DATA_DIR, '.content_index.sqlite')
+HASH_COLUMN = 'content_hash'
+
+# 인덱스 구축 시 함께 넣을 링글 수집 파일 (경로, 본문 컬럼, 소스명)
+RINGLE_SOURCES = [
+    ('ringle_reviews.csv', 'text', 'ringle_review_crawler'),
+    (os.path.join('ringle', 'blog', 'naver', 'ringle_naver_blog.csv'), 'content', 'naver_blog'),
+]
+
+_WHITESPACE = re.compile(r'\s+')
+
+_conn = None
+_conn_path = None
+_lock = threading.Lock()
+
+
+def normalize_content(text):
+    """해시용 본문 정규화 (NFC + 소문자 + 공백 정리)"""
+    text = unicodedata.normalize('NFC', text)
+    return _WHITESPACE.sub(' ', text.lower()).strip()
+
+
+def content_hash(text):
+    """정규화 본문 해시 (128비트 hex), 본문이 없으면 None"""
+    if not isinstance(text, str):
+        return None
+    normalized = normalize_content(text)
+    if not normalized:
+        return None
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def hash_column(texts):
+    """텍스트 컬럼 → content_hash 리스트"""
+    return [content_hash(t) for t in texts]
+
+
+def _get_conn(path):
+    """인덱스 DB 연결 (호출 측에서 _lock 보유)"""
+    global _conn, _conn_path
+    if _conn is None or _conn_path != path:
+        if _conn is not None:
+            _conn.close()
+        _conn = sqlite3.connect(path, check_same_thread=False)
+        _conn_path = path
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS content_hashes (
+                hash TEXT PRIMARY KEY,
+                company TEXT,
+                source TEXT,
+                first_seen REAL
+            ) WITHOUT ROWID
+        """)
+        _conn.commit()
+    return _conn
+
+
+def known_hashes(hashes, exclude_source=None, path=INDEX_PATH):
+    """인덱스에 이미 있는 해시 집합 (exclude_source 가 기록한 해시는 제외)"""
+    hashes = list({h for h in hashes if h})
+    found = set()
+    with _lock:
+        conn = _get_conn(path)
+        # SQLite 바인딩 변수 개수 제한 안에서 나눠 조회
+        # source 가 NULL 인 행도 포함되도록 exclude_source 가 있을 때만 조건 추가
+        source_clause = " AND source IS NOT ?" if exclude_source is not None else ""
+        for start in range(0, len(hashes), 500):
+            batch = hashes[start:start + 500]
+            placeholders = ','.join('?' * len(batch))
+            params = batch + [exclude_source] if exclude_source is not None else batch
+            found.update(row[0] for row in conn.execute(
+                f"SELECT hash FROM content_hashes WHERE hash IN ({placeholders}){source_clause}", params
+            ))
+    return found
+
+
+def register_hashes(hashes, company=None, source=None, replace=False, path=INDEX_PATH):
+    """해시 등록 (이미 있으면 최초 기록 유지) → 새로 등록된 개수
+
+    replace=True 면 같은 source 의 기존 해시를 지우고 다시 등록 (파일 전체를 새로 쓴 경우)
+    """
+    now = time.time()
+    rows = [(h, company, source, now) for h in dict.fromkeys(hashes) if h]
+    with _lock:
+        conn = _get_conn(path)
+        if replace:
+            conn.execute("DELETE FROM content_hashes WHERE source = ?", (source,))
+        before = conn.total_changes
+        conn.executemany("INSERT OR IGNORE INTO content_hashes VALUES (?, ?, ?, ?)", rows)
+        conn.commit()
+        return conn.total_changes - before
+
+
+def drop_known(df, text_column, source=None, rewrite=False, path=INDEX_PATH):
+    """content_hash 컬럼을 붙이고, 인덱스에 이미 있거나 프레임 안에서 겹치는 본문 행 제거
+
+    rewrite=True: 이 source 의 파일을 통째로 다시 쓰는 경우 - 자기 source 가 기록한 해시는
+                  (곧 덮어쓸 기존 파일 내용이므로) 비교에서 제외하고 다른 소스/회사와만 비교
+    본문이 비어 있는 행(해시 None)은 비교하지 않고 그대로 유지.
+    인덱스 등록은 저장이 끝난 뒤 register_frame 으로 (저장 실패 시 다음 실행에서 다시 수집되도록)
+    """
+    df = df.copy()
+    df[HASH_COLUMN] = hash_column(df[text_column])
+    hashes = df[HASH_COLUMN]
+
+    known = known_hashes(hashes.dropna(), source if rewrite else None, path)
+    duplicated = hashes.notna() & (hashes.isin(known) | hashes.duplicated())
+    if duplicated.any():
+        print(f"   ♻️ 이미 적재된 본문 {int(duplicated.sum())}개 제외 (content_hash)")
+    return df[~duplicated].reset_index(drop=True)
+
+
+def register_frame(df, company=None, source=None, rewrite=False, path=INDEX_PATH):
+    """저장된 프레임의 content_hash 를 인덱스에 등록 (rewrite=True 면 source 의 기존 해시 교체)"""
+    return register_hashes(df[HASH_COLUMN].dropna(), company, source, rewrite, path)
+
+
+def build_index(data_dir=DATA_DIR, path=INDEX_PATH):
+    """기존 코퍼스 전체로 인덱스 채우기 → {소스: 신규 등록 수}"""
+    from corpus_loader import load_corpus
+
+    added = {}
+    corpus = load_corpus(data_dir)
+    for company, group in corpus.groupby('company', observed=True):
+        added[str(company)] = register_hashes(hash_column(group['text']), str(company),
+                                              'master_data', path=path)
+
+    for rel_path, text_column, source in RINGLE_SOURCES:
+        csv_path = os.path.join(data_dir, rel_path)
+        if not os.path.exists(csv_path):
+            continue
+        texts = pd.read_csv(csv_path, usecols=[text_column])[text_column]
+        added[source] = register_hashes(hash_column(texts), 'ringle', source, path=path)
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description='본문 해시 인덱스')
+    parser.add_argument('command', choices=['build', 'info'])
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        for source, count in build_index().items():
+            print(f"   - {source}: {count:,}개 등록")
+        print(f"✅ 인덱스 갱신: {INDEX_PATH}")
+    else:
+        with _lock:
+            rows = _get_conn(INDEX_PATH).execute(
+                "SELECT company, COUNT(*) FROM content_hashes GROUP BY company ORDER BY 2 DESC"
+            ).fetchall()
+        print(f"총 {sum(n for _, n in rows):,}개 해시")
+        for company, count in rows:
+            print(f"   - {company}: {count:,}개")
+
+
+if __name__ == '__main__':
+    main()
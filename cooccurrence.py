@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+희소 행렬 기반 키워드 동시출현 계산
+- 문서(또는 문장) × 키워드 이진 행렬 B 를 만들고 쌍별 동시출현 = B.T @ B (상삼각만 사용)
+- 키워드 모드: 핵심 키워드 목록의 부분 문자열 포함 여부 (cooccurrence_network.csv 방식)
+- 토큰 모드: keyword_engine 의 문서-단어 행렬을 문서 빈도 상위 max_terms 개 단어로 잘라서 사용
+- 회사별 동시출현은 회사 행만 잘라 같은 곱셈을 반복 (프레임 재필터링/쌍 루프 없음)
+
+사용법:
+    python cooccurrence.py                              # cooccurrence_network.csv 재생성
+    python cooccurrence.py --window sentence --by-company --output-dir /tmp/co
+    python cooccurrence.py --tokens --max-terms 2000    # 키워드 목록 대신 전체 어휘
+"""
+
+import argparse
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from keyword_engine import STOPWORDS, build_dtm
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 핵심 키워드 45개 (학습방식/튜터/시험/가격/콘텐츠/시간/효과/AI/동기 카테고리)
+CORE_KEYWORDS = [
+    '영어', '공부', '학습', '수업', '회화', '단어', '발음', '문법', '표현', '대화',
+    '튜터', '선생님', '원어민', '강의', '피드백',
+    '토익', '시험', '점수', '오픽',
+    '가격', '할인', '결제', '구독', '환불', '무료',
+    '콘텐츠', '앱', '영상', '레벨',
+    '시간', '예약', '매일', '습관',
+    '실력', '효과', '도움', '자신감', '추천', '불편', '만족',
+    'AI', '직장', '비즈니스', '취업', '해외',
+]
+
+WINDOWS = ('document', 'sentence')
+
+# 문장 경계 (마침표/물음표/느낌표 뒤 공백, 줄바꿈)
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+|\n+')
+
+TOP_PAIRS = 30
+MAX_TERMS = 1000        # 토큰 모드에서 남길 단어 수 (문서 빈도 상위)
+
+OUTPUT_DIRS = ['phase/03_deep_insights/data', 'analysis/05_data']
+
+
+def split_units(texts, labels=None, window='document'):
+    """동시출현 단위로 분할 → (단위 텍스트 리스트, 단위별 라벨 리스트 또는 None)"""
+    if window not in WINDOWS:
+        raise ValueError(f"window must be one of {WINDOWS}: {window}")
+    texts = ['' if not isinstance(t, str) else t for t in texts]
+    if window == 'document':
+        return texts, None if labels is None else list(labels)
+
+    units = []
+    unit_labels = []
+    for text, label in zip(texts, [None] * len(texts) if labels is None else labels):
+        for sentence in SENTENCE_SPLIT.split(text):
+            if sentence.strip():
+                units.append(sentence)
+                unit_labels.append(label)
+    return units, None if labels is None else unit_labels
+
+
+def keyword_matrix(texts, keywords=CORE_KEYWORDS):
+    """단위 × 키워드 이진 CSR 행렬 (키워드가 부분 문자열로 포함되면 1, 영문은 대소문자 무시)"""
+    series = pd.Series(texts, dtype='string').fillna('')
+    lowered = series.str.lower()
+    columns = []
+    for keyword in keywords:
+        target = lowered if keyword.isascii() else series
+        columns.append(sparse.csr_matrix(target.str.contains(keyword.lower(), regex=False)
+                                         .to_numpy(dtype=np.int32)[:, None]))
+    return sparse.hstack(columns, format='csr'), list(keywords)
+
+
+def binarize(X):
+    """출현 횟수 → 출현 여부 (0/1)"""
+    B = sparse.csr_matrix(X, dtype=np.int32, copy=True)
+    B.data[:] = 1
+    B.eliminate_zeros()
+    return B
+
+
+def prune_terms(B, vocab, max_terms=MAX_TERMS, stopwords=STOPWORDS):
+    """불용어 제외 후 문서 빈도 상위 max_terms 개 열만 남김 (B.T @ B 크기를 max_terms² 이하로 제한)"""
+    doc_freq = np.asarray(B.sum(axis=0)).ravel()
+    keep = np.array([token not in stopwords for token in vocab], dtype=bool) & (doc_freq > 0)
+    candidates = np.flatnonzero(keep)
+    order = candidates[np.argsort(-doc_freq[candidates], kind='stable')[:max_terms]]
+    order.sort()
+    return B[:, order], [vocab[i] for i in order]
+
+
+def cooccurrence_counts(B):
+    """이진 행렬 → 쌍별 동시출현 (상삼각, 대각 제외) COO 행렬"""
+    return sparse.triu(B.T @ B, k=1).tocoo()
+
+
+def top_pairs(C, vocab, top=TOP_PAIRS, min_count=1):
+    """동시출현 상위 쌍 → DataFrame(keyword1, keyword2, count), 쌍 내부는 가나다순"""
+    first = np.array(vocab, dtype=object)[C.row]
+    second = np.array(vocab, dtype=object)[C.col]
+    swap = first > second
+    pairs = pd.DataFrame({
+        'keyword1': np.where(swap, second, first),
+        'keyword2': np.where(swap, first, second),
+        'count': C.data.astype(np.int64),
+    })
+    pairs = pairs[pairs['count'] >= min_count]
+    pairs = pairs.sort_values(['count', 'keyword1', 'keyword2'], ascending=[False, True, True])
+    return pairs.head(top).reset_index(drop=True)
+
+
+def cooccurrence(texts, labels=None, keywords=CORE_KEYWORDS, window='document',
+                 by_group=False, max_terms=MAX_TERMS, top=TOP_PAIRS):
+    """키워드 동시출현 상위 쌍
+
+    Args:
+        keywords: 핵심 키워드 목록 (None 이면 토큰 모드 - 전체 어휘를 max_terms 개로 잘라 사용)
+        window: 'document' (리뷰 단위) / 'sentence' (문장 단위)
+        by_group: True 면 labels(회사 등) 별로 각각 상위 top 쌍 (첫 컬럼 'company')
+
+    Returns:
+        DataFrame(keyword1, keyword2, count) 또는 DataFrame(company, keyword1, keyword2, count)
+    """
+    units, unit_labels = split_units(texts, labels, window)
+    if keywords is None:
+        X, vocab = build_dtm(units)
+        B, vocab = prune_terms(binarize(X), vocab, max_terms)
+    else:
+        B, vocab = keyword_matrix(units, keywords)
+
+    if not by_group:
+        return top_pairs(cooccurrence_counts(B), vocab, top)
+
+    if unit_labels is None:
+        raise ValueError("by_group=True 에는 labels 가 필요합니다")
+    codes, groups = pd.factorize(pd.Series(unit_labels).astype(str))
+    frames = []
+    for g, group in enumerate(groups):
+        pairs = top_pairs(cooccurrence_counts(B[codes == g]), vocab, top)
+        pairs.insert(0, 'company', group)
+        frames.append(pairs)
+    return pd.concat(frames, ignore_index=True)
+
+
+def main():
+    from corpus_loader import load_corpus
+
+    parser = argparse.ArgumentParser(description='키워드 동시출현 네트워크')
+    parser.add_argument('--window', choices=WINDOWS, default='document',
+                        help='동시출현 단위 (document: 리뷰, sentence: 문장)')
+    parser.add_argument('--by-company', action='store_true', help='회사별 상위 쌍')
+    parser.add_argument('--tokens', action='store_true', help='핵심 키워드 대신 전체 어휘 사용')
+    parser.add_argument('--max-terms', type=int, default=MAX_TERMS, help='토큰 모드 어휘 수 (문서 빈도 상위)')
+    parser.add_argument('--top', type=int, default=TOP_PAIRS, help='출력할 쌍 개수 (회사별이면 회사마다)')
+    parser.add_argument('--output-dir', help='저장 위치 (기본: 기존 산출물 위치)')
+    args = parser.parse_args()
+
+    df = load_corpus()
+    print(f"📊 코퍼스: {len(df):,}건 (단위: {args.window})")
+
+    labels = df['company'].astype(str).str.lower() if args.by_company else None
+    pairs = cooccurrence(df['text'], labels, None if args.tokens else CORE_KEYWORDS,
+                         args.window, args.by_company, args.max_terms, args.top)
+
+    name = 'cooccurrence_network_by_company.csv' if args.by_company else 'cooccurrence_network.csv'
+    dirs = [args.output_dir] if args.output_dir else [os.path.join(DATA_DIR, d) for d in OUTPUT_DIRS]
+    for out_dir in dirs:
+        os.makedirs(out_dir, exist_ok=True)
+        path = os.path.join(out_dir, name)
+        pairs.to_csv(path, index=False, encoding='utf-8')
+        print(f"✅ {path} ({len(pairs)}행)")
+
+
+if __name__ == '__main__':
+    main()
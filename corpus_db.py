@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+임베디드 SQLite 분석 저장소 + 질의 CLI
+- 회사별 *_master_data.csv 와 크롤러 산출물(링글 리뷰/네이버 블로그)을 하나의 documents 테이블로 적재
+- company / source_platform / date 인덱스 + 본문 전문 검색(FTS5 trigram, 한국어 부분 문자열 검색)
+- "2025년 uphone 플레이스토어 부정 리뷰 중 '환불' 언급 수" 같은 질의를 CSV 재파싱 없이 바로 실행
+
+사용법:
+    python corpus_db.py ingest                                   # CSV → corpus.sqlite (전체 재생성)
+    python corpus_db.py info                                     # 적재 현황
+    python corpus_db.py query --company uphone --platform playstore --year 2025 \\
+        --negative --contains 환불 --count
+    python corpus_db.py query --contains 가격 --group-by company source_platform
+    python corpus_db.py sql "SELECT company, AVG(rating) FROM documents GROUP BY company"
+"""
+
+import argparse
+import glob
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+import pandas as pd
+
+from content_index import RINGLE_SOURCES, hash_column
+from corpus_schema import MASTER_COLUMNS, parse_dates
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(DATA_DIR, 'corpus.sqlite')
+MASTER_GLOB = os.path.join('*', '*_master_data.csv')
+
+# 저장 컬럼 (master_data 컬럼 + 원본 파일 + 정규화 본문 해시)
+DB_COLUMNS = MASTER_COLUMNS + ['source_file', 'content_hash']
+
+# 크롤러 CSV 의 플랫폼 표기 → master_data 표기
+PLATFORM_ALIASES = {'google_play': 'playstore', 'app_store': 'appstore'}
+PLATFORM_SOURCE_TYPES = {
+    'playstore': 'review', 'appstore': 'review',
+    'blind': 'community', 'clien': 'community',
+    'naver_blog': 'blog', 'tistory': 'blog', 'brunch': 'blog',
+}
+
+# FTS5 trigram 은 3글자 이상 검색어만 색인 검색 가능 (더 짧으면 LIKE 로 대체)
+FTS_MIN_CHARS = 3
+
+QUERY_COLUMNS = ['company', 'source_platform', 'date', 'rating', 'title', 'text']
+NEGATIVE_MAX_RATING = 2
+
+
+def normalize_platform(value):
+    """'Google Play' / 'Naver Blog' 같은 표기 → 'playstore' / 'naver_blog'"""
+    if not isinstance(value, str):
+        return None
+    value = value.strip().lower().replace(' ', '_')
+    return PLATFORM_ALIASES.get(value, value)
+
+
+def _read_crawler_output(path, text_column, source):
+    """크롤러 CSV → master_data 컬럼 구성 (링글 리뷰 크롤러는 platform/text 만 있는 형식)"""
+    df = pd.read_csv(path)
+    df = df.rename(columns={text_column: 'text'})
+    if 'source_platform' not in df.columns:
+        df['source_platform'] = df.get('platform')
+    df['source_platform'] = df['source_platform'].map(normalize_platform)
+    if 'source_type' not in df.columns:
+        df['source_type'] = df['source_platform'].map(PLATFORM_SOURCE_TYPES)
+    if 'company' not in df.columns:
+        df['company'] = 'ringle'
+    if 'data_id' not in df.columns:
+        df['data_id'] = [f"{source}_{i:05d}" for i in range(1, len(df) + 1)]
+    return df.reindex(columns=MASTER_COLUMNS)
+
+
+def _prepare(df, source_file):
+    """적재용 정리 (소문자 회사/플랫폼, 숫자 평점, ISO 날짜 문자열, 본문 해시)"""
+    df = df.reindex(columns=MASTER_COLUMNS).copy()
+    df['company'] = df['company'].astype('string').str.lower()
+    df['source_platform'] = df['source_platform'].map(normalize_platform)
+    df['rating'] = pd.to_numeric(df['rating'], errors='coerce')
+    for col in ('date', 'collected_at'):
+        df[col] = parse_dates(df[col]).dt.strftime('%Y-%m-%d %H:%M:%S')
+    df['source_file'] = source_file
+    df['content_hash'] = hash_column(df['text'])
+    # NaN/NA → NULL
+    return df.astype(object).where(df.notna(), None)
+
+
+def source_files(data_dir=DATA_DIR):
+    """적재 대상 (상대 경로, 읽기 함수) 목록"""
+    sources = [(os.path.relpath(path, data_dir), pd.read_csv)
+               for path in sorted(glob.glob(os.path.join(data_dir, MASTER_GLOB)))]
+    for rel_path, text_column, source in RINGLE_SOURCES:
+        if os.path.exists(os.path.join(data_dir, rel_path)):
+            sources.append((rel_path, lambda p, t=text_column, s=source: _read_crawler_output(p, t, s)))
+    return sources
+
+
+def ingest(data_dir=DATA_DIR, db_path=DB_PATH):
+    """모든 원본을 새 DB 로 적재 후 교체 → {원본 파일: 행 수}"""
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    # 예외가 나도 임시 DB 파일 핸들이 남지 않도록 항상 닫음
+    with closing(sqlite3.connect(tmp_path)) as conn:
+        columns = ', '.join(f"{col} {'REAL' if col == 'rating' else 'TEXT'}" for col in DB_COLUMNS)
+        conn.execute(f"CREATE TABLE documents (id INTEGER PRIMARY KEY, {columns})")
+        conn.execute("CREATE TABLE sources (path TEXT PRIMARY KEY, rows INTEGER, mtime REAL)")
+
+        counts = {}
+        placeholders = ', '.join('?' * len(DB_COLUMNS))
+        for rel_path, reader in source_files(data_dir):
+            path = os.path.join(data_dir, rel_path)
+            df = _prepare(reader(path), rel_path)
+            conn.executemany(f"INSERT INTO documents ({', '.join(DB_COLUMNS)}) VALUES ({placeholders})",
+                             df[DB_COLUMNS].itertuples(index=False, name=None))
+            conn.execute("INSERT INTO sources VALUES (?, ?, ?)", (rel_path, len(df), os.path.getmtime(path)))
+            counts[rel_path] = len(df)
+
+        # 슬라이싱용 인덱스 (회사 + 플랫폼 + 날짜 복합 인덱스가 가장 흔한 질의를 커버)
+        conn.execute("CREATE INDEX idx_company_platform_date ON documents (company, source_platform, date)")
+        conn.execute("CREATE INDEX idx_platform ON documents (source_platform)")
+        conn.execute("CREATE INDEX idx_date ON documents (date)")
+
+        # 전문 검색 (외부 콘텐츠 FTS5 - 본문은 documents 에만 저장)
+        conn.execute("""
+            CREATE VIRTUAL TABLE documents_fts USING fts5(
+                title, text, content='documents', content_rowid='id', tokenize='trigram'
+            )
+        """)
+        conn.execute("INSERT INTO documents_fts (documents_fts) VALUES ('rebuild')")
+        conn.execute("ANALYZE")
+        conn.commit()
+
+    os.replace(tmp_path, db_path)
+    return counts
+
+
+def connect(db_path=DB_PATH):
+    """읽기 전용 연결 (호출 측에서 닫음 - `with closing(connect()) as conn:`)"""
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"{db_path} 가 없습니다. `python corpus_db.py ingest` 를 먼저 실행하세요.")
+    return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+
+def _fts_phrase(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+def build_query(companies=None, platforms=None, source_types=None, since=None, until=None,
+                contains=None, min_rating=None, max_rating=None, columns=QUERY_COLUMNS,
+                count=False, group_by=None, limit=None):
+    """필터 조건 → (SQL, 파라미터)
+
+    contains 의 검색어는 모두 포함(AND)해야 하며, 3글자 이상은 FTS 색인으로, 더 짧은 검색어는 LIKE 로 검색
+    since/until 은 'YYYY-MM-DD' (until 은 미포함)
+    limit 은 행 목록 조회에만 적용 (count/group_by 집계 결과는 자르지 않음)
+    """
+    where = []
+    params = []
+
+    for column, values in (('company', companies), ('source_platform', platforms),
+                           ('source_type', source_types)):
+        if values:
+            where.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(v.lower() for v in values)
+    if since:
+        where.append("date >= ?")
+        params.append(since)
+    if until:
+        where.append("date < ?")
+        params.append(until)
+    if min_rating is not None:
+        where.append("rating >= ?")
+        params.append(min_rating)
+    if max_rating is not None:
+        where.append("rating <= ?")
+        params.append(max_rating)
+
+    terms = list(contains or [])
+    indexed = [t for t in terms if len(t) >= FTS_MIN_CHARS]
+    if indexed:
+        where.append("id IN (SELECT rowid FROM documents_fts WHERE documents_fts MATCH ?)")
+        params.append(' AND '.join(_fts_phrase(t) for t in indexed))
+    for term in terms:
+        if len(term) < FTS_MIN_CHARS:
+            where.append("(text LIKE ? OR title LIKE ?)")
+            params.extend([f"%{term}%"] * 2)
+
+    where_sql = f" WHERE {' AND '.join(where)}" if where else ''
+    if group_by:
+        keys = ', '.join(group_by)
+        sql = f"SELECT {keys}, COUNT(*) AS count FROM documents{where_sql} GROUP BY {keys} ORDER BY count DESC"
+    elif count:
+        sql = f"SELECT COUNT(*) AS count FROM documents{where_sql}"
+    else:
+        sql = f"SELECT {', '.join(columns)} FROM documents{where_sql} ORDER BY date DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+    return sql, params
+
+
+def query(db_path=DB_PATH, **filters):
+    """필터 조건으로 조회 → DataFrame (인자는 build_query 참고)"""
+    sql, params = build_query(**filters)
+    with closing(connect(db_path)) as conn:
+        return pd.read_sql_query(sql, conn, params=params)
+
+
+def _print_frame(df, width=60):
+    """긴 본문은 잘라서 출력"""
+    for col in ('title', 'text'):
+        if col in df.columns:
+            df[col] = df[col].fillna('').str.replace(r'\s+', ' ', regex=True).str.slice(0, width)
+    print(df.to_string(index=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='코퍼스 분석 저장소 (SQLite + FTS5)')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('ingest', help='CSV 전체 적재 (DB 재생성)')
+    sub.add_parser('info', help='적재 현황')
+
+    q = sub.add_parser('query', help='조건 조회')
+    q.add_argument('--company', nargs='+')
+    q.add_argument('--platform', nargs='+', help='source_platform (playstore, appstore, naver_blog, ...)')
+    q.add_argument('--source-type', nargs='+', help='review / blog / community / news / sns')
+    q.add_argument('--year', type=int, help='해당 연도만 (--since/--until 대신)')
+    q.add_argument('--since', help='시작일 YYYY-MM-DD (포함)')
+    q.add_argument('--until', help='종료일 YYYY-MM-DD (미포함)')
+    q.add_argument('--contains', nargs='+', help='본문/제목에 모두 포함될 검색어')
+    q.add_argument('--negative', action='store_true', help=f'평점 {NEGATIVE_MAX_RATING}점 이하만')
+    q.add_argument('--min-rating', type=float)
+    q.add_argument('--max-rating', type=float)
+    q.add_argument('--count', action='store_true', help='건수만 출력')
+    q.add_argument('--group-by', nargs='+', choices=['company', 'source_type', 'source_platform'],
+                   help='그룹별 건수')
+    q.add_argument('--limit', type=int, default=20, help='행 목록 최대 건수 (--count/--group-by 에는 미적용)')
+
+    s = sub.add_parser('sql', help='SQL 직접 실행 (읽기 전용)')
+    s.add_argument('statement')
+    args = parser.parse_args()
+
+    if args.command == 'ingest':
+        started = time.time()
+        counts = ingest()
+        for path, rows in counts.items():
+            print(f"   - {path}: {rows:,}건")
+        print(f"✅ {sum(counts.values()):,}건 적재: {DB_PATH} ({time.time() - started:.1f}초)")
+        return
+
+    started = time.time()
+    if args.command == 'info':
+        with closing(connect()) as conn:
+            df = pd.read_sql_query(
+                "SELECT company, source_platform, COUNT(*) AS count, MIN(date) AS first, MAX(date) AS last "
+                "FROM documents GROUP BY company, source_platform ORDER BY company, count DESC", conn)
+        _print_frame(df)
+    elif args.command == 'sql':
+        with closing(connect()) as conn:
+            df = pd.read_sql_query(args.statement, conn)
+        _print_frame(df)
+    else:
+        since, until = args.since, args.until
+        if args.year:
+            since, until = f"{args.year}-01-01", f"{args.year + 1}-01-01"
+        # --negative 는 상한을 NEGATIVE_MAX_RATING 이하로 좁힐 뿐, 더 낮은 --max-rating 은 그대로 유지
+        max_rating = args.max_rating
+        if args.negative:
+            max_rating = NEGATIVE_MAX_RATING if max_rating is None else min(NEGATIVE_MAX_RATING, max_rating)
+        df = query(companies=args.company, platforms=args.platform, source_types=args.source_type,
+                   since=since, until=until, contains=args.contains, min_rating=args.min_rating,
+                   max_rating=max_rating,
+                   count=args.count, group_by=args.group_by, limit=args.limit)
+        if args.count and not args.group_by:
+            print(f"{int(df['count'].iloc[0]):,}건")
+        else:
+            _print_frame(df)
+    print(f"⏱️ {(time.time() - started) * 1000:.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
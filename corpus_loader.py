@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+분석 스크립트 공용 코퍼스 로더
+- 회사별 분석 파일 경로 결정 (filtered 우선, 없으면 master_data)
+- 표준 스키마(corpus_schema) 적용 (category/인터닝, rating → float32, 날짜 → datetime)
+- 병합 결과를 바이너리(pickle) 캐시에 저장, 원본 파일 mtime/크기가 바뀌면 자동 무효화
+
+사용법:
+    from corpus_loader import load_corpus, load_csv
+    df = load_corpus()                    # 10개사 통합 데이터
+    df = load_csv('ringle_reviews.csv')   # 단일 CSV (같은 캐시 규칙)
+"""
+
+import hashlib
+import os
+import pickle
+
+import pandas as pd
+
+import corpus_store
+from corpus_schema import apply_schema
+from corpus_store import COMPANIES, resolve_company_file
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(DATA_DIR, '.corpus_cache')
+
+# 캐시 형식이 바뀌면 올려서 기존 캐시 무효화
+CACHE_VERSION = 2
+
+
+def _signature(paths):
+    """원본 파일 서명 (경로, 수정 시각, 크기) - 하나라도 바뀌면 캐시 무효"""
+    return [
+        (os.path.abspath(p), os.stat(p).st_mtime_ns, os.stat(p).st_size)
+        for p in paths
+    ]
+
+
+def _cache_file(key, cache_dir):
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{digest}.pkl")
+
+
+def _read_cache(key, signature, cache_dir):
+    """서명이 일치하는 캐시 항목 반환 (없거나 오래되었으면 None)"""
+    path = _cache_file(key, cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            entry = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if entry.get('version') != CACHE_VERSION or entry.get('signature') != signature:
+        return None
+    return entry
+
+
+def _write_cache(key, signature, cache_dir, **payload):
+    """캐시 저장 (임시 파일 → rename 으로 원자적 교체)"""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cache_file(key, cache_dir)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'version': CACHE_VERSION, 'signature': signature, **payload},
+                    f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_csv(path, use_cache=True, cache_dir=CACHE_DIR):
+    """단일 CSV 를 타입 적용 후 로드 (mtime 기반 캐시)"""
+    key = f"csv:{os.path.abspath(path)}"
+    signature = _signature([path])
+
+    if use_cache:
+        entry = _read_cache(key, signature, cache_dir)
+        if entry is not None:
+            return entry['frame']
+
+    df = apply_schema(pd.read_csv(path))
+    if use_cache:
+        _write_cache(key, signature, cache_dir, frame=df)
+    return df
+
+
+def _read_sources(companies, paths, data_dir):
+    """원본 읽기: Parquet 저장소가 최신이고 같은 회사 구성이면 저장소에서, 아니면 CSV 에서"""
+    store_dir = os.path.join(data_dir, 'corpus_store')
+    if corpus_store.store_is_fresh(data_dir, store_dir):
+        manifest = corpus_store.read_manifest(store_dir)
+        if [e['company'] for e in manifest['raw_files']] == companies:
+            return corpus_store.load_corpus(store_dir=store_dir)
+
+    return pd.concat([pd.read_csv(path) for path in paths], ignore_index=True)
+
+
+def load_corpus(data_dir=DATA_DIR, companies=COMPANIES, use_cache=True, cache_dir=CACHE_DIR):
+    """회사별 분석 파일을 통합한 타입 적용 DataFrame 반환"""
+    found = []
+    paths = []
+    for company in companies:
+        path, _ = resolve_company_file(company, data_dir)
+        if path is None:
+            print(f"Warning: {company} data not found")
+            continue
+        found.append(company)
+        paths.append(path)
+
+    key = f"corpus:{os.path.abspath(data_dir)}:{','.join(companies)}"
+    signature = _signature(paths)
+
+    if use_cache:
+        entry = _read_cache(key, signature, cache_dir)
+        if entry is not None:
+            return entry['frame']
+
+    df = apply_schema(_read_sources(found, paths, data_dir))
+    if use_cache:
+        _write_cache(key, signature, cache_dir, frame=df)
+    return df
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+master_data 코퍼스 표준 스키마
+- 컬럼 순서와 컬럼별 인코딩을 한 곳에서 정의 (로더/저장소가 공통 사용)
+- 저카디널리티 컬럼(company, source_type, ...) → category (정수 코드 + 사전)
+- 반복이 많은 URL/작성자 → category 사전으로 인터닝 (같은 문자열을 한 번만 저장)
+- rating → float32, 날짜 → datetime64
+"""
+
+import pandas as pd
+
+# master_data CSV 컬럼 순서
+MASTER_COLUMNS = [
+    'data_id', 'company', 'source_type', 'source_platform', 'search_keyword',
+    'title', 'text', 'rating', 'author', 'date', 'url', 'collected_at',
+]
+
+# 컬럼별 인코딩 (없는 컬럼은 건너뜀, 'platform' 은 크롤러 CSV 의 플랫폼 컬럼)
+CATEGORY_COLUMNS = ['company', 'source_type', 'source_platform', 'search_keyword', 'platform']
+INTERNED_COLUMNS = ['author', 'url']
+FLOAT_COLUMNS = {'rating': 'float32'}
+DATE_COLUMNS = ['date', 'collected_at']
+TEXT_COLUMNS = ['data_id', 'title', 'text']
+
+# 시각 뒤의 UTC 오프셋 (예: '2026-01-06T19:32:53-07:00')
+# 오프셋 없는 값(국내 소스, 현지 시각)과 섞여 있으므로 오프셋을 떼고 현지 시각 기준으로 통일
+TZ_OFFSET = r'^(.*\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)(?:Z|[+-]\d{2}:?\d{2})$'
+
+
+def parse_dates(series):
+    """'YYYY-MM-DD', 'YYYY-MM-DD HH:MM:SS', ISO(오프셋 포함) 형식이 섞인 컬럼 → datetime64"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    values = series.astype('string').str.replace(TZ_OFFSET, r'\1', regex=True)
+    return pd.to_datetime(values, format='mixed', errors='coerce')
+
+
+def apply_schema(df):
+    """표준 인코딩 적용 (원본 DataFrame 은 변경하지 않음, 이미 적용된 컬럼은 그대로)"""
+    df = df.copy()
+    for col in CATEGORY_COLUMNS + INTERNED_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    for col, dtype in FLOAT_COLUMNS.items():
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(dtype)
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = parse_dates(df[col])
+    return df
+
+
+def memory_report(df):
+    """컬럼별 메모리 사용량 (MB, 문자열 실제 크기 포함)"""
+    usage = df.memory_usage(deep=True, index=False) / 1024 ** 2
+    return usage.round(2).to_dict()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+회사별 CSV → 파티션된 Parquet 코퍼스 저장소
+- {company}_filtered.csv (없으면 {company}_master_data.csv) 를 하나의 데이터셋으로 통합
+- company / source_type / source_platform 기준 hive 파티션
+- 컬럼 선택(projection)과 조건 필터(predicate pushdown)로 필요한 부분만 읽기
+
+사용법:
+    python corpus_store.py build     # CSV → Parquet 저장소 생성/갱신
+    python corpus_store.py info      # 저장소 현황 출력
+"""
+
+import argparse
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from corpus_schema import TEXT_COLUMNS, apply_schema
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(DATA_DIR, 'corpus_store')
+MANIFEST_NAME = '_manifest.json'
+
+COMPANIES = ['ringle', 'cake', 'hackers', 'malhae', 'maxai', 'pagoda', 'santa', 'uphone', 'yanadu', 'carrot']
+
+# 파티션 키
+PARTITION_COLS = ['company', 'source_type', 'source_platform']
+
+# 파티션 경로에 쓸 수 없는 결측값 대체
+MISSING_PARTITION = 'unknown'
+
+# 원본 행 순서 보존용 컬럼 (파티션별로 흩어진 행을 읽을 때 원래 순서로 복원)
+ROW_ORDER_COL = '_row'
+
+
+def resolve_company_file(company, data_dir=DATA_DIR):
+    """분석용 파일 경로와 종류 반환 (filtered 우선, 없으면 master) → (path, kind) 또는 (None, None)"""
+    filtered_path = os.path.join(data_dir, company, f"{company}_filtered.csv")
+    master_path = os.path.join(data_dir, company, f"{company}_master_data.csv")
+
+    if os.path.exists(filtered_path):
+        return filtered_path, 'filtered'
+    if os.path.exists(master_path):
+        return master_path, 'master'
+    return None, None
+
+
+def build_store(data_dir=DATA_DIR, store_dir=STORE_DIR, companies=COMPANIES):
+    """회사별 CSV 를 읽어 파티션된 Parquet 데이터셋으로 저장"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    frames = []
+    raw_files = []
+    for company in companies:
+        path, kind = resolve_company_file(company, data_dir)
+        if path is None:
+            print(f"Warning: {company} data not found")
+            continue
+        df = pd.read_csv(path)
+        frames.append(df)
+        raw_files.append({
+            'company': company,
+            'file': kind,
+            'path': os.path.relpath(path, data_dir),
+            'rows': len(df),
+            'mtime': os.path.getmtime(path),
+        })
+
+    df = pd.concat(frames, ignore_index=True)
+    columns = list(df.columns)
+    df[ROW_ORDER_COL] = np.arange(len(df), dtype=np.int64)
+
+    # 파티션 키 정리 (결측 → unknown, 문자열 통일)
+    for col in PARTITION_COLS:
+        df[col] = df[col].fillna(MISSING_PARTITION).astype(str)
+
+    # CSV 에서 숫자/문자가 섞일 수 있는 텍스트 컬럼은 문자열로 고정 (결측은 그대로)
+    for col in TEXT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+
+    # 표준 스키마로 저장 (category → Parquet dictionary 인코딩, 날짜 → timestamp)
+    df = apply_schema(df)
+
+    # 전체 재생성 (사라진 파티션이 남지 않도록)
+    if os.path.exists(store_dir):
+        shutil.rmtree(store_dir)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_to_dataset(table, root_path=store_dir, partition_cols=PARTITION_COLS)
+
+    with open(os.path.join(store_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump({'raw_files': raw_files, 'rows': len(df), 'columns': columns},
+                  f, ensure_ascii=False, indent=2)
+
+    return raw_files
+
+
+def read_manifest(store_dir=STORE_DIR):
+    """저장소 생성 당시 원본 파일 목록 (없으면 None)"""
+    path = os.path.join(store_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def store_is_fresh(data_dir=DATA_DIR, store_dir=STORE_DIR):
+    """저장소가 있고 원본 CSV 가 그 이후로 바뀌지 않았는지"""
+    manifest = read_manifest(store_dir)
+    if manifest is None:
+        return False
+    for entry in manifest['raw_files']:
+        path = os.path.join(data_dir, entry['path'])
+        if not os.path.exists(path) or os.path.getmtime(path) != entry['mtime']:
+            return False
+    # 저장소 생성 이후 새로 생긴 회사 파일
+    known = {entry['company'] for entry in manifest['raw_files']}
+    return all(resolve_company_file(c, data_dir)[0] is None for c in COMPANIES if c not in known)
+
+
+def load_corpus(columns=None, filters=None, store_dir=STORE_DIR):
+    """Parquet 저장소에서 필요한 컬럼/행만 읽기
+
+    Args:
+        columns: 읽을 컬럼 리스트 (None 이면 전체)
+        filters: pyarrow 필터, 예) [('company', 'in', ['ringle', 'cake']), ('rating', '<=', 2)]
+                 파티션 키 조건은 디렉터리 단위로 건너뛰고, 그 외 조건은 row group 통계로 걸러냄
+    """
+    import pyarrow.parquet as pq
+
+    if columns is None:
+        columns = read_manifest(store_dir)['columns']
+    read_columns = list(columns) + [ROW_ORDER_COL]
+
+    table = pq.read_table(store_dir, columns=read_columns, filters=filters)
+    df = table.to_pandas()
+
+    # 원본 CSV 행 순서 복원
+    df = df.sort_values(ROW_ORDER_COL, kind='stable')[list(columns)].reset_index(drop=True)
+
+    for col in df.columns:
+        if col in PARTITION_COLS:
+            # 파티션 키는 디렉터리 이름에서 복원되므로 범주 사전을 다시 구성
+            df[col] = df[col].astype(str)
+        elif df[col].dtype == object:
+            # Arrow null(None) → NaN (CSV 로 읽었을 때와 동일하게)
+            df[col] = df[col].where(df[col].notna(), np.nan)
+    return apply_schema(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parquet 코퍼스 저장소')
+    parser.add_argument('command', choices=['build', 'info'])
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        raw_files = build_store()
+        print(f"✅ 저장소 생성: {STORE_DIR}")
+        for entry in raw_files:
+            print(f"   - {entry['company']} ({entry['file']}): {entry['rows']:,}건")
+    else:
+        manifest = read_manifest()
+        if manifest is None:
+            print("❌ 저장소가 없습니다. `python corpus_store.py build` 를 먼저 실행하세요.")
+            return
+        print(f"총 {manifest['rows']:,}건 ({'최신' if store_is_fresh() else '원본 CSV 변경됨 → 재생성 필요'})")
+        for entry in manifest['raw_files']:
+            print(f"   - {entry['company']} ({entry['file']}): {entry['rows']:,}건")
+
+
+if __name__ == '__main__':
+    main()
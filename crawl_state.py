@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+크롤링 상태 저장소
+- 소스별 증분 크롤링 체크포인트 (high-water mark: 최신 리뷰 id/날짜, 키워드별 마지막 URL 등)
+- 기존 CSV 에 이미 적재된 URL 조회 및 신규 행 추가 저장
+- 수집 항목 선기록(write-ahead) 저널 (JSONL, 항목마다 즉시 flush → 중단 후 재개 가능)
+"""
+
+import json
+import os
+import threading
+
+import pandas as pd
+
+STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.crawl_state.json')
+
+_state_lock = threading.Lock()
+_journal_lock = threading.Lock()
+
+
+def _load_state(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_checkpoint(source, path=STATE_PATH):
+    """소스의 체크포인트 dict 반환 (없으면 빈 dict)"""
+    with _state_lock:
+        return dict(_load_state(path).get(source, {}))
+
+
+def save_checkpoint(source, checkpoint, path=STATE_PATH):
+    """소스의 체크포인트 저장 (임시 파일 → rename 으로 원자적 교체)"""
+    with _state_lock:
+        state = _load_state(path)
+        state[source] = checkpoint
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2, default=str)
+        os.replace(tmp_path, path)
+
+
+def load_ingested_urls(csv_path, column='url'):
+    """기존 CSV 에 이미 적재된 URL 집합"""
+    if not os.path.exists(csv_path):
+        return set()
+    try:
+        urls = pd.read_csv(csv_path, usecols=[column])[column]
+    except (ValueError, pd.errors.EmptyDataError):
+        return set()
+    return set(urls.dropna().astype(str))
+
+
+def append_rows(df, csv_path):
+    """기존 CSV 뒤에 신규 행만 추가 (파일이 없으면 새로 생성)
+
+    기존 파일과 컬럼 순서를 맞추고, 헤더/BOM 은 새 파일일 때만 기록
+    """
+    if os.path.exists(csv_path) and os.path.getsize(csv_path) > 0:
+        columns = pd.read_csv(csv_path, nrows=0, encoding='utf-8-sig').columns
+        df = df.reindex(columns=columns)
+        df.to_csv(csv_path, mode='a', header=False, index=False, encoding='utf-8')
+    else:
+        df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+    return df
+
+
+def reset_journal(path):
+    """저널 초기화 (새 크롤링 시작)"""
+    with _journal_lock:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def append_journal(path, item):
+    """수집 항목 1개를 저널에 즉시 기록 (여러 스레드에서 호출 가능)"""
+    line = json.dumps(item, ensure_ascii=False, default=str)
+    with _journal_lock:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def read_journal(path):
+    """저널에 기록된 항목 리스트 (중단으로 잘린 줄은 무시)"""
+    if not os.path.exists(path):
+        return []
+    items = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return items
+
+
+def recover_journal(path):
+    """재개 전 저널 정리: 중단으로 잘린 줄을 제거하고 유효한 항목 리스트 반환"""
+    items = read_journal(path)
+    with _journal_lock:
+        if os.path.exists(path):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for item in items:
+                    f.write(json.dumps(item, ensure_ascii=False, default=str) + '\n')
+            os.replace(tmp_path, path)
+    return items
+
+
+def journaled_urls(path, key='url'):
+    """저널에 이미 기록된 URL 집합 (재개 시 건너뛸 대상)"""
+    return {item[key] for item in read_journal(path) if item.get(key)}
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+크롤러 공용 HTTP 클라이언트
+- requests.Session 하나를 공유해 호스트별 keep-alive 커넥션 풀 재사용
+- gzip/deflate 압축 협상 (brotli 모듈이 설치되어 있으면 br 포함)
+- 재시도 + 지수 백오프 (429/5xx)
+- 조건부 GET 디스크 캐시 (ETag/Last-Modified, 304 응답은 디스크 본문으로 대체, LRU 용량 제한)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+# 재시도 설정
+RETRY_TOTAL = 3                               # 최대 재시도 횟수
+RETRY_BACKOFF = 0.5                           # 백오프 계수 (0.5, 1, 2초 ...)
+RETRY_STATUS = (429, 500, 502, 503, 504)      # 재시도할 응답 코드
+
+# 커넥션 풀 설정
+POOL_CONNECTIONS = 10   # 풀을 유지할 호스트 수
+POOL_MAXSIZE = 10       # 호스트당 최대 커넥션 수 (동시 워커 수 이상 권장)
+
+# 응답 캐시 설정
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.http_cache.sqlite')
+CACHE_MAX_BYTES = 200 * 1024 * 1024   # 캐시 본문 총 용량 상한 (초과 시 오래 안 쓴 항목부터 삭제)
+
+_session = None
+_session_lock = threading.Lock()
+_cache_conn = None
+_cache_lock = threading.Lock()
+_cache_config = {
+    'path': CACHE_PATH,
+    'max_bytes': CACHE_MAX_BYTES,
+}
+_config = {
+    'retries': RETRY_TOTAL,
+    'backoff': RETRY_BACKOFF,
+    'pool_connections': POOL_CONNECTIONS,
+    'pool_maxsize': POOL_MAXSIZE,
+}
+
+
+def _accept_encoding():
+    """지원 가능한 압축 방식 (brotli 는 선택 의존성)"""
+    try:
+        import brotli  # noqa: F401
+        return 'gzip, deflate, br'
+    except ImportError:
+        pass
+    try:
+        import brotlicffi  # noqa: F401
+        return 'gzip, deflate, br'
+    except ImportError:
+        return 'gzip, deflate'
+
+
+def _build_session():
+    """재시도/커넥션 풀이 설정된 세션 생성"""
+    retry = Retry(
+        total=_config['retries'],
+        backoff_factor=_config['backoff'],
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=('GET', 'HEAD'),
+        raise_on_status=False,  # 재시도 후에도 실패하면 마지막 응답을 그대로 반환
+    )
+    adapter = HTTPAdapter(
+        pool_connections=_config['pool_connections'],
+        pool_maxsize=_config['pool_maxsize'],
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Accept-Encoding'] = _accept_encoding()
+    return session
+
+
+def configure(retries=None, backoff=None, pool_connections=None, pool_maxsize=None):
+    """재시도/커넥션 풀 설정 변경 (다음 요청부터 새 세션 사용)"""
+    global _session
+    with _session_lock:
+        for key, value in (('retries', retries), ('backoff', backoff),
+                           ('pool_connections', pool_connections),
+                           ('pool_maxsize', pool_maxsize)):
+            if value is not None:
+                _config[key] = value
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def get_session():
+    """공유 세션 반환 (최초 호출 시 생성)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session()
+        return _session
+
+
+def configure_cache(path=None, max_bytes=None):
+    """응답 캐시 위치/용량 변경"""
+    global _cache_conn
+    with _cache_lock:
+        if path is not None:
+            _cache_config['path'] = path
+        if max_bytes is not None:
+            _cache_config['max_bytes'] = max_bytes
+        if _cache_conn is not None:
+            _cache_conn.close()
+        _cache_conn = None
+
+
+def _get_cache():
+    """캐시 DB 연결 (호출 측에서 _cache_lock 보유)"""
+    global _cache_conn
+    if _cache_conn is None:
+        _cache_conn = sqlite3.connect(_cache_config['path'], check_same_thread=False)
+        _cache_conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                encoding TEXT,
+                body BLOB,
+                size INTEGER,
+                last_access REAL
+            )
+        """)
+        _cache_conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)"
+        )
+        _cache_conn.commit()
+    return _cache_conn
+
+
+def _cache_lookup(url):
+    """캐시 항목 조회 → dict 또는 None"""
+    with _cache_lock:
+        row = _get_cache().execute(
+            "SELECT etag, last_modified, content_type, encoding, body "
+            "FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+    if row is None:
+        return None
+    etag, last_modified, content_type, encoding, body = row
+    return {
+        'etag': etag,
+        'last_modified': last_modified,
+        'content_type': content_type,
+        'encoding': encoding,
+        'body': body,
+    }
+
+
+def _cache_touch(url):
+    """LRU 갱신"""
+    with _cache_lock:
+        conn = _get_cache()
+        conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (time.time(), url))
+        conn.commit()
+
+
+def _cache_store(url, response):
+    """검증자(ETag/Last-Modified)가 있는 200 응답 저장 후 용량 초과분 LRU 삭제"""
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if not etag and not last_modified:
+        return
+
+    body = response.content
+    with _cache_lock:
+        conn = _get_cache()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, etag, last_modified, response.headers.get('Content-Type'),
+             response.encoding, body, len(body), time.time())
+        )
+
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total > _cache_config['max_bytes']:
+            for old_url, size in conn.execute(
+                "SELECT url, size FROM responses ORDER BY last_access"
+            ).fetchall():
+                if total <= _cache_config['max_bytes']:
+                    break
+                conn.execute("DELETE FROM responses WHERE url = ?", (old_url,))
+                total -= size
+        conn.commit()
+
+
+def _cached_response(url, entry):
+    """304 응답을 캐시 본문으로 만든 200 Response 로 대체"""
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = 'OK'
+    response.url = url
+    response._content = entry['body']
+    response.headers = CaseInsensitiveDict({
+        k: v for k, v in (('Content-Type', entry['content_type']),
+                          ('ETag', entry['etag']),
+                          ('Last-Modified', entry['last_modified'])) if v
+    })
+    response.encoding = entry['encoding']
+    response.from_cache = True
+    return response
+
+
+def get(url, params=None, headers=None, timeout=10, cache=False):
+    """공유 세션으로 GET 요청
+
+    cache=True 면 이전에 받은 ETag/Last-Modified 로 조건부 요청을 보내고,
+    304 Not Modified 이면 디스크에 저장된 본문을 반환
+    """
+    if not cache:
+        return get_session().get(url, params=params, headers=headers, timeout=timeout)
+
+    key = requests.Request('GET', url, params=params).prepare().url
+    entry = _cache_lookup(key)
+
+    request_headers = dict(headers or {})
+    if entry:
+        if entry['etag']:
+            request_headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            request_headers['If-Modified-Since'] = entry['last_modified']
+
+    response = get_session().get(key, headers=request_headers, timeout=timeout)
+
+    if response.status_code == 304 and entry:
+        _cache_touch(key)
+        return _cached_response(key, entry)
+    if response.status_code == 200:
+        _cache_store(key, response)
+    return response
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+희소 문서-단어 행렬(DTM) 기반 키워드 엔진
+- 코퍼스를 한 번만 토큰화해 scipy CSR 행렬(문서 × 단어, 출현 횟수)로 구성
+- 전체/정제 키워드 빈도 = 열 합, 회사별 TF-IDF = (회사 지시 행렬 @ DTM) 에서 행렬 연산으로 계산
+- 동점은 코퍼스 첫 등장 순서로 정렬 (Counter.most_common 과 같은 결과, 재실행 시 동일 출력)
+
+사용법:
+    python keyword_engine.py                        # 3개 산출물 재생성
+    python keyword_engine.py --output-dir /tmp/kw   # 다른 위치에 저장
+    python keyword_engine.py --lemmas               # 어절 대신 표제어(lemmatizer) 기준 집계
+
+산출물:
+    keyword_frequency_all.csv      (phase/01_market_overview/data, analysis/05_data)
+    keyword_frequency_cleaned.csv  (phase/01_market_overview/data, analysis/05_data)
+    tfidf_unique_keywords.csv      (phase/02_company_comparison/data, analysis/05_data)
+"""
+
+import argparse
+import os
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 한글 2음절 이상 어절 (조사가 붙은 형태는 그대로 유지 - 예: '수업을')
+TOKEN_PATTERN = re.compile(r'[가-힣]{2,}')
+
+# 모든 산출물 공통 불용어 (어미/접속사/부사 위주의 기능어)
+BASIC_STOPWORDS = frozenset({
+    '있는', '있습니다', '너무', '많이', '하는', '하고', '정말', '통해', '그리고', '같은',
+    '좋은', '있어요', '같아요', '대한', '합니다', '것이', '진짜', '하지만', '위해', '이런',
+    '어떤', '그래서', '그냥', '되는', '됩니다', '것을', '것도', '있게', '이제', '조금',
+    '것은', '동안', '먼저', '있을', '라고', '보니', '것이다', '아주', '아닌', '에서',
+    '그런데', '일단', '해서', '그렇게', '거의', '입니다', '매우', '수도', '같이', '하는데',
+    '되고', '있지만', '있었다', '어느', '아직', '결국', '그런', '않는', '된다', '근데',
+    '역시', '이게', '그래도', '해야', '안녕하세요',
+})
+
+# keyword_frequency_cleaned / TF-IDF 에서 추가로 제외할 단어
+FUNCTION_WORDS = {
+    '있다', '내가', '다른', '가장', '다시', '많은', '함께', '때문에', '바로', '제가',
+    '있어서', '아니라', '위한', '저는', '계속', '나는', '있고', '이렇게', '어떻게', '직접',
+    '특히', '한다', '있어', '했다', '하면', '모든', '이상',
+}
+SCRAPING_NOISE = {
+    '작성일', '더보기', '좋아요수', '댓글', '대댓글', '메뉴', '검색', '전조회수',
+}
+STOPWORDS = BASIC_STOPWORDS | FUNCTION_WORDS | SCRAPING_NOISE
+
+# 표제어 모드에서 정제 빈도 / TF-IDF 에 추가로 제외할 기능 용언 ('했어요', '되는' 등이 모이는 형태)
+LEMMA_STOPWORDS = frozenset({'하다', '되다', '있다', '같다', '않다', '이다'})
+
+TOP_ALL = 100
+TOP_CLEANED = 50
+TOP_UNIQUE = 15         # 회사별 고유 키워드 수
+
+OUTPUT_DIRS = {
+    'keyword_frequency_all.csv': ['phase/01_market_overview/data', 'analysis/05_data'],
+    'keyword_frequency_cleaned.csv': ['phase/01_market_overview/data', 'analysis/05_data'],
+    'tfidf_unique_keywords.csv': ['phase/02_company_comparison/data', 'analysis/05_data'],
+}
+
+
+def tokenize(text):
+    """본문 → 토큰 리스트 (NFC 정규화 후 한글 어절 추출)"""
+    if not isinstance(text, str):
+        return []
+    return TOKEN_PATTERN.findall(unicodedata.normalize('NFC', text))
+
+
+def lemma_tokens(lemmas):
+    """표제어 리스트 → 토큰 리스트 (어절 모드와 같은 기준: 한글 2음절 이상)"""
+    return [lemma for lemma in lemmas if TOKEN_PATTERN.fullmatch(lemma)]
+
+
+def build_dtm(texts, tokenizer=tokenize):
+    """문서-단어 행렬 생성 (한 번의 순회)
+
+    Returns:
+        (X, vocab) - X: CSR 행렬 (문서 수 × 단어 수, int32 출현 횟수),
+                     vocab: 열 순서의 단어 리스트 (코퍼스 첫 등장 순)
+    """
+    vocabulary = {}
+    indices = []
+    indptr = [0]
+    for text in texts:
+        for token in tokenizer(text):
+            indices.append(vocabulary.setdefault(token, len(vocabulary)))
+        indptr.append(len(indices))
+
+    data = np.ones(len(indices), dtype=np.int32)
+    X = sparse.csr_matrix((data, np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+                          shape=(len(indptr) - 1, len(vocabulary)))
+    X.sum_duplicates()
+    return X, list(vocabulary)
+
+
+def group_matrix(labels):
+    """문서별 그룹 라벨 → (그룹 지시 행렬 (그룹 수 × 문서 수), 그룹 목록 (첫 등장 순))"""
+    codes, groups = pd.factorize(pd.Series(labels).astype(str))
+    G = sparse.csr_matrix((np.ones(len(codes), dtype=np.int32), (codes, np.arange(len(codes)))),
+                          shape=(len(groups), len(codes)))
+    return G, list(groups)
+
+
+def _keep_columns(vocab, stopwords):
+    return np.array([token not in stopwords for token in vocab], dtype=bool)
+
+
+def term_frequency(X, vocab, stopwords=(), top=TOP_ALL):
+    """전체 키워드 빈도 상위 top 개 → DataFrame(keyword, count)"""
+    counts = np.asarray(X.sum(axis=0)).ravel()
+    counts[~_keep_columns(vocab, stopwords)] = 0
+    # 빈도 내림차순, 동점은 첫 등장 순 (stable)
+    order = np.argsort(-counts, kind='stable')[:top]
+    order = order[counts[order] > 0]
+    return pd.DataFrame({'keyword': [vocab[i] for i in order], 'count': counts[order]})
+
+
+def tfidf(counts):
+    """그룹 × 단어 빈도 행렬 → L2 정규화 TF-IDF (smooth idf = ln((1+N)/(1+df)) + 1)"""
+    counts = sparse.csr_matrix(counts, dtype=np.float64)
+    n_docs = counts.shape[0]
+    df = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log((1 + n_docs) / (1 + df)) + 1
+
+    weights = counts @ sparse.diags(idf)
+    norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ weights
+
+
+def unique_keywords(X, vocab, labels, stopwords=STOPWORDS, top=TOP_UNIQUE):
+    """그룹별 고유 키워드 (그룹 TF-IDF - 다른 그룹 평균 TF-IDF 상위 top 개)
+
+    그룹별 리뷰를 하나의 문서로 합친 것과 같으며 (G @ X), 그룹이 2개 이상이어야 의미 있음
+    """
+    G, groups = group_matrix(labels)
+    weights = tfidf(G @ X).toarray()
+    weights[:, ~_keep_columns(vocab, stopwords)] = 0
+
+    n_groups = len(groups)
+    others_mean = (weights.sum(axis=0) - weights) / max(n_groups - 1, 1)
+    diff = weights - others_mean
+
+    rows = []
+    for g, group in enumerate(groups):
+        order = np.argsort(-diff[g], kind='stable')[:top]
+        rows.extend((group, vocab[i], round(float(diff[g, i]), 4)) for i in order if diff[g, i] > 0)
+    return pd.DataFrame(rows, columns=['company', 'keyword', 'tfidf_diff'])
+
+
+def build_outputs(df, text_column='text', group_column='company', lemmas=None):
+    """코퍼스 → {파일명: DataFrame} (lemmas 에 행별 표제어 리스트를 주면 표제어 기준)"""
+    if lemmas is None:
+        X, vocab = build_dtm(df[text_column])
+    else:
+        X, vocab = build_dtm(lemmas, lemma_tokens)
+    stopwords = STOPWORDS if lemmas is None else STOPWORDS | LEMMA_STOPWORDS
+    labels = df[group_column].astype(str).str.lower()
+    return {
+        'keyword_frequency_all.csv': term_frequency(X, vocab, BASIC_STOPWORDS, top=TOP_ALL),
+        'keyword_frequency_cleaned.csv': term_frequency(X, vocab, stopwords, top=TOP_CLEANED),
+        'tfidf_unique_keywords.csv': unique_keywords(X, vocab, labels, stopwords),
+    }
+
+
+def main():
+    from corpus_loader import load_corpus
+
+    parser = argparse.ArgumentParser(description='키워드 빈도 / TF-IDF 산출물 재생성')
+    parser.add_argument('--output-dir', help='모든 산출물을 이 디렉터리에 저장 (기본: 기존 산출물 위치)')
+    parser.add_argument('--lemmas', action='store_true', help='어절 대신 표제어 기준으로 집계 (표제어 캐시 사용)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='표제어 분석 프로세스 수')
+    args = parser.parse_args()
+
+    df = load_corpus()
+    print(f"📊 코퍼스: {len(df):,}건")
+
+    lemmas = None
+    if args.lemmas:
+        from lemmatizer import lemma_streams
+        lemmas = lemma_streams(df['text'], args.workers)
+
+    for name, table in build_outputs(df, lemmas=lemmas).items():
+        dirs = [args.output_dir] if args.output_dir else [os.path.join(DATA_DIR, d) for d in OUTPUT_DIRS[name]]
+        for out_dir in dirs:
+            os.makedirs(out_dir, exist_ok=True)
+            path = os.path.join(out_dir, name)
+            table.to_csv(path, index=False, encoding='utf-8')
+            print(f"✅ {path} ({len(table)}행)")
+
+
+if __name__ == '__main__':
+    main()
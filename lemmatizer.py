@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+한국어 형태소(표제어) 분석 단계
+- 코퍼스를 한 번만 분석해 리뷰별 표제어 스트림(리스트)을 만들고 태그 캐시(tag_cache)에 본문 해시로 저장
+- 분석기: kiwipiepy 가 설치돼 있으면 Kiwi, 없으면 순수 파이썬 규칙 기반 분석기 (조사/어미 분리 + 불규칙 활용 복원)
+- 배치 단위로 프로세스 풀에서 병렬 분석, 이미 분석한 본문은 캐시에서 재사용
+- 택소노미는 부분 문자열 대신 표제어로 매칭 ('싸' 는 '싸다' 만 매칭, '비싸다'/'싸움' 은 매칭 안 됨)
+
+표제어 형태:
+    체언/기타  → 조사를 뗀 형태 ('수업을' → '수업')
+    용언       → 어간 + '다' ('비싸서' → '비싸다', '어려워요' → '어렵다', '불편했어요' → '불편하다')
+    영문       → 소문자 ('AI' → 'ai'), 숫자/기호는 버림
+
+사용법:
+    from lemmatizer import lemma_streams, build_lemma_matcher, match_lemmas
+    lemmas = lemma_streams(df['text'])                  # 캐시에 없는 본문만 분석
+    matcher = build_lemma_matcher(PAINPOINT_KEYWORDS)
+    categories = match_lemmas(matcher, lemmas[0])
+
+    python lemmatizer.py "가격이 너무 비싸서 망설여졌어요"   # 문장 분석
+    python lemmatizer.py --corpus --workers 4               # 코퍼스 전체 분석 → 캐시 적재
+    python lemmatizer.py --check                            # 규칙 분석기 회귀 예시 확인
+"""
+
+import argparse
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from tag_cache import cached_tags, taxonomy_version
+
+try:
+    from kiwipiepy import Kiwi
+except ImportError:
+    Kiwi = None
+
+BACKENDS = ('kiwi', 'rules')
+DEFAULT_BACKEND = 'kiwi' if Kiwi is not None else 'rules'
+DEFAULT_WORKERS = os.cpu_count() or 1
+BATCH_SIZE = 500          # 프로세스 하나에 넘기는 리뷰 수
+
+# 어절 (한글 연속 / 영문 연속)
+WORD_PATTERN = re.compile(r'[가-힣]+|[a-zA-Z]+')
+
+# 용언 어간 사전 (규칙 분석기는 이 어간이나 생산적 접미사로 끝나는 어간만 용언으로 인정)
+PREDICATE_STEMS = frozenset({
+    '하', '되', '있', '없', '좋', '싫', '나쁘', '괜찮', '비싸', '싸', '느리', '빠르', '어렵', '쉽',
+    '힘들', '아쉽', '짜증나', '화나', '귀찮', '많', '적', '크', '작', '길', '짧', '같', '다르',
+    '맞', '틀리', '모르', '알', '보', '듣', '쓰', '배우', '가르치', '느끼', '끊기', '끊', '튕기',
+    '멈추', '안되', '못하', '바쁘', '두렵', '무섭', '부끄럽', '떨리', '늘', '줄', '오르', '올리',
+    '내리', '받', '주', '가', '오', '찾', '잡', '열', '닫', '만들', '그만두', '재밌', '재미있',
+    '재미없', '기쁘', '슬프', '예쁘', '고맙', '새롭', '즐겁', '반갑', '아프', '낫', '높', '낮',
+    '깊', '넓', '좁', '믿', '바라', '기다리', '늦', '헷갈리', '먹', '살', '만나', '얻', '잃',
+    '쌓이', '들', '나오', '나가', '들어가', '들어오', '생기', '바뀌', '바꾸', '고치', '지나',
+    '끝나', '끝내', '넘', '남', '남기', '읽', '걸리', '막히', '터지', '꺼지', '느려지',
+    '좋아지', '나빠지', '늘어나', '늘리', '떨어지', '부족하', '망설이', '놀라', '외우', '않', '아니',
+    '울', '웃',
+})
+
+# 과거형(ㅆ)일 때만 용언으로 인정하는 어간 ('났다' → '나다', '나는'/'난' 은 대명사 '나' + 조사)
+PAST_ONLY_STEMS = frozenset({'나'})
+
+# 보조 용언 어간: 연결형(-아/-어/-여) 용언 뒤에 붙으면 합쳐서 하나의 용언 ('해주' → '해주다', '망설여지' → '망설여지다')
+AUXILIARY_STEMS = ('주', '지', '보', '버리')
+
+# 용언 어간 + 부사 파생 접미사 '-이' ('없이' → '없다', '문제없이' → '문제없다')
+ADVERBIAL_SUFFIXES = ('없이',)
+
+# 이 접미사로 끝나는 어간은 사전에 없어도 용언으로 인정 (불편하-, 만족스럽-, 연결되-, 문제없-)
+PRODUCTIVE_SUFFIXES = ('하', '되', '시키', '스럽', '롭', '없', '있')
+
+# 어미 (어간 뒤에 오는 부분, 앞 음절 받침으로 붙는 어미는 자모로 시작)
+ENDINGS = frozenset({
+    '다', '요', '고', '게', '지', '기', '면', '서', '도', '며', '네', '죠', '니', '자', '야',
+    '어', '아', '여', '음', '은', '는', '을', '던', '데', '래', '대', '세요', '시고', '셔서',
+    '어요', '아요', '여요', '어서', '아서', '여서', '어도', '아도', '어야', '아야', '어야지',
+    '고요', '구요', '지요', '게요', '네요', '군요', '데요', '래요', '대요', '는데', '은데',
+    '지만', '니까', '으니까', '면서', '으면', '으면서', '다가', '다고', '다는', '다면', '라고',
+    '려고', '으려고', '도록', '기에', '기도', '기는', '기가', '기를', '지도', '지는', '더라',
+    '더라고요', '거든요', '잖아요', '습니다', '습니까', '니다', '는다', '는지', '은지', '을지',
+    '을까', '을까요', '는다면', '으세요', '겠', '겠다', '겠어요', '겠네요', '어진', '아진',
+    '어져', '아져', '어지', '아지', '고싶', '고싶다', '고싶어요', '에요',
+    'ㄴ', 'ㄹ', 'ㅁ', 'ㄴ데', 'ㄴ다', 'ㄴ지', 'ㄹ지', 'ㄹ까', 'ㄹ까요', 'ㄹ게요', 'ㄹ래요',
+    'ㄹ수록', 'ㄹ때', 'ㄴ다면', 'ㅂ니다', 'ㅂ니까', 'ㅂ시다',
+    'ㅆ다', 'ㅆ어', 'ㅆ어요', 'ㅆ고', 'ㅆ는데', 'ㅆ지만', 'ㅆ네요', 'ㅆ습니다', 'ㅆ던', 'ㅆ음',
+    'ㅆ으면', 'ㅆ는지', 'ㅆ을', 'ㅆ더라', 'ㅆ더라고요', 'ㅆ거든요', 'ㅆ으니', 'ㅆ으나', 'ㅆ기',
+    'ㅆ어서', 'ㅆ겠', 'ㅆ는데요', 'ㅆ다고', 'ㅆ다는',
+})
+
+# 조사 (긴 것부터 매칭)
+JOSA = tuple(sorted({
+    '에서는', '에서도', '으로는', '으로도', '에게는', '한테는', '까지는', '부터는', '이라도', '이라고',
+    '이라는', '이랑', '에서', '에게', '한테', '께서', '으로', '까지', '부터', '처럼', '보다', '마다',
+    '밖에', '조차', '이나', '이며', '이고', '이다', '이에요', '입니다', '라고', '라는', '랑',
+    '예요', '에요', '였어요', '였어', '였다', '였는데', '였지만', '라서', '이었어요', '이었어', '이었다',
+    '이었는데', '이었지만', '이라서', '인데', '이지만', '이라',
+    '은', '는', '이', '가', '을', '를', '에', '의', '도', '만', '와', '과', '로', '나', '요',
+}, key=lambda josa: (-len(josa), josa)))
+
+# 받침이 있는 음절 뒤에만 오는 조사 / 받침이 없는 음절 뒤에만 오는 조사 (음운 조건이 안 맞으면 조사가 아님)
+JOSA_AFTER_CODA = frozenset({'은', '이', '을', '과', '으로', '으로는', '으로도', '이랑', '이나', '이며', '이고',
+                             '이에요', '이었어요', '이었어', '이었다', '이었는데', '이었지만', '이라서'})
+JOSA_AFTER_VOWEL = frozenset({'는', '가', '를', '와', '랑', '나', '예요', '였어요', '였어', '였다', '였는데',
+                              '였지만', '라서'})
+
+# 조사처럼 끝나지만 한 단어인 명사 (조사를 떼지 않음)
+NOUN_EXCEPTIONS = frozenset({
+    '결과', '정도', '속도', '추가', '필요', '회의', '의미', '제도', '태도', '강도', '난이도',
+    '만족도', '사과', '학과', '효과', '강의', '주의', '동의', '문의', '나이', '차이', '아이',
+    '평가', '물가', '휴가', '작가', '전문가', '요가', '경로', '진로', '하나', '언니', '누나',
+    '기도', '지도', '온도', '용도', '별로', '서로', '바로', '그대로', '매일', '계속',
+})
+
+# 활용형으로 오인하기 쉬운 한 음절 부사 (분석하지 않고 그대로 유지 - '안' 이 '알다' 로 읽히지 않도록)
+FIXED_WORDS = frozenset({'안', '못', '잘', '더', '또', '좀', '꼭', '곧', '늘', '참', '다', '왜', '확'})
+
+# 받침 자모 (한글 음절 종성 순서)
+CODAS = ('', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ',
+         'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ')
+# 어미로 떼어낼 수 있는 받침 → (어간에 남는 받침, 어미 자모) ('ㄻ' = 'ㄹ' 어간 + 명사형 'ㅁ')
+ENDING_CODAS = {'ㄴ': ('', 'ㄴ'), 'ㄹ': ('', 'ㄹ'), 'ㅁ': ('', 'ㅁ'), 'ㅂ': ('', 'ㅂ'), 'ㅆ': ('', 'ㅆ'),
+                'ㄻ': ('ㄹ', 'ㅁ')}
+
+# 모음 인덱스 (한글 음절 중성 순서)
+A, AE, EO, YEO, O, WA, WAE, OE, U, WO, EU, I = 0, 1, 4, 6, 8, 9, 10, 11, 13, 14, 18, 20
+
+# 분석기 정의가 바뀌면 표제어 캐시 무효화
+RULES_VERSION = taxonomy_version(sorted(PREDICATE_STEMS), PRODUCTIVE_SUFFIXES, sorted(ENDINGS),
+                                 JOSA, sorted(NOUN_EXCEPTIONS), sorted(FIXED_WORDS),
+                                 sorted(PAST_ONLY_STEMS), AUXILIARY_STEMS, ADVERBIAL_SUFFIXES)
+
+# 규칙 분석기 회귀 예시 (어절 → 기대 표제어), python lemmatizer.py --check 로 확인
+LEMMA_EXAMPLES = (
+    ('수업을', '수업'), ('나는', '나'), ('별로', '별로'), ('안', '안'),
+    ('비싸서', '비싸다'), ('어려워요', '어렵다'), ('불편했어요', '불편하다'), ('돼요', '되다'),
+    ('생겨요', '생기다'), ('않아요', '않다'), ('좋았어요', '좋다'),
+    ('해줘요', '해주다'), ('해주세요', '해주다'), ('해줬어요', '해주다'),
+    ('없이', '없다'), ('문제없이', '문제없다'),
+    ('망설여졌어', '망설여지다'), ('끊겨버려요', '끊겨버리다'),
+    ('났다', '나다'), ('화났어요', '화나다'), ('울어', '울다'), ('우는', '울다'),
+)
+
+# Kiwi 품사 중 표제어로 남길 것 (부사/보조용언은 부정·강조 처리에 필요 - '안', '않다', '너무')
+KIWI_FORM_TAGS = ('XR', 'MAG')
+KIWI_PREDICATE_TAGS = ('VV', 'VA', 'VX')
+
+_kiwi = None
+
+
+def _decompose(syllable):
+    """한글 음절 → (초성, 중성, 종성) 인덱스"""
+    code = ord(syllable) - 0xAC00
+    return code // 588, (code % 588) // 28, code % 28
+
+
+def _compose(onset, vowel, coda=0):
+    return chr(0xAC00 + onset * 588 + vowel * 28 + coda)
+
+
+def _with_coda(syllable, coda):
+    onset, vowel, _ = _decompose(syllable)
+    return _compose(onset, vowel, CODAS.index(coda))
+
+
+def _stem_candidates(stem):
+    """어미를 뗀 표면형 어간 → 가능한 사전형 어간 후보 (축약/불규칙 활용 복원)"""
+    yield stem
+    head, last = stem[:-1], stem[-1]
+    onset, vowel, coda = _decompose(last)
+    if coda:
+        return
+    # ㄹ 탈락 복원 ('힘드' + 'ㄴ' → '힘들', '아' + 'ㅂ니다' → '알')
+    yield head + _compose(onset, vowel, CODAS.index('ㄹ'))
+    if last == '해':
+        yield head + '하'
+    if vowel == WAE:                     # 돼 → 되
+        yield head + _compose(onset, OE)
+    if vowel == YEO:                     # 가르쳐 → 가르치, 느껴 → 느끼
+        yield head + _compose(onset, I)
+    if vowel in (WO, WA):
+        if head and onset == 11:         # ㅂ 불규칙: 어려워 → 어렵, 도와 → 돕
+            yield head[:-1] + _with_coda(head[-1], 'ㅂ')
+        yield head + _compose(onset, U if vowel == WO else O)   # 배워 → 배우, 봐 → 보
+    if vowel in (A, EO):
+        yield head + _compose(onset, EU)                        # 써 → 쓰, 바빠 → 바쁘
+        if onset == 5 and head and _decompose(head[-1])[2] == CODAS.index('ㄹ'):
+            # 르 불규칙: 몰라 → 모르, 달라 → 다르
+            h_onset, h_vowel, _ = _decompose(head[-1])
+            yield head[:-1] + _compose(h_onset, h_vowel) + '르'
+    if head and last in ('아', '어', '여'):
+        yield head                                              # 좋아 → 좋, 있어 → 있
+
+
+def _is_predicate(stem):
+    return (stem in PREDICATE_STEMS or (len(stem) > 1 and stem.endswith(PRODUCTIVE_SUFFIXES))
+            or _is_auxiliary_compound(stem))
+
+
+def _is_auxiliary_compound(stem):
+    """연결형 용언 + 보조 용언 어간인지 ('해' + '주', '망설여' + '지')"""
+    for aux in AUXILIARY_STEMS:
+        head = stem[:-len(aux)]
+        if len(stem) > len(aux) and stem.endswith(aux):
+            _, vowel, coda = _decompose(head[-1])
+            if not coda and vowel in (A, AE, EO, YEO, WA, WAE, WO):
+                # 연결형은 받침이 없으므로 ㄹ 탈락 복원 후보는 제외 ('사진' ≠ '살' + '지' + 'ㄴ')
+                restored = head[:-1] + _with_coda(head[-1], 'ㄹ')
+                if any(c != restored and (c in PREDICATE_STEMS or (len(c) > 1 and c.endswith(PRODUCTIVE_SUFFIXES)))
+                       for c in _stem_candidates(head)):
+                    return True
+    return False
+
+
+def _predicate_lemma(word):
+    """어절이 용언 활용형이면 '어간 + 다', 아니면 None"""
+    for k in range(1, len(word) + 1):
+        stem, rest = word[:k], word[k:]
+        splits = []
+        if rest in ENDINGS:
+            splits.append(stem)
+        coda = CODAS[_decompose(stem[-1])[2]]
+        if coda in ENDING_CODAS:
+            stem_coda, ending = ENDING_CODAS[coda]
+            if ending + rest in ENDINGS:
+                surface = stem[:-1] + _with_coda(stem[-1], stem_coda)
+                if ending == 'ㅆ' and surface in PAST_ONLY_STEMS:
+                    return surface + '다'
+                splits.append(surface)
+        for surface in splits:
+            for candidate in _stem_candidates(surface):
+                if _is_predicate(candidate):
+                    return candidate + '다'
+    return None
+
+
+def _strip_josa(word):
+    """체언 + 조사 → 체언 (음운 조건이 맞는 조사만, 예외 명사는 그대로)"""
+    if word in NOUN_EXCEPTIONS:
+        return word
+    for josa in JOSA:
+        if len(word) > len(josa) and word.endswith(josa):
+            noun = word[:-len(josa)]
+            has_coda = _decompose(noun[-1])[2] != 0
+            if (josa in JOSA_AFTER_CODA and not has_coda) or (josa in JOSA_AFTER_VOWEL and has_coda):
+                continue
+            return noun
+    return word
+
+
+def lemmatize_word(word):
+    """한글 어절 하나 → 표제어 (규칙 기반)"""
+    if word in NOUN_EXCEPTIONS or word in FIXED_WORDS:
+        return word
+    if word.endswith(ADVERBIAL_SUFFIXES):
+        return word[:-1] + '다'
+    return _predicate_lemma(word) or _strip_josa(word)
+
+
+def rule_lemmas(text):
+    """본문 → 표제어 리스트 (규칙 기반 분석기)"""
+    if not isinstance(text, str):
+        return []
+    lemmas = []
+    for word in WORD_PATTERN.findall(unicodedata.normalize('NFC', text)):
+        lemmas.append(word.lower() if word.isascii() else lemmatize_word(word))
+    return lemmas
+
+
+def check_examples():
+    """LEMMA_EXAMPLES 회귀 확인 → 기대와 다른 (어절, 기대 표제어, 실제 표제어) 리스트"""
+    return [(word, expected, lemmatize_word(word)) for word, expected in LEMMA_EXAMPLES
+            if lemmatize_word(word) != expected]
+
+
+def _get_kiwi():
+    """프로세스별 Kiwi 인스턴스 (모델 로딩은 한 번만)"""
+    global _kiwi
+    if _kiwi is None:
+        _kiwi = Kiwi()
+    return _kiwi
+
+
+def _kiwi_lemmas(tokens):
+    """Kiwi 토큰 → 표제어 리스트 (체언/어근/부사/외국어/용언만, 용언은 어간 + '다')"""
+    lemmas = []
+    for token in tokens:
+        tag = token.tag.split('-')[0]           # 'VV-R', 'VA-I' 같은 불규칙 표시 제거
+        if tag.startswith('N') or tag in KIWI_FORM_TAGS:
+            lemmas.append(token.form)
+        elif tag == 'SL':
+            lemmas.append(token.form.lower())
+        elif tag in KIWI_PREDICATE_TAGS:
+            lemmas.append(token.form + '다')
+    return lemmas
+
+
+def analyze_batch(texts, backend=DEFAULT_BACKEND):
+    """본문 배치 → 본문별 표제어 리스트 (프로세스 간 전달용 일반 list)"""
+    if backend == 'rules':
+        return [rule_lemmas(text) for text in texts]
+    if Kiwi is None:
+        raise ImportError("kiwi 분석기를 쓰려면 kiwipiepy 가 필요합니다 (pip install kiwipiepy)")
+    texts = [unicodedata.normalize('NFC', t) if isinstance(t, str) else '' for t in texts]
+    return [_kiwi_lemmas(tokens) for tokens in _get_kiwi().tokenize(texts)]
+
+
+def analyze_corpus(texts, workers=DEFAULT_WORKERS, backend=DEFAULT_BACKEND, batch_size=BATCH_SIZE):
+    """코퍼스 전체 분석: BATCH_SIZE 단위 배치를 프로세스 풀에서 분석 후 순서대로 이어 붙임"""
+    texts = list(texts)
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    analyze = partial(analyze_batch, backend=backend)
+    if workers <= 1 or len(batches) <= 1:
+        results = [analyze(batch) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(analyze, batches))
+    return [lemmas for batch in results for lemmas in batch]
+
+
+def analyzer_version(backend=DEFAULT_BACKEND):
+    """표제어 캐시 버전 (분석기 종류 + 규칙 사전/Kiwi 버전)"""
+    if backend == 'kiwi':
+        import kiwipiepy
+        return taxonomy_version('kiwi', kiwipiepy.__version__, KIWI_FORM_TAGS, KIWI_PREDICATE_TAGS)
+    return taxonomy_version('rules', RULES_VERSION)
+
+
+def lemma_streams(texts, workers=DEFAULT_WORKERS, backend=DEFAULT_BACKEND, use_cache=True):
+    """본문별 표제어 스트림 (use_cache=True 면 캐시에 없는 본문만 분석해 tag_cache 에 저장)"""
+    texts = list(texts)
+    analyze = partial(analyze_corpus, workers=workers, backend=backend)
+    if not use_cache:
+        return analyze(texts)
+    return cached_tags('lemmas', analyzer_version(backend), texts, analyze)
+
+
+def add_lemmas(df, column='lemmas', text_column='text', **kwargs):
+    """DataFrame 에 행별 표제어 리스트 컬럼 추가 (kwargs 는 lemma_streams 로 전달)"""
+    df[column] = lemma_streams(df[text_column], **kwargs)
+    return df
+
+
+def build_lemma_matcher(category_keywords):
+    """카테고리 키워드 사전 → 표제어 매처
+
+    키워드 k 는 표제어가 k, k + '다', 키워드 자체의 표제어와 같으면 매칭되고,
+    2음절 이상 키워드는 표제어의 앞부분과 같아도 매칭 (복합어 '가격대비', 파생 용언 '불편하다')
+    1음절 키워드('싸', '돈', '앱')는 완전 일치만 → '비싸다'/'싸움'/'돈가스' 는 매칭 안 됨
+    """
+    exact = defaultdict(set)
+    prefixes = defaultdict(set)
+    for category, keywords in category_keywords.items():
+        for keyword in keywords:
+            keyword = keyword.lower()
+            for form in {keyword, keyword + '다', *rule_lemmas(keyword)}:
+                exact[form].add(category)
+            if len(keyword) >= 2:
+                prefixes[keyword].add(category)
+
+    return {
+        'exact': dict(exact),
+        'prefixes': dict(prefixes),
+        'prefix_lengths': sorted({len(k) for k in prefixes}),
+        'categories': list(category_keywords.keys()),
+    }
+
+
+def match_lemmas(matcher, lemmas):
+    """표제어 리스트 → 매칭된 카테고리 리스트 (사전 정의 순서)"""
+    found = set()
+    exact, prefixes = matcher['exact'], matcher['prefixes']
+    for lemma in set(lemmas):
+        found |= exact.get(lemma, set())
+        for n in matcher['prefix_lengths']:
+            if n > len(lemma):
+                break
+            found |= prefixes.get(lemma[:n], set())
+    return [category for category in matcher['categories'] if category in found]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='한국어 표제어 분석')
+    parser.add_argument('text', nargs='?', help='분석할 문장')
+    parser.add_argument('--corpus', action='store_true', help='코퍼스 전체를 분석해 캐시에 적재')
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help=f'분석기 (기본: {DEFAULT_BACKEND})')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='분석 프로세스 수')
+    parser.add_argument('--check', action='store_true', help='규칙 분석기 회귀 예시(LEMMA_EXAMPLES) 확인')
+    args = parser.parse_args()
+
+    if args.check:
+        failures = check_examples()
+        for word, expected, actual in failures:
+            print(f"❌ {word}: 기대 {expected}, 실제 {actual}")
+        print(f"{'✅' if not failures else '⚠️'} 회귀 예시 {len(LEMMA_EXAMPLES) - len(failures)}/{len(LEMMA_EXAMPLES)} 통과")
+        if failures:
+            raise SystemExit(1)
+        return
+
+    if args.text:
+        print(' '.join(analyze_batch([args.text], args.backend)[0]))
+        return
+
+    if not args.corpus:
+        parser.error('문장을 주거나 --corpus / --check 를 지정하세요')
+
+    import time
+    from corpus_loader import load_corpus
+
+    df = load_corpus()
+    print(f"📊 코퍼스: {len(df):,}건 (분석기: {args.backend}, 프로세스 {args.workers}개)")
+    start = time.perf_counter()
+    streams = lemma_streams(df['text'], args.workers, args.backend)
+    total = sum(len(lemmas) for lemmas in streams)
+    print(f"✅ 표제어 {total:,}개 ({time.perf_counter() - start:.1f}초)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+MinHash + LSH 근사 중복 탐지
+- 문자 n-gram(shingle) 집합의 MinHash 서명으로 Jaccard 유사도 추정
+- LSH 밴딩으로 후보 쌍만 비교 → 문서 수에 대해 거의 선형 시간
+- 클러스터마다 가장 먼저 등장한 행을 대표(canonical)로 유지
+
+사용법:
+    from near_dup import near_duplicate_clusters, near_duplicate_mask
+    keep = near_duplicate_mask(df['text'], threshold=0.9)
+    df = df[keep]
+"""
+
+import re
+
+import numpy as np
+
+SHINGLE_SIZE = 5          # 문자 n-gram 길이
+NUM_PERM = 128            # MinHash 서명 길이 (해시 함수 수)
+DEFAULT_THRESHOLD = 0.9   # 근사 중복으로 볼 추정 Jaccard 유사도
+MIN_CHARS = 50            # 이보다 짧은 텍스트는 비교 대상에서 제외 (짧은 리뷰는 우연히 겹치기 쉬움)
+SEED = 42
+
+_WHITESPACE = re.compile(r'\s+')
+
+# 롤링 해시 / 믹싱 상수 (uint64 오버플로는 mod 2^64 로 동작)
+_ROLL_BASE = np.uint64(1099511628211)
+_MIX_1 = np.uint64(0xff51afd7ed558ccd)
+_MIX_2 = np.uint64(0xc4ceb9fe1a85ec53)
+_SHIFT = np.uint64(33)
+
+
+def normalize_text(text):
+    """소문자화 + 공백 정규화 (줄바꿈/여러 칸 공백 차이는 중복 판정에 영향 없게)"""
+    return _WHITESPACE.sub(' ', text.lower()).strip()
+
+
+def _mix(x):
+    """64비트 해시 믹싱 (murmur3 finalizer)"""
+    x = x ^ (x >> _SHIFT)
+    x = x * _MIX_1
+    x = x ^ (x >> _SHIFT)
+    x = x * _MIX_2
+    return x ^ (x >> _SHIFT)
+
+
+def shingle_hashes(text, k=SHINGLE_SIZE):
+    """텍스트의 문자 k-gram 해시 집합 (uint64, 중복 제거)"""
+    codes = np.frombuffer(normalize_text(text).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    if len(codes) == 0:
+        return np.zeros(0, dtype=np.uint64)
+    k = min(k, len(codes))
+
+    # 다항식 롤링 해시를 k 번의 벡터 연산으로 계산
+    hashes = np.zeros(len(codes) - k + 1, dtype=np.uint64)
+    for j in range(k):
+        hashes = hashes * _ROLL_BASE + codes[j:len(codes) - k + 1 + j]
+    return np.unique(_mix(hashes))
+
+
+def _permutations(num_perm, seed):
+    """MinHash 용 해시 함수 계수 (a 는 홀수 → mod 2^64 에서 전단사)"""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signatures(texts, num_perm=NUM_PERM, k=SHINGLE_SIZE, seed=SEED):
+    """문서별 MinHash 서명 행렬 (문서 수 × num_perm, uint64)
+
+    문자열이 아니거나 비어 있는 텍스트는 최댓값으로 채운 서명 (어떤 문서와도 매칭되지 않음)
+    """
+    a, b = _permutations(num_perm, seed)
+    empty = np.iinfo(np.uint64).max
+    signatures = np.full((len(texts), num_perm), empty, dtype=np.uint64)
+
+    for i, text in enumerate(texts):
+        if not isinstance(text, str):
+            continue
+        hashes = shingle_hashes(text, k)
+        if len(hashes):
+            # shingle 해시는 이미 _mix 로 섞여 있으므로 아핀 변환 (a*x + b mod 2^64) 만으로 충분
+            signatures[i] = (hashes[:, None] * a + b).min(axis=0)
+    return signatures
+
+
+def lsh_params(threshold, num_perm=NUM_PERM):
+    """threshold 근처에서 후보 판정이 급격히 바뀌도록 (밴드 수, 밴드당 행 수) 선택
+
+    밴드 b 개 × 행 r 개일 때 후보가 될 확률 곡선의 변곡점은 (1/b)^(1/r)
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+def build_index(threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM):
+    """LSH 인덱스 생성 (청크 단위 처리 시 여러 번에 걸쳐 재사용)"""
+    bands, rows = lsh_params(threshold, num_perm)
+    return {
+        'threshold': threshold,
+        'num_perm': num_perm,
+        'bands': bands,
+        'rows': rows,
+        'buckets': [{} for _ in range(bands)],
+        'signatures': [],
+    }
+
+
+def index_add(index, signatures, eligible=None):
+    """서명들을 순서대로 인덱스에 질의/추가
+
+    이미 인덱스에 있는 대표 문서와 추정 유사도가 threshold 이상이면 그 대표에 배정하고,
+    아니면 새 대표로 추가 (리더 클러스터링 - 대표만 인덱스에 들어가므로 메모리는 대표 수에 비례)
+
+    Returns:
+        각 서명의 대표 id 배열 (인덱스 추가 순번, 비교 제외 대상은 -1)
+    """
+    rows = index['rows']
+    num_perm = index['num_perm']
+    min_agree = int(np.ceil(index['threshold'] * num_perm))
+    canonical = np.full(len(signatures), -1, dtype=np.int64)
+
+    for i, signature in enumerate(signatures):
+        if eligible is not None and not eligible[i]:
+            continue
+
+        keys = [signature[band * rows:(band + 1) * rows].tobytes() for band in range(index['bands'])]
+
+        # 후보 대표들 중 가장 먼저 추가된 유사 문서에 배정
+        candidates = set()
+        for band, key in enumerate(keys):
+            candidates.update(index['buckets'][band].get(key, ()))
+        match = -1
+        for candidate in sorted(candidates):
+            if np.count_nonzero(index['signatures'][candidate] == signature) >= min_agree:
+                match = candidate
+                break
+
+        if match < 0:
+            match = len(index['signatures'])
+            index['signatures'].append(signature)
+            for band, key in enumerate(keys):
+                index['buckets'][band].setdefault(key, []).append(match)
+        canonical[i] = match
+
+    return canonical
+
+
+def _eligible(texts, min_chars):
+    return np.array([isinstance(t, str) and len(t) >= min_chars for t in texts], dtype=bool)
+
+
+def near_duplicate_clusters(texts, threshold=DEFAULT_THRESHOLD, index=None, min_chars=MIN_CHARS):
+    """근사 중복 클러스터 탐지
+
+    Args:
+        texts: 텍스트 시퀀스
+        index: 이전 청크에서 이어 쓸 LSH 인덱스 (None 이면 새로 생성)
+
+    Returns:
+        (canonical, is_duplicate)
+        canonical: 행별 대표 id (비교 제외 행은 -1)
+        is_duplicate: 앞에서 이미 같은 클러스터가 나온 행이면 True
+    """
+    texts = list(texts)
+    if index is None:
+        index = build_index(threshold)
+    existing = len(index['signatures'])
+
+    eligible = _eligible(texts, min_chars)
+    signatures = minhash_signatures([t if e else None for t, e in zip(texts, eligible)],
+                                    index['num_perm'])
+    canonical = index_add(index, signatures, eligible)
+
+    # 대표가 새로 추가된 행 = 클러스터의 첫 행
+    is_duplicate = np.zeros(len(texts), dtype=bool)
+    seen = set(range(existing))
+    for i, cluster in enumerate(canonical):
+        if cluster < 0:
+            continue
+        if cluster in seen:
+            is_duplicate[i] = True
+        else:
+            seen.add(cluster)
+    return canonical, is_duplicate
+
+
+def near_duplicate_mask(texts, threshold=DEFAULT_THRESHOLD, index=None, min_chars=MIN_CHARS):
+    """클러스터별 대표 행만 남기는 불리언 마스크 (True = 유지)"""
+    _, is_duplicate = near_duplicate_clusters(texts, threshold, index, min_chars)
+    return ~is_duplicate
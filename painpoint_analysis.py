@@ -6,9 +6,25 @@
 """
 
 import pandas as pd
+import numpy as np
 import re
+import hashlib
 from collections import Counter
 import os
+import argparse
+
+from corpus_loader import load_csv
+from corpus_schema import apply_schema
+from lemmatizer import build_lemma_matcher, lemma_streams, match_lemmas
+from near_dup import build_index, near_duplicate_mask
+from tag_cache import cached_tags, taxonomy_version
+
+# 스트리밍 모드 설정
+STREAM_CHUNKSIZE = 5000   # 청크당 행 수
+EXAMPLE_LIMIT = 5         # 카테고리별 예시 최대 개수
+
+# 근사 중복 제거 (MinHash/LSH, 추정 Jaccard 유사도 기준)
+NEAR_DUP_THRESHOLD = 0.9
 
 # 페인포인트 키워드 사전
 PAINPOINT_KEYWORDS = {
@@ -52,9 +68,102 @@ NEGATIVE_INDICATORS = [
     '버그', '안됨', '안됩', '안되', '느림', '느리', '불편', '아쉬움'
 ]
 
+# 태그 캐시 버전 (사전이 바뀌면 해당 택소노미 캐시만 무효화)
+PAINPOINT_VERSION = taxonomy_version(PAINPOINT_KEYWORDS)
+NEGATIVE_VERSION = taxonomy_version(NEGATIVE_INDICATORS)
+
+
+def _trie_pattern(words):
+    """키워드 집합을 공통 접두어로 묶은 trie 형태 정규식 문자열로 변환"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True  # 키워드 종료 표시
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child)
+                    for char, child in sorted(node.items()) if char != '']
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # 여기서 끝나는 키워드가 있으면 나머지는 선택적 (greedy → 가장 긴 키워드 우선)
+        return '(?:' + body + ')?' if '' in node else body
+
+    return emit(trie)
+
+
+def build_keyword_matcher(category_keywords, negative_indicators):
+    """카테고리 키워드 + 부정 표현을 하나의 정규식 오토마톤으로 컴파일
+
+    - trie 정규식으로 각 시작 위치에서 가장 긴 키워드를 찾고,
+      그 키워드에 포함된 짧은 키워드('안됨' ⊃ '안')는 미리 계산한 포함 관계로 복원
+    - 결과적으로 `keyword in text` 를 키워드마다 반복한 것과 동일한 집합을 한 번에 얻음
+    """
+    keywords = set(negative_indicators)
+    for words in category_keywords.values():
+        keywords.update(words)
+
+    pattern = re.compile(_trie_pattern(keywords))
+
+    # 매칭된 키워드 → (해당 카테고리 집합, 부정 표현 집합)
+    negative_set = set(negative_indicators)
+    implied = {}
+    for matched in keywords:
+        contained = {k for k in keywords if k in matched}
+        categories = frozenset(
+            cat for cat, words in category_keywords.items()
+            if any(k in contained for k in words)
+        )
+        implied[matched] = (categories, frozenset(contained & negative_set))
+
+    return {
+        'pattern': pattern,
+        'implied': implied,
+        'categories': list(category_keywords.keys()),
+    }
+
+
+KEYWORD_MATCHER = build_keyword_matcher(PAINPOINT_KEYWORDS, NEGATIVE_INDICATORS)
+
+# 표제어 매칭용 ('싸' 는 '싸다' 만, '비싸다'/'싸움' 은 매칭 안 됨)
+LEMMA_MATCHER = build_lemma_matcher(PAINPOINT_KEYWORDS)
+
+
+def match_keywords(text, matcher=KEYWORD_MATCHER):
+    """한 번의 스캔으로 (페인포인트 카테고리 리스트, 부정 표현 개수) 반환"""
+    text = str(text).lower()
+    implied = matcher['implied']
+
+    found_categories = set()
+    found_negatives = set()
+    # 다음 검색을 match.start()+1 에서 시작 → 겹치는 키워드도 놓치지 않음
+    match = matcher['pattern'].search(text)
+    while match:
+        categories, negatives = implied[match.group()]
+        found_categories |= categories
+        found_negatives |= negatives
+        match = matcher['pattern'].search(text, match.start() + 1)
 
-def clean_data(df):
-    """데이터 정리 - 광고/무관한 데이터 제거"""
+    # PAINPOINT_KEYWORDS 정의 순서 유지
+    categories = [cat for cat in matcher['categories'] if cat in found_categories]
+    return categories, len(found_negatives)
+
+
+def _text_digest(text):
+    """중복 판별용 텍스트 다이제스트 (원문 대신 16바이트만 보관)"""
+    return hashlib.md5(text.encode('utf-8')).digest()
+
+
+def clean_data(df, seen_texts=None, near_dup_threshold=NEAR_DUP_THRESHOLD, near_dup_index=None):
+    """데이터 정리 - 광고/무관한 데이터 제거
+
+    seen_texts: 청크 단위로 정리할 때 이전 청크에서 본 텍스트 다이제스트 집합
+                (주어지면 청크 간 중복도 제거하고 집합을 갱신)
+    near_dup_threshold: 근사 중복 판정 유사도 (None 이면 정확히 같은 텍스트만 제거)
+    near_dup_index: 청크 간 근사 중복 제거용 LSH 인덱스 (near_dup.build_index)
+    """
     # 블라인드 광고 데이터 제거
     df = df[~df['text'].str.contains('블라인드에 광고하세요', na=False)]
 
@@ -63,28 +172,32 @@ def clean_data(df):
 
     # 중복 제거
     df = df.drop_duplicates(subset=['text'])
+    if seen_texts is not None:
+        digests = df['text'].map(_text_digest)
+        is_new = ~digests.isin(seen_texts)
+        df = df[is_new.to_numpy()]
+        seen_texts.update(digests[is_new])
 
-    return df.reset_index(drop=True)
+    # 근사 중복 제거 (크로스포스팅/퍼온 글 등, 클러스터별 첫 행만 유지)
+    if near_dup_threshold is not None:
+        df = df[near_duplicate_mask(df['text'], near_dup_threshold, near_dup_index)]
+    df = df.reset_index(drop=True)
 
+    # 제거된 행에만 있던 범주 정리 (category 컬럼 집계에 0건 항목이 남지 않도록)
+    for col in df.select_dtypes('category').columns:
+        df[col] = df[col].cat.remove_unused_categories()
 
-def extract_painpoints(text):
-    """텍스트에서 페인포인트 카테고리 추출"""
-    text = str(text).lower()
-    found_categories = []
+    return df
 
-    for category, keywords in PAINPOINT_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in text:
-                found_categories.append(category)
-                break  # 카테고리당 하나만 카운트
-
-    return found_categories
 
+def extract_painpoints(text):
+    """텍스트에서 페인포인트 카테고리 추출"""
+    categories, _ = match_keywords(text)
+    return categories  # 카테고리당 하나만 카운트
 
-def is_negative_review(text, rating=None):
-    """부정적 리뷰인지 판단"""
-    text = str(text).lower()
 
+def is_negative_review(text, rating=None, negative_count=None):
+    """부정적 리뷰인지 판단 (negative_count 를 넘기면 텍스트 재스캔 생략)"""
     # 별점이 있으면 활용
     if rating is not None and rating != '':
         try:
@@ -94,49 +207,172 @@ def is_negative_review(text, rating=None):
             pass
 
     # 부정적 표현 카운트
-    negative_count = sum(1 for indicator in NEGATIVE_INDICATORS if indicator in text)
+    if negative_count is None:
+        _, negative_count = match_keywords(text)
 
     return negative_count >= 2
 
 
-def analyze_painpoints(df):
-    """페인포인트 분석 수행"""
-    results = {
+def _string_column(series):
+    """문자열 연산용 컬럼 변환 (pyarrow 가 있으면 Arrow 기반 벡터 연산 사용)"""
+    lowered = series.astype(str).str.lower()
+    try:
+        return lowered.astype('string[pyarrow]')
+    except ImportError:
+        return lowered
+
+
+def _painpoint_hits(column):
+    """(행 × 카테고리) 불리언 행렬 (소문자화된 문자열 컬럼 기준)"""
+    if not len(column):
+        return np.zeros((0, len(PAINPOINT_KEYWORDS)), dtype=bool)
+    return np.column_stack([
+        column.str.contains(_trie_pattern(keywords), regex=True).to_numpy(dtype=bool)
+        for keywords in PAINPOINT_KEYWORDS.values()
+    ])
+
+
+def _negative_counts(column):
+    """행별 부정 표현 개수 (소문자화된 문자열 컬럼 기준)"""
+    negative_count = np.zeros(len(column), dtype=np.int32)
+    for indicator in NEGATIVE_INDICATORS:
+        negative_count += column.str.contains(indicator, regex=False).to_numpy(dtype=bool)
+    return negative_count
+
+
+def _tag_categories(texts):
+    """텍스트 리스트 → 행별 카테고리 리스트 (태그 캐시 저장용)"""
+    categories = list(PAINPOINT_KEYWORDS.keys())
+    hits = _painpoint_hits(_string_column(pd.Series(texts, dtype=object)))
+    return [[categories[j] for j in np.flatnonzero(row)] for row in hits]
+
+
+def _tag_negative_counts(texts):
+    """텍스트 리스트 → 행별 부정 표현 개수 (태그 캐시 저장용)"""
+    return _negative_counts(_string_column(pd.Series(texts, dtype=object))).tolist()
+
+
+def _lemma_hits(streams):
+    """행별 표제어 리스트 → (행 × 카테고리) 불리언 행렬"""
+    category_index = {cat: j for j, cat in enumerate(PAINPOINT_KEYWORDS)}
+    hits = np.zeros((len(streams), len(category_index)), dtype=bool)
+    for i, lemmas in enumerate(streams):
+        hits[i, [category_index[cat] for cat in match_lemmas(LEMMA_MATCHER, lemmas)]] = True
+    return hits
+
+
+def tag_painpoints(texts, use_cache=False, use_lemmas=False):
+    """text 컬럼 전체를 한 번에 태깅
+
+    use_cache=True 면 태그 캐시(tag_cache)에 없는 본문만 태깅
+    (PAINPOINT_KEYWORDS / NEGATIVE_INDICATORS 를 고치면 해당 택소노미 캐시만 무효화)
+    use_lemmas=True 면 카테고리를 부분 문자열 대신 표제어 스트림(lemmatizer)으로 매칭
+
+    Returns:
+        hits: (행 × 카테고리) 불리언 행렬 (NumPy)
+        negative_count: 행별 부정 표현 개수 (NumPy)
+    """
+    if not use_cache and not use_lemmas:
+        column = _string_column(texts)
+        return _painpoint_hits(column), _negative_counts(column)
+
+    texts = list(texts)
+    if use_lemmas:
+        hits = _lemma_hits(lemma_streams(texts, use_cache=use_cache))
+    else:
+        category_index = {cat: j for j, cat in enumerate(PAINPOINT_KEYWORDS)}
+        hits = np.zeros((len(texts), len(category_index)), dtype=bool)
+        for i, labels in enumerate(cached_tags('painpoint', PAINPOINT_VERSION, texts, _tag_categories)):
+            hits[i, [category_index[label] for label in labels]] = True
+
+    if use_cache:
+        negative_count = np.array(cached_tags('negative', NEGATIVE_VERSION, texts, _tag_negative_counts),
+                                  dtype=np.int32)
+    else:
+        negative_count = np.array(_tag_negative_counts(texts), dtype=np.int32)
+    return hits, negative_count
+
+
+def empty_results():
+    """분석 결과 초기값"""
+    return {
+        'total_reviews': 0,
+        'platform_counts': Counter(),
         'category_counts': Counter(),
         'negative_reviews': [],
-        'category_examples': {cat: [] for cat in PAINPOINT_KEYWORDS.keys()},
+        'category_examples': {cat: [] for cat in PAINPOINT_KEYWORDS},
         'rating_distribution': {}
     }
 
-    for idx, row in df.iterrows():
-        text = row['text']
-        rating = row.get('rating', '')
-
-        # 카테고리 추출
-        categories = extract_painpoints(text)
-
-        # 부정적 리뷰 판별
-        is_negative = is_negative_review(text, rating)
-
-        if is_negative and categories:
-            for cat in categories:
-                results['category_counts'][cat] += 1
-
-                # 예시 저장 (카테고리당 최대 5개)
-                if len(results['category_examples'][cat]) < 5:
-                    results['category_examples'][cat].append({
-                        'text': text[:200] + '...' if len(text) > 200 else text,
-                        'rating': rating,
-                        'platform': row['platform']
-                    })
-
-            results['negative_reviews'].append({
-                'text': text,
-                'rating': rating,
-                'categories': categories,
-                'platform': row['platform']
+
+def merge_results(results, partial):
+    """청크 분석 결과를 누적 결과에 합치기 (예시는 카테고리당 EXAMPLE_LIMIT 개까지)"""
+    results['total_reviews'] += partial['total_reviews']
+    results['platform_counts'].update(partial['platform_counts'])
+    results['category_counts'].update(partial['category_counts'])
+    results['negative_reviews'].extend(partial['negative_reviews'])
+
+    for cat, examples in partial['category_examples'].items():
+        merged = results['category_examples'][cat]
+        merged.extend(examples[:EXAMPLE_LIMIT - len(merged)])
+
+    rating_distribution = Counter(results['rating_distribution'])
+    rating_distribution.update(partial['rating_distribution'])
+    results['rating_distribution'] = dict(sorted(rating_distribution.items()))
+    return results
+
+
+def analyze_painpoints(df, use_cache=False, use_lemmas=False):
+    """페인포인트 분석 수행 (컬럼 단위 벡터 연산, use_cache=True 면 태그 캐시, use_lemmas=True 면 표제어 매칭)"""
+    categories = list(PAINPOINT_KEYWORDS.keys())
+    results = empty_results()
+    results['total_reviews'] = len(df)
+    results['platform_counts'] = Counter(df['platform'].value_counts().to_dict())
+
+    hits, negative_count = tag_painpoints(df['text'], use_cache, use_lemmas)
+
+    # 부정적 리뷰 판별: 별점 2점 이하 또는 부정 표현 2개 이상
+    if 'rating' in df.columns:
+        ratings = df['rating'].to_numpy()
+        low_rating = (pd.to_numeric(df['rating'], errors='coerce') <= 2).to_numpy()
+    else:
+        ratings = np.full(len(df), '', dtype=object)
+        low_rating = np.zeros(len(df), dtype=bool)
+    is_negative = low_rating | (negative_count >= 2)
+
+    # 부정적이면서 카테고리가 하나 이상인 행만 선택
+    selected = np.flatnonzero(is_negative & hits.any(axis=1))
+    selected_hits = hits[selected]
+    texts = df['text'].to_numpy()
+    platforms = df['platform'].to_numpy()
+
+    # 카테고리 카운트 (기존 행 단위 순회와 같은 삽입 순서: 첫 등장 행 → 정의 순서)
+    if len(selected):
+        counts = selected_hits.sum(axis=0)
+        first_rows = selected_hits.argmax(axis=0)
+        for j in sorted(np.flatnonzero(counts), key=lambda j: (first_rows[j], j)):
+            results['category_counts'][categories[j]] = int(counts[j])
+
+    # 예시 저장 (카테고리당 최대 EXAMPLE_LIMIT 개)
+    for j, cat in enumerate(categories):
+        for i in selected[np.flatnonzero(selected_hits[:, j])[:EXAMPLE_LIMIT]]:
+            text = texts[i]
+            results['category_examples'][cat].append({
+                'text': text[:200] + '...' if len(text) > 200 else text,
+                'rating': ratings[i],
+                'platform': platforms[i]
             })
 
+    results['negative_reviews'] = [
+        {
+            'text': texts[i],
+            'rating': ratings[i],
+            'categories': [categories[j] for j in np.flatnonzero(row_hits)],
+            'platform': platforms[i]
+        }
+        for i, row_hits in zip(selected, selected_hits)
+    ]
+
     # 별점 분포 (Google Play만)
     gp_df = df[df['platform'] == 'Google Play']
     if not gp_df.empty:
@@ -146,7 +382,36 @@ def analyze_painpoints(df):
     return results
 
 
-def generate_report(df, results, output_path):
+def analyze_painpoints_streaming(input_path, cleaned_path=None, chunksize=STREAM_CHUNKSIZE,
+                                 near_dup_threshold=NEAR_DUP_THRESHOLD, use_cache=False, use_lemmas=False):
+    """CSV 를 청크 단위로 읽으며 정리 → 태깅 → 부정 판별 → 결과 누적
+
+    전체를 메모리에 올리지 않으므로 큰 코퍼스에도 사용 가능.
+    청크 간 중복은 텍스트 다이제스트로 제거하고, 정리된 데이터는 청크마다 cleaned_path 에 이어 씀.
+    """
+    results = empty_results()
+    seen_texts = set()
+    near_dup_index = build_index(near_dup_threshold) if near_dup_threshold is not None else None
+    total_raw = 0
+
+    for i, chunk in enumerate(pd.read_csv(input_path, chunksize=chunksize)):
+        total_raw += len(chunk)
+        chunk = clean_data(apply_schema(chunk), seen_texts, near_dup_threshold, near_dup_index)
+
+        if cleaned_path:
+            if i == 0:
+                chunk.to_csv(cleaned_path, index=False, encoding='utf-8-sig')
+            else:
+                chunk.to_csv(cleaned_path, mode='a', header=False, index=False, encoding='utf-8')
+
+        merge_results(results, analyze_painpoints(chunk, use_cache, use_lemmas))
+        print(f"   청크 {i + 1}: 누적 {total_raw:,}개 읽음 → 정리 후 {results['total_reviews']:,}개, "
+              f"부정적 리뷰 {len(results['negative_reviews']):,}개")
+
+    return results
+
+
+def generate_report(results, output_path):
     """분석 보고서 생성"""
     report_lines = []
 
@@ -157,14 +422,14 @@ def generate_report(df, results, output_path):
 
     # 1. 데이터 개요
     report_lines.append("## 1. 데이터 개요")
-    report_lines.append(f"   - 총 리뷰 수: {len(df)}개")
+    report_lines.append(f"   - 총 리뷰 수: {results['total_reviews']}개")
     report_lines.append(f"   - 부정적 리뷰 수: {len(results['negative_reviews'])}개")
-    report_lines.append(f"   - 부정적 리뷰 비율: {len(results['negative_reviews'])/len(df)*100:.1f}%")
+    report_lines.append(f"   - 부정적 리뷰 비율: {len(results['negative_reviews'])/results['total_reviews']*100:.1f}%")
     report_lines.append("")
 
     # 플랫폼별 분포
     report_lines.append("   플랫폼별 분포:")
-    for platform, count in df['platform'].value_counts().items():
+    for platform, count in results['platform_counts'].most_common():
         report_lines.append(f"     - {platform}: {count}개")
     report_lines.append("")
 
@@ -261,8 +526,10 @@ def save_negative_reviews(results, output_path):
         print(f"   부정적 리뷰 저장: {output_path}")
 
 
-def main():
-    """메인 실행 함수"""
+def main(stream=False, chunksize=STREAM_CHUNKSIZE, near_dup_threshold=NEAR_DUP_THRESHOLD, use_cache=True,
+         use_lemmas=False):
+    """메인 실행 함수 (stream=True 면 청크 단위 스트리밍 분석, use_cache=True 면 새 본문만 태깅,
+    use_lemmas=True 면 카테고리를 표제어로 매칭)"""
     print("=" * 60)
     print("🔍 링글(Ringle) 페인포인트 분석")
     print("=" * 60)
@@ -275,25 +542,35 @@ def main():
         print(f"❌ 데이터 파일을 찾을 수 없습니다: {input_path}")
         return
 
-    df = pd.read_csv(input_path)
-    print(f"\n📂 원본 데이터 로드: {len(df)}개 리뷰")
-
-    # 데이터 정리
-    df = clean_data(df)
-    print(f"📂 정리 후 데이터: {len(df)}개 리뷰")
-
-    # 정리된 데이터 저장
     cleaned_path = os.path.join(data_dir, 'ringle_reviews_cleaned.csv')
-    df.to_csv(cleaned_path, index=False, encoding='utf-8-sig')
-    print(f"   정리된 데이터 저장: {cleaned_path}")
 
-    # 페인포인트 분석
-    print("\n🔬 페인포인트 분석 중...")
-    results = analyze_painpoints(df)
+    if stream:
+        # 청크 단위로 읽으면서 정리/분석 (정리된 데이터도 청크마다 저장)
+        print(f"\n🔬 스트리밍 페인포인트 분석 중... (청크당 {chunksize:,}행)")
+        df = None
+        results = analyze_painpoints_streaming(input_path, cleaned_path, chunksize, near_dup_threshold,
+                                               use_cache, use_lemmas)
+        print(f"📂 정리 후 데이터: {results['total_reviews']}개 리뷰")
+        print(f"   정리된 데이터 저장: {cleaned_path}")
+    else:
+        df = load_csv(input_path)
+        print(f"\n📂 원본 데이터 로드: {len(df)}개 리뷰")
+
+        # 데이터 정리
+        df = clean_data(df, near_dup_threshold=near_dup_threshold)
+        print(f"📂 정리 후 데이터: {len(df)}개 리뷰")
+
+        # 정리된 데이터 저장
+        df.to_csv(cleaned_path, index=False, encoding='utf-8-sig')
+        print(f"   정리된 데이터 저장: {cleaned_path}")
+
+        # 페인포인트 분석
+        print("\n🔬 페인포인트 분석 중...")
+        results = analyze_painpoints(df, use_cache, use_lemmas)
 
     # 보고서 생성
     report_path = os.path.join(data_dir, 'painpoint_report.txt')
-    report = generate_report(df, results, report_path)
+    report = generate_report(results, report_path)
     print(f"\n📊 분석 보고서 저장: {report_path}")
 
     # 부정적 리뷰 저장
@@ -307,4 +584,20 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='링글 페인포인트 분석')
+    parser.add_argument('--stream', action='store_true',
+                        help='CSV 를 청크 단위로 읽으며 분석 (메모리보다 큰 입력용)')
+    parser.add_argument('--chunksize', type=int, default=STREAM_CHUNKSIZE,
+                        help=f'스트리밍 모드 청크당 행 수 (기본 {STREAM_CHUNKSIZE})')
+    parser.add_argument('--near-dup-threshold', type=float, default=NEAR_DUP_THRESHOLD,
+                        help=f'근사 중복으로 제거할 추정 Jaccard 유사도 (기본 {NEAR_DUP_THRESHOLD})')
+    parser.add_argument('--exact-dedup-only', action='store_true',
+                        help='근사 중복 제거 없이 완전히 같은 텍스트만 제거')
+    parser.add_argument('--no-tag-cache', action='store_true',
+                        help='태그 캐시를 쓰지 않고 모든 리뷰를 다시 태깅')
+    parser.add_argument('--lemmas', action='store_true',
+                        help='카테고리를 부분 문자열 대신 표제어(형태소 분석 결과)로 매칭')
+    args = parser.parse_args()
+    main(stream=args.stream, chunksize=args.chunksize,
+         near_dup_threshold=None if args.exact_dedup_only else args.near_dup_threshold,
+         use_cache=not args.no_tag_cache, use_lemmas=args.lemmas)
@@ -6,10 +6,16 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
 from collections import defaultdict
 import json
 
-base_path = "/Users/yeong-gwang/Documents/배움 오전 1.38.42/외부/공모전/2026/링글/프로젝트/data"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from corpus_loader import DATA_DIR, load_corpus
+from corpus_schema import memory_report
+from near_dup import DEFAULT_THRESHOLD, near_duplicate_clusters
+
+base_path = DATA_DIR
 
 companies = ['ringle', 'cake', 'hackers', 'malhae', 'maxai', 'pagoda', 'santa', 'uphone', 'yanadu', 'carrot']
 
@@ -26,26 +32,8 @@ audit_results = {
     'quality_issues': []
 }
 
-# 1. 전체 데이터 로드 및 분석
-all_data = []
-raw_files = []
-
-for company in companies:
-    # master_data 또는 filtered 파일 찾기
-    master_path = f"{base_path}/{company}/{company}_master_data.csv"
-    filtered_path = f"{base_path}/{company}/{company}_filtered.csv"
-
-    if os.path.exists(filtered_path):
-        df = pd.read_csv(filtered_path)
-        raw_files.append({'company': company, 'file': 'filtered', 'rows': len(df)})
-        all_data.append(df)
-    elif os.path.exists(master_path):
-        df = pd.read_csv(master_path)
-        raw_files.append({'company': company, 'file': 'master', 'rows': len(df)})
-        all_data.append(df)
-
-# 전체 데이터 병합
-df_all = pd.concat(all_data, ignore_index=True)
+# 1. 전체 데이터 로드 및 분석 (타입 적용 + 캐시)
+df_all = load_corpus(base_path, companies)
 
 print("=" * 60)
 print("1. 데이터 수집 현황 (Data Collection Summary)")
@@ -83,6 +71,9 @@ print("2. 컬럼 스키마 (Column Schema)")
 print("=" * 60)
 
 print(f"\n총 컬럼 수: {len(df_all.columns)}")
+memory_mb = memory_report(df_all)
+print(f"메모리 사용량: {sum(memory_mb.values()):.2f}MB (문자열 실제 크기 포함)")
+audit_results['memory_mb'] = round(sum(memory_mb.values()), 2)
 print("\n[컬럼 상세]")
 for col in df_all.columns:
     dtype = str(df_all[col].dtype)
@@ -94,12 +85,14 @@ for col in df_all.columns:
     print(f"    - 타입: {dtype}")
     print(f"    - 유효값: {non_null:,}건 (결측: {null_pct:.1f}%)")
     print(f"    - 고유값: {unique:,}개")
+    print(f"    - 메모리: {memory_mb[col]:.2f}MB")
 
     audit_results['column_schema'][col] = {
         'dtype': dtype,
         'non_null': int(non_null),
         'null_pct': round(null_pct, 2),
-        'unique': int(unique)
+        'unique': int(unique),
+        'memory_mb': memory_mb[col]
     }
 
 print("\n" + "=" * 60)
@@ -153,6 +146,22 @@ if 'text' in df_all.columns:
             'severity': 'medium'
         })
 
+    # 근사 중복 (MinHash/LSH): 완전히 같지는 않지만 거의 같은 텍스트 (크로스포스팅, 퍼온 글 등)
+    canonical, is_near_dup = near_duplicate_clusters(df_all['text'], DEFAULT_THRESHOLD)
+    near_only = int((is_near_dup & ~df_all['text'].duplicated().to_numpy()).sum())
+    cluster_sizes = pd.Series(canonical[canonical >= 0]).value_counts()
+    near_clusters = int((cluster_sizes > 1).sum())
+    print(f"[근사 중복 (유사도 ≥{DEFAULT_THRESHOLD})]: 완전 중복 외 {near_only:,}건 추가 "
+          f"(2건 이상 클러스터 {near_clusters:,}개)")
+    if near_only > 0:
+        audit_results['quality_issues'].append({
+            'issue': 'near_duplicate_text',
+            'count': near_only,
+            'clusters': near_clusters,
+            'threshold': DEFAULT_THRESHOLD,
+            'severity': 'medium'
+        })
+
 # 너무 짧은 텍스트
 if 'text' in df_all.columns:
     short_text = (df_all['text'].str.len() < 10).sum()
@@ -4,34 +4,38 @@
 2026 Ringle Competition Analysis
 """
 
-import pandas as pd
+import os
+import sys
+import argparse
 import numpy as np
-import re
 import json
-from collections import Counter, defaultdict
-from scipy import stats
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import warnings
 warnings.filterwarnings('ignore')
 
-# 데이터 로드
-base_path = "/Users/yeong-gwang/Documents/배움 오전 1.38.42/외부/공모전/2026/링글/프로젝트/data"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tag_cache
+from tag_cache import taxonomy_version, text_key
+from text_tagger import build_tagger, tag_text, tag_corpus, label_columns
+from corpus_loader import DATA_DIR, load_corpus
+from rating_stats import (RESAMPLES, SEED, anova, bootstrap, chi_square, group_stats, invert_groups,
+                          permutation_test, pooled, rating_counts, ttest)
+
+base_path = DATA_DIR
 
 companies = ['ringle', 'cake', 'hackers', 'malhae', 'maxai', 'pagoda', 'santa', 'uphone', 'yanadu', 'carrot']
-all_data = []
-
-for company in companies:
-    try:
-        df = pd.read_csv(f"{base_path}/{company}/{company}_filtered.csv")
-        all_data.append(df)
-    except:
-        try:
-            df = pd.read_csv(f"{base_path}/{company}/{company}_master_data.csv")
-            all_data.append(df)
-        except:
-            print(f"Warning: {company} data not found")
-
-df = pd.concat(all_data, ignore_index=True)
-print(f"총 데이터: {len(df)}건")
+
+# 태깅 병렬 실행 기본값
+DEFAULT_WORKERS = os.cpu_count() or 1
+SHARD_MODES = ('company', 'rows')   # 회사별 샤드 / 행 구간 샤드
+
+
+def load_data():
+    """데이터 로드 (타입 적용 + 캐시, 원본 CSV 가 바뀌면 자동으로 다시 읽음)"""
+    df = load_corpus(base_path, companies)
+    print(f"총 데이터: {len(df)}건")
+    return df
 
 # ============================================================
 # PART 1: 서비스 유형별 분석
@@ -71,26 +75,28 @@ def classify_service(company):
             result['learning_mode'] = mode
     return result
 
-# 서비스 유형별 통계 분석
-part1_results = {
-    'service_classification': [classify_service(c) for c in companies],
-    'type_comparison': {}
-}
+def run_part1(df):
+    """PART 1: 서비스 유형별 통계"""
+    part1_results = {
+        'service_classification': [classify_service(c) for c in companies],
+        'type_comparison': {}
+    }
 
-for type_name, type_companies in SERVICE_TYPES.items():
-    type_df = df[df['company'].str.lower().isin(type_companies)]
-    if 'rating' in type_df.columns:
-        ratings = type_df['rating'].dropna()
-        if len(ratings) > 0:
-            part1_results['type_comparison'][type_name] = {
-                'count': len(type_df),
-                'avg_rating': round(ratings.mean(), 2),
-                'std_rating': round(ratings.std(), 2),
-                'companies': type_companies
-            }
-
-print("\n=== PART 1: 서비스 유형별 분석 ===")
-print(json.dumps(part1_results, indent=2, ensure_ascii=False))
+    for type_name, type_companies in SERVICE_TYPES.items():
+        type_df = df[df['company'].str.lower().isin(type_companies)]
+        if 'rating' in type_df.columns:
+            ratings = type_df['rating'].dropna().astype('float64')  # 저장은 float32, 통계는 float64
+            if len(ratings) > 0:
+                part1_results['type_comparison'][type_name] = {
+                    'count': len(type_df),
+                    'avg_rating': round(ratings.mean(), 2),
+                    'std_rating': round(ratings.std(), 2),
+                    'companies': type_companies
+                }
+
+    print("\n=== PART 1: 서비스 유형별 분석 ===")
+    print(json.dumps(part1_results, indent=2, ensure_ascii=False))
+    return part1_results
 
 # ============================================================
 # PART 2: 사용자 여정 분석 (User Journey)
@@ -126,43 +132,7 @@ JOURNEY_PATTERNS = {
 
 def detect_journey_stage(text):
     """텍스트에서 사용자 여정 단계 감지"""
-    if not isinstance(text, str):
-        return []
-    stages = []
-    for stage, info in JOURNEY_PATTERNS.items():
-        for pattern in info['keywords']:
-            if re.search(pattern, text, re.IGNORECASE):
-                stages.append(stage)
-                break
-    return stages
-
-# 회사별 여정 단계 분포 분석
-journey_by_company = defaultdict(lambda: defaultdict(int))
-journey_examples = defaultdict(lambda: defaultdict(list))
-
-for idx, row in df.iterrows():
-    text = str(row.get('text', ''))
-    company = str(row.get('company', '')).upper()
-    stages = detect_journey_stage(text)
-    for stage in stages:
-        journey_by_company[company][stage] += 1
-        if len(journey_examples[company][stage]) < 3:
-            journey_examples[company][stage].append(text[:200])
-
-part2_results = {
-    'journey_distribution': dict(journey_by_company),
-    'methodology': {
-        'patterns_used': len(JOURNEY_PATTERNS),
-        'stages': list(JOURNEY_PATTERNS.keys())
-    }
-}
-
-print("\n=== PART 2: 사용자 여정 분석 ===")
-for company in ['RINGLE', 'CAKE', 'YANADU', 'UPHONE']:
-    if company in journey_by_company:
-        print(f"\n{company}:")
-        for stage, count in sorted(journey_by_company[company].items(), key=lambda x: -x[1]):
-            print(f"  {stage}: {count}건")
+    return _tag_labels(text, 'journey')
 
 # ============================================================
 # PART 3: 심리적 동기 유형별 분석
@@ -250,155 +220,320 @@ BARRIER_TYPES = {
 
 def analyze_motivation(text):
     """텍스트에서 동기 유형 분석"""
-    if not isinstance(text, str):
-        return []
-    found = []
-    for mtype, info in MOTIVATION_TYPES.items():
-        for pattern in info['patterns']:
-            if re.search(pattern, text, re.IGNORECASE):
-                found.append(mtype)
-                break
-    return found
+    return _tag_labels(text, 'motivation')
 
 def analyze_barrier(text):
     """텍스트에서 장벽 유형 분석"""
-    if not isinstance(text, str):
-        return []
-    found = []
-    for btype, info in BARRIER_TYPES.items():
-        for pattern in info['patterns']:
-            if re.search(pattern, text, re.IGNORECASE):
-                found.append(btype)
-                break
-    return found
-
-# 회사별 동기/장벽 분석
-motivation_by_company = defaultdict(lambda: defaultdict(int))
-barrier_by_company = defaultdict(lambda: defaultdict(int))
-motivation_quotes = defaultdict(lambda: defaultdict(list))
-barrier_quotes = defaultdict(lambda: defaultdict(list))
-
-for idx, row in df.iterrows():
-    text = str(row.get('text', ''))
-    company = str(row.get('company', '')).upper()
-
-    motivations = analyze_motivation(text)
-    barriers = analyze_barrier(text)
-
-    for m in motivations:
-        motivation_by_company[company][m] += 1
-        if len(motivation_quotes[company][m]) < 3:
-            motivation_quotes[company][m].append(text[:300])
-
-    for b in barriers:
-        barrier_by_company[company][b] += 1
-        if len(barrier_quotes[company][b]) < 3:
-            barrier_quotes[company][b].append(text[:300])
-
-part3_results = {
-    'motivation_distribution': dict(motivation_by_company),
-    'barrier_distribution': dict(barrier_by_company),
-    'motivation_types': {k: v['description'] for k, v in MOTIVATION_TYPES.items()},
-    'barrier_types': {k: v['description'] for k, v in BARRIER_TYPES.items()}
+    return _tag_labels(text, 'barrier')
+
+# ============================================================
+# PART 2·3 공통: 여정/동기/장벽 태깅 (코퍼스 1회 순회)
+# ============================================================
+
+# 세 택소노미의 패턴을 패턴 단위로 한 번씩 컴파일 (named group 없음, 라벨 단위 short-circuit)
+TAXONOMIES = {
+    'journey': {k: v['keywords'] for k, v in JOURNEY_PATTERNS.items()},
+    'motivation': {k: v['patterns'] for k, v in MOTIVATION_TYPES.items()},
+    'barrier': {k: v['patterns'] for k, v in BARRIER_TYPES.items()},
 }
+TAGGER = build_tagger(TAXONOMIES)
+
+# 태그 캐시 버전 (택소노미 패턴이 바뀌면 그 택소노미 캐시만 무효화)
+TAXONOMY_VERSIONS = {taxonomy: taxonomy_version(patterns) for taxonomy, patterns in TAXONOMIES.items()}
+
+def _tag_labels(text, taxonomy):
+    """단일 텍스트에서 특정 택소노미 라벨 리스트 반환"""
+    columns = set(tag_text(TAGGER, text))
+    return [label for i, label in label_columns(TAGGER, taxonomy) if i in columns]
+
+# 택소노미별 예시 저장 길이
+EXAMPLE_MAX_LEN = {'journey': 200, 'motivation': 300, 'barrier': 300}
+EXAMPLES_PER_LABEL = 3
+
+
+def tag_shard(texts):
+    """샤드 하나 태깅 → {택소노미: 행별 라벨 리스트} (프로세스 간 전달용 일반 dict/list)"""
+    results = {taxonomy: [[] for _ in texts] for taxonomy in TAXONOMIES}
+
+    # (문서 × 라벨) 희소 태그 행렬, 태그가 있는 행만 순회
+    tag_matrix = tag_corpus(TAGGER, texts)
+    for idx in np.flatnonzero(np.diff(tag_matrix.indptr)):
+        for column in tag_matrix.indices[tag_matrix.indptr[idx]:tag_matrix.indptr[idx + 1]]:
+            taxonomy, label = TAGGER['labels'][column]
+            results[taxonomy][idx].append(label)
+    return results
+
+
+def aggregate_tags(texts, row_companies, row_labels):
+    """행별 라벨 → {택소노미: (회사별 라벨 카운트, 회사별 라벨 예시)}
+
+    행 순서대로 누적하므로 예시는 라벨당 앞에서부터 EXAMPLES_PER_LABEL 개
+    """
+    aggregated = {}
+    for taxonomy, labels_per_row in row_labels.items():
+        counts = defaultdict(lambda: defaultdict(int))
+        examples = defaultdict(lambda: defaultdict(list))
+        for text, company, labels in zip(texts, row_companies, labels_per_row):
+            for label in labels:
+                counts[company][label] += 1
+                label_examples = examples[company][label]
+                if len(label_examples) < EXAMPLES_PER_LABEL:
+                    label_examples.append(text[:EXAMPLE_MAX_LEN[taxonomy]])
+        aggregated[taxonomy] = (counts, examples)
+    return aggregated
+
+
+def make_shards(texts, row_companies, shard_by='company', workers=DEFAULT_WORKERS):
+    """태깅 샤드 분할 (항상 연속된 행 구간 → 순서대로 병합하면 단일 프로세스 결과와 동일)
+
+    company: 회사가 바뀌는 지점에서 분할 (코퍼스가 회사별로 이어 붙여져 있으므로 회사당 1개)
+    rows: 워커 수 × 4 개의 균등 행 구간 (회사별 데이터 크기가 크게 다를 때 부하 분산)
+    """
+    n = len(texts)
+    if shard_by == 'company':
+        bounds = [0] + [i for i in range(1, n) if row_companies[i] != row_companies[i - 1]] + [n]
+    else:
+        size = max(1, -(-n // (workers * 4)))
+        bounds = list(range(0, n, size)) + [n]
+    return [(texts[a:b], row_companies[a:b]) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def tag_rows(texts, row_companies, workers=DEFAULT_WORKERS, shard_by='company'):
+    """행별 라벨: 샤드별로 프로세스 풀에서 태깅 후 행 순서대로 이어 붙임"""
+    shards = make_shards(texts, row_companies, shard_by, workers)
+    shard_texts = [shard[0] for shard in shards]
+    if workers <= 1 or len(shards) <= 1:
+        shard_results = [tag_shard(t) for t in shard_texts]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shard_results = list(pool.map(tag_shard, shard_texts))
+
+    return {taxonomy: [labels for shard in shard_results for labels in shard[taxonomy]]
+            for taxonomy in TAXONOMIES}
+
+
+def cached_tag_rows(texts, row_companies, workers=DEFAULT_WORKERS, shard_by='company'):
+    """태그 캐시에 없는(새로 들어왔거나 바뀐) 본문만 태깅해 행별 라벨 구성"""
+    keys = [text_key(t) for t in texts]
+    cached = {taxonomy: tag_cache.lookup(taxonomy, TAXONOMY_VERSIONS[taxonomy], keys)
+              for taxonomy in TAXONOMIES}
+
+    # 한 택소노미라도 캐시에 없는 본문은 세 택소노미를 한 번에 태깅 (같은 본문은 한 번만)
+    first_rows = {}
+    for i, key in enumerate(keys):
+        if any(key not in cached[taxonomy] for taxonomy in TAXONOMIES):
+            first_rows.setdefault(key, i)
+    rows = list(first_rows.values())
+
+    if rows:
+        tagged = tag_rows([texts[i] for i in rows], [row_companies[i] for i in rows], workers, shard_by)
+        for taxonomy in TAXONOMIES:
+            new_items = {keys[i]: labels for i, labels in zip(rows, tagged[taxonomy])}
+            tag_cache.store(taxonomy, TAXONOMY_VERSIONS[taxonomy], new_items)
+            cached[taxonomy].update(new_items)
+
+    reused = sum(1 for key in keys if key not in first_rows)
+    print(f"태그 캐시: {reused:,}건 재사용, {len(rows):,}건 새로 태깅")
+    return {taxonomy: [cached[taxonomy][key] for key in keys] for taxonomy in TAXONOMIES}
+
+
+def run_tagging(df, workers=DEFAULT_WORKERS, shard_by='company', use_cache=True):
+    """PART 2·3 태깅 (use_cache=True 면 태그 캐시에 없는 본문만 태깅) → 회사별 집계"""
+    texts = [str(t) for t in df['text']] if 'text' in df.columns else [''] * len(df)
+    row_companies = [str(c).upper() for c in df['company']] if 'company' in df.columns else [''] * len(df)
+
+    if use_cache:
+        row_labels = cached_tag_rows(texts, row_companies, workers, shard_by)
+    else:
+        row_labels = tag_rows(texts, row_companies, workers, shard_by)
+    return aggregate_tags(texts, row_companies, row_labels)
+
+
+def run_part2(tagged):
+    """PART 2: 사용자 여정 분포"""
+    journey_by_company, _ = tagged['journey']
+    part2_results = {
+        'journey_distribution': dict(journey_by_company),
+        'methodology': {
+            'patterns_used': len(JOURNEY_PATTERNS),
+            'stages': list(JOURNEY_PATTERNS.keys())
+        }
+    }
+
+    print("\n=== PART 2: 사용자 여정 분석 ===")
+    for company in ['RINGLE', 'CAKE', 'YANADU', 'UPHONE']:
+        if company in journey_by_company:
+            print(f"\n{company}:")
+            for stage, count in sorted(journey_by_company[company].items(), key=lambda x: -x[1]):
+                print(f"  {stage}: {count}건")
+    return part2_results
+
+
+def run_part3(tagged):
+    """PART 3: 심리적 동기/장벽 분포"""
+    motivation_by_company, _ = tagged['motivation']
+    barrier_by_company, _ = tagged['barrier']
+    part3_results = {
+        'motivation_distribution': dict(motivation_by_company),
+        'barrier_distribution': dict(barrier_by_company),
+        'motivation_types': {k: v['description'] for k, v in MOTIVATION_TYPES.items()},
+        'barrier_types': {k: v['description'] for k, v in BARRIER_TYPES.items()}
+    }
 
-print("\n=== PART 3: 심리적 동기 분석 ===")
-for company in ['RINGLE', 'CAKE', 'YANADU', 'UPHONE']:
-    if company in motivation_by_company:
-        print(f"\n{company} 동기 분포:")
-        for mtype, count in sorted(motivation_by_company[company].items(), key=lambda x: -x[1]):
-            print(f"  {MOTIVATION_TYPES[mtype]['description']}: {count}건")
+    print("\n=== PART 3: 심리적 동기 분석 ===")
+    for company in ['RINGLE', 'CAKE', 'YANADU', 'UPHONE']:
+        if company in motivation_by_company:
+            print(f"\n{company} 동기 분포:")
+            for mtype, count in sorted(motivation_by_company[company].items(), key=lambda x: -x[1]):
+                print(f"  {MOTIVATION_TYPES[mtype]['description']}: {count}건")
+    return part3_results
 
 # ============================================================
 # PART 4: 통계적 검증 및 방법론
 # ============================================================
 
-print("\n=== PART 4: 통계적 검증 ===")
-
-# 4.1 회사별 평점 차이 통계 검정 (ANOVA)
-company_ratings = {}
-for company in companies:
-    company_df = df[df['company'].str.lower() == company]
-    if 'rating' in company_df.columns:
-        ratings = company_df['rating'].dropna()
-        if len(ratings) > 0:
-            company_ratings[company.upper()] = ratings.values
-
-# ANOVA 검정
-if len(company_ratings) >= 2:
-    rating_groups = list(company_ratings.values())
-    f_stat, p_value = stats.f_oneway(*rating_groups)
-    print(f"\n1. 회사간 평점 차이 (One-way ANOVA)")
-    print(f"   F-statistic: {f_stat:.4f}")
-    print(f"   p-value: {p_value:.6f}")
-    print(f"   결론: {'통계적으로 유의미한 차이 존재 (p<0.05)' if p_value < 0.05 else '유의미한 차이 없음'}")
-
-# 4.2 서비스 유형별 평점 차이 (t-test)
-ai_ratings = []
-human_ratings = []
-
-for company, ratings in company_ratings.items():
-    if company.lower() in SERVICE_TYPES['AI_BASED']:
-        ai_ratings.extend(ratings)
-    elif company.lower() in SERVICE_TYPES['HUMAN_TUTOR']:
-        human_ratings.extend(ratings)
-
-if len(ai_ratings) > 0 and len(human_ratings) > 0:
-    t_stat, p_value = stats.ttest_ind(ai_ratings, human_ratings)
-    print(f"\n2. AI vs 휴먼튜터 평점 비교 (Independent t-test)")
-    print(f"   AI 기반 평균: {np.mean(ai_ratings):.2f} (n={len(ai_ratings)})")
-    print(f"   휴먼 튜터 평균: {np.mean(human_ratings):.2f} (n={len(human_ratings)})")
-    print(f"   t-statistic: {t_stat:.4f}")
-    print(f"   p-value: {p_value:.6f}")
-    print(f"   Cohen's d (효과크기): {abs(np.mean(ai_ratings) - np.mean(human_ratings)) / np.sqrt((np.std(ai_ratings)**2 + np.std(human_ratings)**2)/2):.3f}")
-
-# 4.3 긍정/부정 비율 카이제곱 검정
-print(f"\n3. 긍정률 차이 검정 (Chi-square test)")
-contingency_data = []
-for company, ratings in company_ratings.items():
-    positive = sum(1 for r in ratings if r >= 4)
-    negative = sum(1 for r in ratings if r <= 2)
-    contingency_data.append([positive, negative])
-
-if len(contingency_data) >= 2:
-    chi2, p_value, dof, expected = stats.chi2_contingency(contingency_data)
-    print(f"   Chi-square: {chi2:.4f}")
-    print(f"   p-value: {p_value:.6f}")
-    print(f"   자유도: {dof}")
-
-# 4.4 신뢰구간 계산
-print(f"\n4. 회사별 평점 95% 신뢰구간")
-for company, ratings in sorted(company_ratings.items()):
-    mean = np.mean(ratings)
-    sem = stats.sem(ratings)
-    ci = stats.t.interval(0.95, len(ratings)-1, loc=mean, scale=sem)
-    print(f"   {company}: {mean:.2f} [{ci[0]:.2f}, {ci[1]:.2f}]")
+def run_part4(df):
+    """PART 4: 평점 통계 검정 → 회사별 평점 요약 테이블 (rating_stats.group_stats)"""
+    print("\n=== PART 4: 통계적 검증 ===")
+
+    # 4.1 회사별 평점 차이 통계 검정 (ANOVA) - 한 번의 groupby 집계값으로 검정
+    company_stats = group_stats(df, 'company')
+    company_stats = company_stats.reindex([c for c in companies if c in company_stats.index])
+
+    f_stat, p_value = anova(company_stats)
+    if not np.isnan(f_stat):
+        print(f"\n1. 회사간 평점 차이 (One-way ANOVA)")
+        print(f"   F-statistic: {f_stat:.4f}")
+        print(f"   p-value: {p_value:.6f}")
+        print(f"   결론: {'통계적으로 유의미한 차이 존재 (p<0.05)' if p_value < 0.05 else '유의미한 차이 없음'}")
+
+    # 4.2 서비스 유형별 평점 차이 (t-test)
+    ai = pooled(company_stats, SERVICE_TYPES['AI_BASED'])
+    human = pooled(company_stats, SERVICE_TYPES['HUMAN_TUTOR'])
+
+    if ai[0] > 0 and human[0] > 0:
+        t_stat, p_value, cohens_d = ttest(ai, human)
+        print(f"\n2. AI vs 휴먼튜터 평점 비교 (Independent t-test)")
+        print(f"   AI 기반 평균: {ai[1]:.2f} (n={ai[0]})")
+        print(f"   휴먼 튜터 평균: {human[1]:.2f} (n={human[0]})")
+        print(f"   t-statistic: {t_stat:.4f}")
+        print(f"   p-value: {p_value:.6f}")
+        print(f"   Cohen's d (효과크기): {cohens_d:.3f}")
+
+    # 4.3 긍정/부정 비율 카이제곱 검정
+    print(f"\n3. 긍정률 차이 검정 (Chi-square test)")
+    chi_result = chi_square(company_stats)
+    if chi_result is not None:
+        chi2, p_value, dof = chi_result
+        print(f"   Chi-square: {chi2:.4f}")
+        print(f"   p-value: {p_value:.6f}")
+        print(f"   자유도: {dof}")
+
+    # 4.4 신뢰구간 계산
+    company_stats.index = company_stats.index.str.upper()
+    print(f"\n4. 회사별 평점 95% 신뢰구간")
+    for company, row in company_stats.sort_index().iterrows():
+        print(f"   {company}: {row['mean']:.2f} [{row['ci_low']:.2f}, {row['ci_high']:.2f}]")
+
+    return company_stats
+
+def run_resampling(df, n_resamples=RESAMPLES, seed=SEED):
+    """PART 4 보완: 부트스트랩 신뢰구간 + AI vs 휴먼튜터 순열 검정 (평점 분포 가정 없음)"""
+    print(f"\n5. 리샘플링 검정 (리샘플 {n_resamples:,}회, seed={seed})")
+
+    counts = rating_counts(df, 'company')
+    counts = counts.reindex([c for c in companies if c in counts.index])
+    boot = bootstrap(counts, n_resamples, seed=seed)
+    boot.index = boot.index.str.upper()
+
+    print(f"   [부트스트랩 95% 신뢰구간]")
+    for company, row in boot.sort_index().iterrows():
+        print(f"   {company}: 평균 {row['mean']:.2f} [{row['mean_low']:.2f}, {row['mean_high']:.2f}], "
+              f"부정 비율 {row['negative_ratio']:.1%} [{row['negative_low']:.1%}, {row['negative_high']:.1%}]")
+
+    results = {
+        'n_resamples': n_resamples,
+        'seed': seed,
+        'bootstrap': {company: {k: round(float(v), 4) for k, v in row.items()}
+                      for company, row in boot.iterrows()},
+    }
+
+    type_counts = rating_counts(df, invert_groups(SERVICE_TYPES))
+    if 'AI_BASED' in type_counts.index and 'HUMAN_TUTOR' in type_counts.index:
+        perm = permutation_test(type_counts.loc['AI_BASED'], type_counts.loc['HUMAN_TUTOR'],
+                                n_resamples, seed=seed)
+        print(f"   [AI vs 휴먼튜터 순열 검정]")
+        print(f"   평균 평점 차이: {perm['mean_diff']:+.3f} (p={perm['mean_p']:.4f})")
+        print(f"   부정 비율 차이: {perm['negative_diff']:+.1%} (p={perm['negative_p']:.4f})")
+        results['permutation_ai_vs_human'] = perm
+
+    return results
 
 # ============================================================
 # 최종 결과 저장
 # ============================================================
 
-final_report = {
-    'part1_service_types': part1_results,
-    'part2_user_journey': part2_results,
-    'part3_psychology': part3_results,
-    'part4_statistics': {
-        'methodology': {
-            'anova': 'One-way ANOVA for comparing means across companies',
-            'ttest': 'Independent t-test for AI vs Human tutor comparison',
-            'chi_square': 'Chi-square test for proportion comparison',
-            'confidence_interval': '95% CI using t-distribution'
+def save_report(part1_results, part2_results, part3_results, company_stats, tagged, resampling=None):
+    """최종 결과 JSON 저장"""
+    final_report = {
+        'part1_service_types': part1_results,
+        'part2_user_journey': part2_results,
+        'part3_psychology': part3_results,
+        'part4_statistics': {
+            'methodology': {
+                'anova': 'One-way ANOVA for comparing means across companies',
+                'ttest': 'Independent t-test for AI vs Human tutor comparison',
+                'chi_square': 'Chi-square test for proportion comparison',
+                'confidence_interval': '95% CI using t-distribution'
+            },
+            'sample_sizes': {company: int(n) for company, n in company_stats['n'].items()}
         },
-        'sample_sizes': {company: len(ratings) for company, ratings in company_ratings.items()}
-    },
-    'motivation_quotes': dict(motivation_quotes),
-    'barrier_quotes': dict(barrier_quotes),
-    'journey_examples': dict(journey_examples)
-}
-
-# JSON 저장
-with open(f"{base_path}/phase/DEEP_ANALYSIS_RESULTS.json", 'w', encoding='utf-8') as f:
-    json.dump(final_report, f, ensure_ascii=False, indent=2, default=str)
+        'motivation_quotes': dict(tagged['motivation'][1]),
+        'barrier_quotes': dict(tagged['barrier'][1]),
+        'journey_examples': dict(tagged['journey'][1])
+    }
 
-print(f"\n\n=== 분석 완료 ===")
-print(f"결과 저장: {base_path}/phase/DEEP_ANALYSIS_RESULTS.json")
+    if resampling is not None:
+        final_report['part4_statistics']['methodology'].update({
+            'bootstrap': 'Percentile bootstrap CI (multinomial resampling of rating counts)',
+            'permutation': 'Two-sided permutation test for AI vs Human tutor (mean rating, negative ratio)'
+        })
+        final_report['part4_statistics']['resampling'] = resampling
+
+    # JSON 저장
+    with open(f"{base_path}/phase/DEEP_ANALYSIS_RESULTS.json", 'w', encoding='utf-8') as f:
+        json.dump(final_report, f, ensure_ascii=False, indent=2, default=str)
+
+    print(f"\n\n=== 분석 완료 ===")
+    print(f"결과 저장: {base_path}/phase/DEEP_ANALYSIS_RESULTS.json")
+
+
+def main(workers=DEFAULT_WORKERS, shard_by='company', n_resamples=RESAMPLES, seed=SEED, use_cache=True):
+    """전체 분석 실행
+
+    PART 2·3 태깅은 태그 캐시에 없는 본문만 workers 개 프로세스로 병렬 실행 (use_cache=False 면 전체),
+    n_resamples=0 이면 리샘플링 검정 생략
+    """
+    df = load_data()
+    part1_results = run_part1(df)
+    tagged = run_tagging(df, workers, shard_by, use_cache)
+    part2_results = run_part2(tagged)
+    part3_results = run_part3(tagged)
+    company_stats = run_part4(df)
+    resampling = run_resampling(df, n_resamples, seed) if n_resamples > 0 else None
+    save_report(part1_results, part2_results, part3_results, company_stats, tagged, resampling)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='영어 학습 서비스 심층 분석')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'태깅 프로세스 수 (기본: CPU 코어 수 {DEFAULT_WORKERS}, 1 이면 단일 프로세스)')
+    parser.add_argument('--shard', choices=SHARD_MODES, default='company',
+                        help='태깅 샤드 분할 기준 (company: 회사별, rows: 균등 행 구간)')
+    parser.add_argument('--resamples', type=int, default=RESAMPLES,
+                        help=f'부트스트랩/순열 검정 리샘플 수 (기본: {RESAMPLES}, 0 이면 생략)')
+    parser.add_argument('--seed', type=int, default=SEED, help='리샘플링 난수 시드')
+    parser.add_argument('--no-tag-cache', action='store_true', help='태그 캐시 없이 모든 리뷰를 다시 태깅')
+    args = parser.parse_args()
+    main(workers=args.workers, shard_by=args.shard, n_resamples=args.resamples, seed=args.seed,
+         use_cache=not args.no_tag_cache)
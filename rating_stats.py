@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+그룹별 평점 통계 엔진
+- groupby 한 번으로 그룹별 n / 평균 / 표준편차 / SEM / 신뢰구간 / 긍정·부정 건수 계산
+- ANOVA, t-test, 카이제곱 검정을 원본 배열 대신 위 집계값으로 수행 (그룹마다 프레임을 다시 필터링하지 않음)
+- 그룹 키는 컬럼명(company, source_platform, ...) 또는 회사 → 그룹 매핑(서비스 유형, 가격대 등)
+- 리샘플링 검정: 평점값 빈도표에서 부트스트랩(다항분포) / 순열(다변량 초기하분포) 표본을
+  (리샘플 수 × 그룹 × 평점값) 행렬로 한 번에 뽑아 신뢰구간과 p-value 계산
+
+사용법:
+    from rating_stats import group_stats, anova, chi_square
+    table = group_stats(df, 'company')
+    f_stat, p_value = anova(table)
+
+    python rating_stats.py --by source_platform
+    python rating_stats.py --by company --resamples 10000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+POSITIVE_MIN = 4      # 긍정 리뷰 기준 (rating >= 4)
+NEGATIVE_MAX = 2      # 부정 리뷰 기준 (rating <= 2)
+CONFIDENCE = 0.95
+RESAMPLES = 10000     # 부트스트랩/순열 리샘플 수
+SEED = 42
+
+
+def invert_groups(groups):
+    """{그룹명: [회사, ...]} → {회사: 그룹명} (SERVICE_TYPES / PRICE_TIER 같은 분류표용)"""
+    return {member: name for name, members in groups.items() for member in members}
+
+
+def group_keys(df, by, key_column='company'):
+    """그룹 키 Series 생성
+
+    Args:
+        by: 컬럼명이면 그 컬럼(소문자화), dict 면 key_column 값(소문자화)을 {값: 그룹} 으로 매핑,
+            Series/배열이면 그대로 사용
+    """
+    if isinstance(by, str):
+        return df[by].astype(str).str.lower().where(df[by].notna())
+    if isinstance(by, dict):
+        return df[key_column].astype(str).str.lower().map(by)
+    return pd.Series(np.asarray(by), index=df.index)
+
+
+def group_stats(df, by, value='rating', key_column='company', confidence=CONFIDENCE):
+    """그룹별 평점 요약 테이블 (한 번의 grouped 집계)
+
+    Returns:
+        그룹을 인덱스로 하는 DataFrame
+        컬럼: n, mean, std, var(표본분산), sem, ci_low, ci_high, positive, negative
+        평점이 하나도 없는 그룹은 제외
+    """
+    values = pd.to_numeric(df[value], errors='coerce').astype('float64')
+    frame = pd.DataFrame({
+        'key': group_keys(df, by, key_column),
+        'value': values,
+        'positive': values >= POSITIVE_MIN,
+        'negative': values <= NEGATIVE_MAX,
+    })
+    table = frame.groupby('key', sort=False, dropna=True).agg(
+        n=('value', 'count'),
+        mean=('value', 'mean'),
+        var=('value', 'var'),
+        positive=('positive', 'sum'),
+        negative=('negative', 'sum'),
+    )
+    table = table[table['n'] > 0]
+    table.index.name = None
+
+    table['std'] = np.sqrt(table['var'])
+    table['sem'] = table['std'] / np.sqrt(table['n'])
+    half_width = stats.t.ppf((1 + confidence) / 2, table['n'] - 1) * table['sem']
+    table['ci_low'] = table['mean'] - half_width
+    table['ci_high'] = table['mean'] + half_width
+    return table[['n', 'mean', 'std', 'var', 'sem', 'ci_low', 'ci_high', 'positive', 'negative']]
+
+
+def anova(table):
+    """그룹 요약값으로 one-way ANOVA → (F, p), 그룹이 2개 미만이면 (nan, nan)"""
+    if len(table) < 2:
+        return np.nan, np.nan
+    n = table['n'].to_numpy(dtype='float64')
+    mean = table['mean'].to_numpy()
+    var = table['var'].fillna(0).to_numpy()
+
+    grand_mean = (n * mean).sum() / n.sum()
+    ss_between = (n * (mean - grand_mean) ** 2).sum()
+    ss_within = ((n - 1) * var).sum()
+    df_between = len(n) - 1
+    df_within = n.sum() - len(n)
+
+    f_stat = (ss_between / df_between) / (ss_within / df_within)
+    return f_stat, stats.f.sf(f_stat, df_between, df_within)
+
+
+def pooled(table, groups):
+    """여러 그룹을 하나로 합친 요약값 → (n, mean, var) (AI 기반 회사 전체 등)"""
+    rows = table.loc[[g for g in groups if g in table.index]]
+    n = rows['n'].sum()
+    if n == 0:
+        return 0, np.nan, np.nan
+    mean = (rows['n'] * rows['mean']).sum() / n
+    # 그룹 내 제곱합 + 그룹 간 제곱합
+    ss = ((rows['n'] - 1) * rows['var'].fillna(0)).sum() + (rows['n'] * (rows['mean'] - mean) ** 2).sum()
+    return int(n), mean, ss / (n - 1) if n > 1 else np.nan
+
+
+def ttest(a, b):
+    """두 요약값 (n, mean, var) 의 독립표본 t-test (등분산) → (t, p, Cohen's d)
+
+    Cohen's d 는 기존 리포트와 같이 두 그룹 모표준편차(ddof=0)의 제곱평균으로 계산
+    """
+    n_a, mean_a, var_a = a
+    n_b, mean_b, var_b = b
+    t_stat, p_value = stats.ttest_ind_from_stats(mean_a, np.sqrt(var_a), n_a,
+                                                 mean_b, np.sqrt(var_b), n_b)
+    pop_var_a = var_a * (n_a - 1) / n_a
+    pop_var_b = var_b * (n_b - 1) / n_b
+    cohens_d = abs(mean_a - mean_b) / np.sqrt((pop_var_a + pop_var_b) / 2)
+    return t_stat, p_value, cohens_d
+
+
+def chi_square(table):
+    """그룹 × (긍정, 부정) 분할표 카이제곱 검정 → (chi2, p, 자유도), 그룹이 2개 미만이면 None"""
+    if len(table) < 2:
+        return None
+    chi2, p_value, dof, _ = stats.chi2_contingency(table[['positive', 'negative']].to_numpy())
+    return chi2, p_value, dof
+
+
+def rating_counts(df, by, value='rating', key_column='company'):
+    """그룹 × 평점값 빈도표 (행: 그룹, 열: 평점값 오름차순, 평점 없는 행은 제외)"""
+    frame = pd.DataFrame({
+        'key': group_keys(df, by, key_column),
+        'value': pd.to_numeric(df[value], errors='coerce').astype('float64'),
+    }).dropna()
+    counts = frame.groupby(['key', 'value'], sort=False).size().unstack(fill_value=0)
+    counts.index.name = None
+    counts.columns.name = None
+    return counts.sort_index(axis=1)
+
+
+def _interval(samples, confidence):
+    """리샘플 분포의 백분위 구간 (첫 번째 축 = 리샘플)"""
+    alpha = (1 - confidence) / 2
+    return np.quantile(samples, [alpha, 1 - alpha], axis=0)
+
+
+def bootstrap(counts, n_resamples=RESAMPLES, confidence=CONFIDENCE, seed=SEED):
+    """그룹별 평균 평점 / 부정 비율의 부트스트랩 백분위 신뢰구간
+
+    평점이 이산값이므로 행을 복원추출하는 대신 그룹별 빈도를 다항분포로 한 번에 리샘플
+    (n_resamples × 그룹 × 평점값 행렬, Python 반복 없음)
+
+    Returns:
+        그룹 인덱스 DataFrame (mean, mean_low, mean_high, negative_ratio, negative_low, negative_high)
+    """
+    rng = np.random.default_rng(seed)
+    levels = counts.columns.to_numpy(dtype='float64')
+    negative = levels <= NEGATIVE_MAX
+    freq = counts.to_numpy(dtype=np.int64)
+    n = freq.sum(axis=1)
+
+    draws = rng.multinomial(n, freq / n[:, None], size=(n_resamples, len(n)))
+    means = draws @ levels / n
+    negative_ratios = draws[:, :, negative].sum(axis=2) / n
+
+    mean_low, mean_high = _interval(means, confidence)
+    negative_low, negative_high = _interval(negative_ratios, confidence)
+    return pd.DataFrame({
+        'mean': freq @ levels / n,
+        'mean_low': mean_low,
+        'mean_high': mean_high,
+        'negative_ratio': freq[:, negative].sum(axis=1) / n,
+        'negative_low': negative_low,
+        'negative_high': negative_high,
+    }, index=counts.index)
+
+
+def permutation_test(counts_a, counts_b, n_resamples=RESAMPLES, seed=SEED):
+    """두 그룹의 평균 평점 차이 / 부정 비율 차이 순열 검정 (양측)
+
+    라벨을 섞어 a 크기만큼 뽑는 것은 합친 빈도에서의 다변량 초기하분포 추출과 같으므로
+    행 단위 셔플 없이 (n_resamples × 평점값) 빈도 행렬로 한 번에 계산
+
+    Args:
+        counts_a, counts_b: 같은 평점값 열을 가진 빈도 Series (rating_counts 의 행)
+
+    Returns:
+        {'mean_diff', 'mean_p', 'negative_diff', 'negative_p', 'n_resamples'}
+    """
+    rng = np.random.default_rng(seed)
+    levels = counts_a.index.to_numpy(dtype='float64')
+    negative = levels <= NEGATIVE_MAX
+    freq_a = counts_a.to_numpy(dtype=np.int64)
+    freq_b = counts_b.reindex(counts_a.index, fill_value=0).to_numpy(dtype=np.int64)
+    n_a, n_b = freq_a.sum(), freq_b.sum()
+    pooled_freq = freq_a + freq_b
+
+    draws_a = rng.multivariate_hypergeometric(pooled_freq, n_a, size=n_resamples)
+    draws_b = pooled_freq - draws_a
+
+    def statistics(a, b):
+        mean_diff = a @ levels / n_a - b @ levels / n_b
+        negative_diff = a[..., negative].sum(axis=-1) / n_a - b[..., negative].sum(axis=-1) / n_b
+        return mean_diff, negative_diff
+
+    observed_mean, observed_negative = statistics(freq_a, freq_b)
+    perm_mean, perm_negative = statistics(draws_a, draws_b)
+
+    def p_value(perm, observed):
+        # 부동소수 오차로 관측값과 같은 순열이 빠지지 않도록 약간의 여유
+        extreme = np.count_nonzero(np.abs(perm) >= abs(observed) - 1e-12)
+        return float((extreme + 1) / (n_resamples + 1))
+
+    return {
+        'mean_diff': float(observed_mean),
+        'mean_p': p_value(perm_mean, observed_mean),
+        'negative_diff': float(observed_negative),
+        'negative_p': p_value(perm_negative, observed_negative),
+        'n_resamples': n_resamples,
+    }
+
+
+def print_report(table, title, boot=None):
+    """그룹 요약 + ANOVA/카이제곱 결과 출력 (boot: bootstrap() 결과가 있으면 함께 출력)"""
+    print(f"\n=== {title} ===")
+    for name, row in table.iterrows():
+        print(f"   {name}: {row['mean']:.2f} [{row['ci_low']:.2f}, {row['ci_high']:.2f}] "
+              f"(n={int(row['n'])}, 긍정 {int(row['positive'])} / 부정 {int(row['negative'])})")
+        if boot is not None:
+            b = boot.loc[name]
+            print(f"      부트스트랩: 평균 [{b['mean_low']:.2f}, {b['mean_high']:.2f}], "
+                  f"부정 비율 {b['negative_ratio']:.1%} [{b['negative_low']:.1%}, {b['negative_high']:.1%}]")
+
+    f_stat, p_value = anova(table)
+    if not np.isnan(f_stat):
+        print(f"   ANOVA: F={f_stat:.4f}, p={p_value:.6f}")
+    result = chi_square(table)
+    if result is not None:
+        print(f"   Chi-square: {result[0]:.4f}, p={result[1]:.6f}, 자유도 {result[2]}")
+
+
+def main():
+    from corpus_loader import load_corpus
+
+    parser = argparse.ArgumentParser(description='그룹별 평점 통계')
+    parser.add_argument('--by', nargs='+', default=['company'],
+                        help='그룹 기준 컬럼 (예: company source_platform source_type)')
+    parser.add_argument('--resamples', type=int, default=0,
+                        help='부트스트랩 리샘플 수 (0 이면 생략)')
+    parser.add_argument('--seed', type=int, default=SEED)
+    args = parser.parse_args()
+
+    df = load_corpus()
+    for column in args.by:
+        boot = None
+        if args.resamples > 0:
+            boot = bootstrap(rating_counts(df, column), args.resamples, seed=args.seed)
+        print_report(group_stats(df, column).sort_index(), f"{column}별 평점", boot)
+
+
+if __name__ == '__main__':
+    main()
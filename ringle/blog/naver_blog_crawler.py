@@ -6,15 +6,24 @@
 - 본문 내용 추출
 """
 
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import time
 import re
 from datetime import datetime
 from urllib.parse import quote, urljoin
+import argparse
+import queue
+import threading
 import json
 import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import crawler_http
+from content_index import drop_known, register_frame
+from crawl_state import (load_checkpoint, save_checkpoint, load_ingested_urls, append_rows,
+                         reset_journal, append_journal, read_journal, recover_journal)
 
 # 설정
 HEADERS = {
@@ -75,6 +84,43 @@ KEYWORDS = {
     ],
 }
 
+# 파이프라인 모드 기본값
+PIPELINE_WORKERS = 4        # 본문 수집 워커 수
+PIPELINE_RATE = 4.0         # 전체 요청 속도 제한 (요청/초)
+PIPELINE_QUEUE_SIZE = 100   # 검색 → 본문 수집 대기열 크기
+
+# 본문 해시 인덱스(content_index)에 기록할 소스명
+CONTENT_SOURCE = 'naver_blog'
+
+
+class TokenBucket:
+    """전역 토큰 버킷 요청 속도 제한 (스레드 안전)"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개를 얻을 때까지 대기"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# 증분 모드: CSV 저장이 끝난 뒤 기록할 키워드별 체크포인트
+pending_checkpoints = {}
+
+
 def get_all_keywords():
     """모든 키워드 리스트 반환"""
     all_kw = []
@@ -82,8 +128,8 @@ def get_all_keywords():
         all_kw.extend(keywords)
     return all_kw
 
-def search_naver_blog(keyword, start=1, display=30):
-    """네이버 블로그 검색 결과 가져오기"""
+def search_naver_blog(keyword, start=1, display=30, rate_limiter=None, sort_by_date=False):
+    """네이버 블로그 검색 결과 가져오기 (sort_by_date=True 면 최신순)"""
 
     # 네이버 통합검색 블로그 탭 URL
     url = f"https://search.naver.com/search.naver"
@@ -93,9 +139,14 @@ def search_naver_blog(keyword, start=1, display=30):
         'start': start,
         'display': display,
     }
+    if sort_by_date:
+        params['sm'] = 'tab_opt'
+        params['nso'] = 'so:dd,p:all'
 
     try:
-        response = requests.get(url, params=params, headers=HEADERS, timeout=15)
+        if rate_limiter:
+            rate_limiter.acquire()
+        response = crawler_http.get(url, params=params, headers=HEADERS, timeout=15)
         response.raise_for_status()
         return response.text
     except Exception as e:
@@ -168,13 +219,15 @@ def parse_search_results(html):
 
     return results
 
-def get_blog_content(url):
+def get_blog_content(url, rate_limiter=None):
     """개별 블로그 포스트 본문 추출"""
     try:
         # 모바일 URL로 변환 (더 쉬운 파싱)
         if 'blog.naver.com' in url:
             # iframe 내부 URL 추출
-            response = requests.get(url, headers=HEADERS, timeout=10)
+            if rate_limiter:
+                rate_limiter.acquire()
+            response = crawler_http.get(url, headers=HEADERS, timeout=10, cache=True)
             soup = BeautifulSoup(response.text, 'html.parser')
 
             # iframe src 찾기
@@ -187,7 +240,9 @@ def get_blog_content(url):
                     else:
                         iframe_url = iframe_src
 
-                    response = requests.get(iframe_url, headers=HEADERS, timeout=10)
+                    if rate_limiter:
+                        rate_limiter.acquire()
+                    response = crawler_http.get(iframe_url, headers=HEADERS, timeout=10, cache=True)
                     soup = BeautifulSoup(response.text, 'html.parser')
 
             # 본문 추출
@@ -223,8 +278,14 @@ def get_blog_content(url):
     except Exception as e:
         return ''
 
-def crawl_keyword(keyword, max_pages=10):
-    """특정 키워드로 네이버 블로그 크롤링"""
+def crawl_keyword(keyword, max_pages=10, rate_limiter=None, on_result=None,
+                  stop_urls=None, sort_by_date=False):
+    """특정 키워드로 네이버 블로그 크롤링
+
+    rate_limiter 가 있으면 고정 sleep 대신 토큰 버킷으로 간격 조절,
+    on_result 가 있으면 신규 결과를 찾는 즉시 콜백으로 전달,
+    stop_urls 가 있으면(증분 모드) 이미 적재한 URL 에 닿은 페이지에서 페이징 중단
+    """
     all_results = []
     seen_urls = set()
 
@@ -233,7 +294,8 @@ def crawl_keyword(keyword, max_pages=10):
     for page in range(1, max_pages + 1):
         start = (page - 1) * 30 + 1
 
-        html = search_naver_blog(keyword, start=start)
+        html = search_naver_blog(keyword, start=start, rate_limiter=rate_limiter,
+                                 sort_by_date=sort_by_date)
         if not html:
             break
 
@@ -244,24 +306,56 @@ def crawl_keyword(keyword, max_pages=10):
             break
 
         new_count = 0
+        reached = False
         for r in results:
+            if stop_urls is not None and r['url'] in stop_urls:
+                reached = True
+                continue
             if r['url'] and r['url'] not in seen_urls:
                 seen_urls.add(r['url'])
                 r['search_keyword'] = keyword
                 all_results.append(r)
                 new_count += 1
+                if on_result:
+                    on_result(r)
 
         print(f"      페이지 {page}: {new_count}개 신규 (누적: {len(all_results)}개)")
 
+        if reached:
+            print(f"      이미 수집한 포스트 도달, 종료")
+            break
+
         if new_count == 0:
             break
 
-        time.sleep(1)  # 요청 간격
+        if not rate_limiter:
+            time.sleep(1)  # 요청 간격
+
+    # 증분 모드: 이번에 본 최신 포스트를 다음 실행의 high-water mark 로
+    if stop_urls is not None and all_results:
+        pending_checkpoints[f'naver_blog:{keyword}'] = {'last_url': all_results[0]['url']}
 
     return all_results
 
-def enrich_with_content(results, sample_size=None):
-    """검색 결과에 본문 내용 추가"""
+
+def incremental_options(keyword, ingested_urls):
+    """증분 모드용 crawl_keyword 옵션 (최신순 검색 + 적재 URL/체크포인트에서 중단)"""
+    stop_urls = set(ingested_urls)
+    checkpoint = load_checkpoint(f'naver_blog:{keyword}')
+    if checkpoint.get('last_url'):
+        stop_urls.add(checkpoint['last_url'])
+    return {'stop_urls': stop_urls, 'sort_by_date': True}
+
+def store_content(r, content, journal_path=None):
+    """본문 저장: 저널이 있으면 즉시 기록하고 메모리에는 보관하지 않음"""
+    if journal_path:
+        append_journal(journal_path, {**r, 'content': content})
+    else:
+        r['content'] = content
+
+
+def enrich_with_content(results, sample_size=None, journal_path=None, skip_urls=frozenset()):
+    """검색 결과에 본문 내용 추가 (skip_urls: 저널에 이미 기록된 URL)"""
     print(f"\n📄 본문 수집 중... (총 {len(results)}개)")
 
     if sample_size:
@@ -271,13 +365,96 @@ def enrich_with_content(results, sample_size=None):
         if (i + 1) % 10 == 0:
             print(f"   진행: {i+1}/{len(results)}")
 
+        if r['url'] in skip_urls:
+            continue
+
         content = get_blog_content(r['url'])
-        r['content'] = content
+        store_content(r, content, journal_path)
         time.sleep(0.5)
 
     return results
 
-def main():
+
+def load_journaled_results(results, journal_path):
+    """저널에 기록된 본문 수집 결과를 검색 순서대로 정렬해 반환"""
+    order = {r['url']: i for i, r in enumerate(results)}
+    items = read_journal(journal_path)
+    return sorted(items, key=lambda item: order.get(item['url'], len(order)))
+
+def crawl_pipeline(keywords, max_pages=5, workers=PIPELINE_WORKERS, rate=PIPELINE_RATE,
+                   keyword_options=None, journal_path=None, skip_urls=frozenset()):
+    """검색 페이징과 본문 수집을 겹쳐서 실행하는 생산자/소비자 파이프라인
+
+    - 생산자: 키워드별 검색 페이지를 넘기며 신규 URL 을 대기열에 적재
+    - 소비자: 워커 풀이 대기열에서 URL 을 꺼내 본문 수집
+    - 모든 요청(검색 + 본문)은 하나의 토큰 버킷을 공유
+    - keyword_options: 키워드 → crawl_keyword 추가 옵션 (증분 모드)
+    - journal_path/skip_urls: 본문을 저널에 즉시 기록, 이미 기록된 URL 은 건너뜀 (재개)
+    """
+    rate_limiter = TokenBucket(rate)
+    url_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    all_results = []
+    seen_urls = set()
+    progress = {'done': 0}
+    progress_lock = threading.Lock()
+    failures = []
+
+    def enqueue(r):
+        # 키워드 간 중복 제거 후 대기열에 추가 (가득 차면 생산자가 대기)
+        if r['url'] in seen_urls:
+            return
+        seen_urls.add(r['url'])
+        all_results.append(r)
+        if r['url'] not in skip_urls:
+            url_queue.put(r)
+
+    def fetch_worker():
+        # URL 하나가 실패해도 워커는 계속 돌아야 대기열이 막히지 않음
+        while True:
+            r = url_queue.get()
+            if r is None:
+                break
+            try:
+                content = get_blog_content(r['url'], rate_limiter=rate_limiter)
+                store_content(r, content, journal_path)
+            except Exception as e:
+                print(f"   ⚠️ 본문 수집 실패: {r['url']} ({e})")
+                with progress_lock:
+                    failures.append((r['url'], e))
+                continue
+            with progress_lock:
+                progress['done'] += 1
+                if progress['done'] % 10 == 0:
+                    print(f"   본문 진행: {progress['done']}/{len(all_results)}")
+
+    fetchers = [threading.Thread(target=fetch_worker, daemon=True) for _ in range(workers)]
+    for t in fetchers:
+        t.start()
+
+    try:
+        for i, keyword in enumerate(keywords):
+            print(f"\n[{i+1}/{len(keywords)}] 검색 중...")
+            options = keyword_options(keyword) if keyword_options else {}
+            results = crawl_keyword(keyword, max_pages=max_pages,
+                                    rate_limiter=rate_limiter, on_result=enqueue, **options)
+            print(f"   ✅ 완료: {len(results)}개 수집 (전체 누적: {len(all_results)}개)")
+    finally:
+        # 생산자가 중간에 실패해도 종료 신호를 보내고 남은 본문 수집 대기
+        for _ in fetchers:
+            url_queue.put(None)
+        for t in fetchers:
+            t.join()
+
+    if failures:
+        print(f"\n⚠️ 본문 수집 실패 {len(failures)}건 (저널 미기록, 결과에서 제외):")
+        for url, e in failures[:10]:
+            print(f"   - {url}: {e}")
+
+    return all_results
+
+
+def main(pipeline=False, workers=PIPELINE_WORKERS, rate=PIPELINE_RATE, incremental=False,
+         resume=False):
     """메인 실행"""
     print("=" * 60)
     print("🔍 링글 네이버 블로그 전수조사 크롤러")
@@ -286,30 +463,63 @@ def main():
     start_time = time.time()
     all_results = []
     seen_urls = set()
+    output_path = 'naver/ringle_naver_blog.csv'
+    journal_path = 'naver/ringle_naver_blog.journal.jsonl'
+
+    # 저널: 본문은 수집 즉시 기록, --resume 이면 이미 기록된 포스트는 다시 받지 않음
+    if resume:
+        done_urls = {item['url'] for item in recover_journal(journal_path)}
+        print(f"⏯️ 재개 모드: 저널에 기록된 {len(done_urls)}개 포스트 건너뜀")
+    else:
+        done_urls = set()
+        reset_journal(journal_path)
 
     keywords = get_all_keywords()
     print(f"\n📋 총 {len(keywords)}개 키워드로 검색")
     print("-" * 60)
 
-    for i, keyword in enumerate(keywords):
-        print(f"\n[{i+1}/{len(keywords)}] 검색 중...")
-        results = crawl_keyword(keyword, max_pages=5)  # 키워드당 최대 5페이지
-
-        # 중복 제거하며 추가
-        for r in results:
-            if r['url'] not in seen_urls:
-                seen_urls.add(r['url'])
-                all_results.append(r)
-
-        print(f"   ✅ 완료: {len(results)}개 수집 (전체 누적: {len(all_results)}개)")
-        time.sleep(1)
-
-    print("\n" + "=" * 60)
-    print(f"📊 검색 완료: 총 {len(all_results)}개 고유 포스트")
-
-    # 본문 수집 (전체)
-    print("\n📄 본문 내용 수집 시작...")
-    all_results = enrich_with_content(all_results)
+    # 증분 모드: 최신순 검색, 이미 적재된 포스트에 닿으면 페이징 중단
+    keyword_options = None
+    if incremental:
+        ingested_urls = load_ingested_urls(output_path)
+        print(f"♻️ 증분 모드: 기존 {len(ingested_urls)}개 포스트 이후만 수집")
+        keyword_options = lambda keyword: incremental_options(keyword, ingested_urls)
+
+    if pipeline:
+        # 검색과 본문 수집을 동시에 진행
+        all_results = crawl_pipeline(keywords, max_pages=5, workers=workers, rate=rate,
+                                     keyword_options=keyword_options,
+                                     journal_path=journal_path, skip_urls=done_urls)
+        print("\n" + "=" * 60)
+        print(f"📊 검색 + 본문 수집 완료: 총 {len(all_results)}개 고유 포스트")
+    else:
+        for i, keyword in enumerate(keywords):
+            print(f"\n[{i+1}/{len(keywords)}] 검색 중...")
+            options = keyword_options(keyword) if keyword_options else {}
+            results = crawl_keyword(keyword, max_pages=5, **options)  # 키워드당 최대 5페이지
+
+            # 중복 제거하며 추가
+            for r in results:
+                if r['url'] not in seen_urls:
+                    seen_urls.add(r['url'])
+                    all_results.append(r)
+
+            print(f"   ✅ 완료: {len(results)}개 수집 (전체 누적: {len(all_results)}개)")
+            time.sleep(1)
+
+        print("\n" + "=" * 60)
+        print(f"📊 검색 완료: 총 {len(all_results)}개 고유 포스트")
+
+        # 본문 수집 (전체)
+        print("\n📄 본문 내용 수집 시작...")
+        all_results = enrich_with_content(all_results, journal_path=journal_path,
+                                          skip_urls=done_urls)
+
+    # 저널에 기록된 본문 결과로 DataFrame 생성 (메모리에는 본문을 들고 있지 않음)
+    all_results = load_journaled_results(all_results, journal_path)
+    if not all_results:
+        print("\n신규 포스트가 없습니다.")
+        return None
 
     # DataFrame 생성
     df = pd.DataFrame(all_results)
@@ -318,9 +528,20 @@ def main():
     df['source_platform'] = 'Naver Blog'
     df['collected_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-    # 저장
-    output_path = 'naver/ringle_naver_blog.csv'
-    df.to_csv(output_path, index=False, encoding='utf-8-sig')
+    # 코퍼스 어딘가에 이미 있는 본문 제외 (전체 재수집이면 기존 자기 파일과는 비교하지 않음)
+    df = drop_known(df, 'content', source=CONTENT_SOURCE, rewrite=not incremental)
+
+    # 저장 (증분 모드는 기존 CSV 뒤에 신규 행만 추가)
+    if incremental:
+        append_rows(df, output_path)
+    else:
+        df.to_csv(output_path, index=False, encoding='utf-8-sig')
+    register_frame(df, company='ringle', source=CONTENT_SOURCE, rewrite=not incremental)
+
+    # 저장이 끝난 뒤에 키워드별 high-water mark 갱신, 저널 정리
+    for source, checkpoint in pending_checkpoints.items():
+        save_checkpoint(source, checkpoint)
+    reset_journal(journal_path)
 
     elapsed = time.time() - start_time
 
@@ -339,4 +560,17 @@ def main():
     return df
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='링글 네이버 블로그 전수조사 크롤러')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='검색 페이징과 본문 수집을 동시에 진행')
+    parser.add_argument('--workers', type=int, default=PIPELINE_WORKERS,
+                        help='본문 수집 워커 수 (파이프라인 모드)')
+    parser.add_argument('--rate', type=float, default=PIPELINE_RATE,
+                        help='전체 요청 속도 제한, 요청/초 (파이프라인 모드)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='키워드별 체크포인트 이후 신규 포스트만 수집해 기존 CSV 에 추가')
+    parser.add_argument('--resume', action='store_true',
+                        help='중단된 크롤링을 저널에서 이어서 진행 (기록된 포스트는 본문 재수집 안 함)')
+    args = parser.parse_args()
+    main(pipeline=args.pipeline, workers=args.workers, rate=args.rate,
+         incremental=args.incremental, resume=args.resume)
@@ -8,14 +8,22 @@
 """
 
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
 import time
 import re
 from datetime import datetime
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import threading
 import json
 import os
 
+import crawler_http
+from content_index import drop_known, register_frame
+from crawl_state import (load_checkpoint, save_checkpoint, load_ingested_urls, append_rows,
+                         reset_journal, append_journal, recover_journal)
+
 # User-Agent 설정
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -23,9 +31,96 @@ HEADERS = {
     'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
 }
 
+# 호스트별 최소 요청 간격 (초)
+HOST_DELAYS = {
+    'www.clien.net': 1.0,
+    'www.teamblind.com': 1.5,
+    'brunch.co.kr': 1.0,
+    'kindoflegacy.com': 1.0,
+}
+DEFAULT_HOST_DELAY = 1.0
+
+# Google Play 앱 ID / 증분 크롤링 체크포인트 키
+GOOGLE_PLAY_APP_ID = 'com.ringle'
+GOOGLE_PLAY_SOURCE = 'ringle_google_play'
+
+# 본문 해시 인덱스(content_index)에 기록할 소스명
+CONTENT_SOURCE = 'ringle_review_crawler'
+
 # 결과 저장 리스트
 all_reviews = []
 
+# 실행 옵션 (main 에서 설정)
+RUN_OPTIONS = {'incremental': False, 'journal': None}
+
+# 이미 CSV 에 적재(증분)되었거나 저널에 기록(재개)된 URL (다시 수집하지 않음)
+ingested_urls = set()
+
+# CSV 저장이 끝난 뒤 기록할 체크포인트
+pending_checkpoints = {}
+
+# 호스트별 마지막 요청 시각 (동시 크롤링 시에도 호스트 단위로 간격 보장)
+_host_locks = {}
+_host_last_request = {}
+_host_registry_lock = threading.Lock()
+
+
+def wait_for_host(url):
+    """같은 호스트에 대한 요청 간격을 HOST_DELAYS 이상으로 유지"""
+    host = urlparse(url).netloc
+    with _host_registry_lock:
+        lock = _host_locks.setdefault(host, threading.Lock())
+
+    with lock:
+        delay = HOST_DELAYS.get(host, DEFAULT_HOST_DELAY)
+        last = _host_last_request.get(host)
+        if last is not None:
+            remaining = delay - (time.monotonic() - last)
+            if remaining > 0:
+                time.sleep(remaining)
+        _host_last_request[host] = time.monotonic()
+
+
+def add_review(review):
+    """수집 항목 추가 + 저널에 즉시 기록 (중단되어도 --resume 으로 이어서 수집)"""
+    all_reviews.append(review)
+    if RUN_OPTIONS['journal']:
+        append_journal(RUN_OPTIONS['journal'], review)
+
+
+def _fetch_new_play_reviews(checkpoint):
+    """최신순으로 페이지를 넘기다 체크포인트(이미 적재한 최신 리뷰)에 닿으면 중단"""
+    from google_play_scraper import reviews, Sort
+
+    newest_id = checkpoint.get('newest_review_id')
+    newest_at = checkpoint.get('newest_at')
+    newest_at = datetime.fromisoformat(newest_at) if newest_at else None
+
+    collected = []
+    token = None
+    while True:
+        batch, token = reviews(
+            GOOGLE_PLAY_APP_ID,
+            lang='ko',
+            country='kr',
+            sort=Sort.NEWEST,
+            count=200,
+            continuation_token=token
+        )
+        reached = False
+        for review in batch:
+            if review['reviewId'] == newest_id or (
+                    newest_at and review['at'] and review['at'] < newest_at):
+                reached = True
+                break
+            collected.append(review)
+
+        if reached or not batch or token is None:
+            break
+        time.sleep(0.1)
+
+    return collected
+
 
 def crawl_google_play():
     """Google Play 스토어 리뷰 크롤링"""
@@ -35,34 +130,53 @@ def crawl_google_play():
         from google_play_scraper import app, reviews_all, Sort
 
         # 앱 정보 가져오기
-        app_info = app('com.ringle', lang='ko', country='kr')
+        app_info = app(GOOGLE_PLAY_APP_ID, lang='ko', country='kr')
         print(f"  - 앱: {app_info['title']}")
         print(f"  - 평점: {app_info['score']}")
         print(f"  - 리뷰 수: {app_info['reviews']}")
 
-        # 리뷰 가져오기 (최대 500개)
-        result = reviews_all(
-            'com.ringle',
-            sleep_milliseconds=100,
-            lang='ko',
-            country='kr',
-            sort=Sort.NEWEST
-        )
+        checkpoint = load_checkpoint(GOOGLE_PLAY_SOURCE)
+        if RUN_OPTIONS['incremental'] and checkpoint:
+            # 체크포인트 이후 신규 리뷰만
+            result = _fetch_new_play_reviews(checkpoint)
+            print(f"  - 증분 모드: {checkpoint.get('newest_at')} 이후 리뷰만 수집")
+        else:
+            # 리뷰 가져오기 (전체)
+            result = reviews_all(
+                GOOGLE_PLAY_APP_ID,
+                sleep_milliseconds=100,
+                lang='ko',
+                country='kr',
+                sort=Sort.NEWEST
+            )
 
         print(f"  - 수집된 리뷰: {len(result)}개")
 
+        count = 0
         for review in result:
-            all_reviews.append({
+            url = f"https://play.google.com/store/apps/details?id={GOOGLE_PLAY_APP_ID}&reviewId={review['reviewId']}"
+            if url in ingested_urls:
+                continue
+            add_review({
                 'platform': 'Google Play',
                 'text': review['content'],
                 'rating': review['score'],
                 'date': review['at'].strftime('%Y-%m-%d') if review['at'] else '',
                 'author': review['userName'] if review['userName'] else 'Anonymous',
-                'url': f"https://play.google.com/store/apps/details?id=com.ringle&reviewId={review['reviewId']}"
+                'url': url
             })
+            count += 1
+
+        # 최신순 첫 리뷰를 다음 실행의 high-water mark 로 기록
+        if result:
+            newest = result[0]
+            pending_checkpoints[GOOGLE_PLAY_SOURCE] = {
+                'newest_review_id': newest['reviewId'],
+                'newest_at': newest['at'].isoformat() if newest['at'] else None,
+            }
 
-        print(f"  ✅ Google Play 크롤링 완료: {len(result)}개")
-        return len(result)
+        print(f"  ✅ Google Play 크롤링 완료: {count}개")
+        return count
 
     except Exception as e:
         print(f"  ❌ Google Play 크롤링 실패: {e}")
@@ -80,9 +194,11 @@ def crawl_clien():
 
     count = 0
     for url in clien_urls:
+        if url in ingested_urls:
+            continue  # 이미 적재(증분) 또는 저널에 기록됨(재개)
         try:
-            time.sleep(1)  # 요청 간격
-            response = requests.get(url, headers=HEADERS, timeout=10)
+            wait_for_host(url)  # 요청 간격
+            response = crawler_http.get(url, headers=HEADERS, timeout=10, cache=True)
             response.encoding = 'utf-8'
 
             if response.status_code == 200:
@@ -116,7 +232,7 @@ def crawl_clien():
                 author = author_elem.get_text(strip=True) if author_elem else 'Anonymous'
 
                 if text:
-                    all_reviews.append({
+                    add_review({
                         'platform': 'Clien',
                         'text': f"[{title}]\n{text}" if title else text,
                         'rating': '',
@@ -152,9 +268,11 @@ def crawl_blind():
 
     count = 0
     for url in blind_urls:
+        if url in ingested_urls:
+            continue  # 이미 적재(증분) 또는 저널에 기록됨(재개)
         try:
-            time.sleep(1.5)  # 요청 간격
-            response = requests.get(url, headers=HEADERS, timeout=10)
+            wait_for_host(url)  # 요청 간격
+            response = crawler_http.get(url, headers=HEADERS, timeout=10, cache=True)
 
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'lxml')
@@ -181,7 +299,7 @@ def crawl_blind():
                         pass
 
                 if text and len(text) > 20:
-                    all_reviews.append({
+                    add_review({
                         'platform': 'Blind',
                         'text': f"[{title}]\n{text}" if title else text,
                         'rating': '',
@@ -211,9 +329,11 @@ def crawl_brunch():
 
     count = 0
     for url in brunch_urls:
+        if url in ingested_urls:
+            continue  # 이미 적재(증분) 또는 저널에 기록됨(재개)
         try:
-            time.sleep(1)
-            response = requests.get(url, headers=HEADERS, timeout=10)
+            wait_for_host(url)
+            response = crawler_http.get(url, headers=HEADERS, timeout=10, cache=True)
             response.encoding = 'utf-8'
 
             if response.status_code == 200:
@@ -241,7 +361,7 @@ def crawl_brunch():
                 author = author_elem.get_text(strip=True) if author_elem else 'Anonymous'
 
                 if text:
-                    all_reviews.append({
+                    add_review({
                         'platform': 'Brunch',
                         'text': f"[{title}]\n{text}" if title else text,
                         'rating': '',
@@ -270,9 +390,11 @@ def crawl_blog_reviews():
 
     count = 0
     for url, platform in blog_urls:
+        if url in ingested_urls:
+            continue  # 이미 적재(증분) 또는 저널에 기록됨(재개)
         try:
-            time.sleep(1)
-            response = requests.get(url, headers=HEADERS, timeout=10)
+            wait_for_host(url)
+            response = crawler_http.get(url, headers=HEADERS, timeout=10, cache=True)
             response.encoding = 'utf-8'
 
             if response.status_code == 200:
@@ -296,7 +418,7 @@ def crawl_blog_reviews():
                     if len(text) > 10000:
                         text = text[:10000] + "...(truncated)"
 
-                    all_reviews.append({
+                    add_review({
                         'platform': platform,
                         'text': f"[{title}]\n{text}" if title else text,
                         'rating': '',
@@ -314,8 +436,40 @@ def crawl_blog_reviews():
     return count
 
 
-def save_to_csv(output_path):
-    """결과를 CSV로 저장"""
+# 플랫폼 크롤러 (출력 순서 = 실행 순서)
+CRAWLERS = [
+    ('Google Play', crawl_google_play),
+    ('클리앙', crawl_clien),
+    ('블라인드', crawl_blind),
+    ('브런치', crawl_brunch),
+    ('블로그', crawl_blog_reviews),
+]
+
+# 동시 실행 후 결과 정렬용 플랫폼 순서
+PLATFORM_ORDER = ['Google Play', 'Clien', 'Blind', 'Brunch', 'Tistory']
+
+
+def run_crawlers(concurrent=False):
+    """플랫폼 크롤러 실행 → {이름: 수집 개수}
+
+    concurrent=True 면 서로 다른 호스트를 스레드 풀로 동시에 크롤링
+    (같은 호스트는 wait_for_host 로 기존 간격 유지)
+    """
+    if not concurrent:
+        return {name: crawler() for name, crawler in CRAWLERS}
+
+    with ThreadPoolExecutor(max_workers=len(CRAWLERS)) as pool:
+        futures = {name: pool.submit(crawler) for name, crawler in CRAWLERS}
+        counts = {name: future.result() for name, future in futures.items()}
+
+    # 순차 실행과 같은 순서로 정렬 (플랫폼 내부 순서는 그대로 유지)
+    all_reviews.sort(key=lambda r: PLATFORM_ORDER.index(r['platform'])
+                     if r['platform'] in PLATFORM_ORDER else len(PLATFORM_ORDER))
+    return counts
+
+
+def save_to_csv(output_path, append=False):
+    """결과를 CSV로 저장 (append=True 면 기존 CSV 뒤에 신규 행만 추가)"""
     if not all_reviews:
         print("\n❌ 수집된 데이터가 없습니다.")
         return None
@@ -329,18 +483,25 @@ def save_to_csv(output_path):
     # 텍스트 정리 (줄바꿈을 공백으로)
     df['text'] = df['text'].apply(lambda x: ' '.join(str(x).split()) if pd.notna(x) else '')
 
+    # 코퍼스 어딘가에 이미 있는 본문 제외 (전체 재수집이면 기존 자기 파일과는 비교하지 않음)
+    df = drop_known(df, 'text', source=CONTENT_SOURCE, rewrite=not append)
+
     # CSV 저장
-    df.to_csv(output_path, index=False, encoding='utf-8-sig')
+    if append:
+        append_rows(df, output_path)
+    else:
+        df.to_csv(output_path, index=False, encoding='utf-8-sig')
+    register_frame(df, company='ringle', source=CONTENT_SOURCE, rewrite=not append)
 
     print(f"\n📊 데이터 저장 완료: {output_path}")
-    print(f"   - 총 {len(df)}개 리뷰 수집")
+    print(f"   - 총 {len(df)}개 리뷰 {'추가' if append else '수집'}")
     print(f"   - 플랫폼별 분포:")
     print(df['platform'].value_counts().to_string())
 
     return df
 
 
-def main():
+def main(concurrent=False, incremental=False, resume=False):
     """메인 실행 함수"""
     print("=" * 60)
     print("🔍 링글(Ringle) 사용자 후기 크롤러")
@@ -348,17 +509,39 @@ def main():
 
     start_time = time.time()
 
+    output_dir = os.path.dirname(os.path.abspath(__file__))
+    output_path = os.path.join(output_dir, 'ringle_reviews.csv')
+    journal_path = os.path.join(output_dir, 'ringle_reviews.journal.jsonl')
+
+    # 저널: 수집 즉시 기록, --resume 이면 이전 실행에서 기록된 항목은 다시 받지 않음
+    RUN_OPTIONS['journal'] = journal_path
+    if resume:
+        journaled = recover_journal(journal_path)
+        all_reviews.extend(journaled)
+        ingested_urls.update(r['url'] for r in journaled)
+        print(f"\n⏯️ 재개 모드: 저널에서 {len(journaled)}개 복구")
+    else:
+        reset_journal(journal_path)
+
+    # 증분 모드: 이미 적재된 URL 은 건너뛰고 신규 행만 추가
+    RUN_OPTIONS['incremental'] = incremental
+    if incremental:
+        ingested_urls.update(load_ingested_urls(output_path))
+        print(f"\n♻️ 증분 모드: 기존 {len(ingested_urls)}개 URL 건너뜀")
+
     # 각 플랫폼 크롤링
-    gp_count = crawl_google_play()
-    clien_count = crawl_clien()
-    blind_count = crawl_blind()
-    brunch_count = crawl_brunch()
-    blog_count = crawl_blog_reviews()
+    counts = run_crawlers(concurrent=concurrent)
 
     # 결과 저장
-    output_dir = os.path.dirname(os.path.abspath(__file__))
-    output_path = os.path.join(output_dir, 'ringle_reviews.csv')
-    df = save_to_csv(output_path)
+    df = save_to_csv(output_path, append=incremental)
+
+    # 저장이 끝난 뒤에 high-water mark 갱신 (중간 실패 시 다음 실행에서 다시 수집)
+    for source, checkpoint in pending_checkpoints.items():
+        save_checkpoint(source, checkpoint)
+
+    # CSV 저장까지 끝났으면 저널은 더 이상 필요 없음
+    if df is not None:
+        reset_journal(journal_path)
 
     elapsed_time = time.time() - start_time
 
@@ -368,15 +551,20 @@ def main():
 
     # 요약 통계
     print(f"\n📈 수집 요약:")
-    print(f"   - Google Play: {gp_count}개")
-    print(f"   - 클리앙: {clien_count}개")
-    print(f"   - 블라인드: {blind_count}개")
-    print(f"   - 브런치: {brunch_count}개")
-    print(f"   - 블로그: {blog_count}개")
+    for name, count in counts.items():
+        print(f"   - {name}: {count}개")
     print(f"   - 총합: {len(all_reviews)}개")
 
     return df
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='링글 사용자 후기 크롤러')
+    parser.add_argument('--concurrent', action='store_true',
+                        help='플랫폼(호스트)별로 동시에 크롤링')
+    parser.add_argument('--incremental', action='store_true',
+                        help='체크포인트 이후 신규 리뷰만 수집해 기존 CSV 에 추가')
+    parser.add_argument('--resume', action='store_true',
+                        help='중단된 크롤링을 저널에서 이어서 진행')
+    args = parser.parse_args()
+    main(concurrent=args.concurrent, incremental=args.incremental, resume=args.resume)
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+한국어 문자 n-gram 역색인 + BM25 검색
+- 문서마다 문자 유니그램/바이그램을 색인 (어절 안의 부분 문자열도 검색 가능 - '환불' → '환불하고')
+- 검색어는 n-gram 포스팅 리스트 교집합으로 후보를 좁힌 뒤 원문 부분 문자열로 확인 (오탐 없음)
+- 불리언 질의 (공백 = AND, OR, -제외) + 따옴표 구문 검색, BM25 순위
+- 색인은 numpy 배열로 디스크에 저장하고 원본 파일이 바뀌면 다시 생성
+
+사용법:
+    python search_index.py build
+    python search_index.py search '환불 OR 취소 -광고' --company uphone --limit 5
+    python search_index.py search '"수업 시간"' --platform playstore
+
+    from search_index import load_index, search, find_quotes
+    index = load_index()
+    quotes = find_quotes(index, '튜터 피드백', company='ringle', limit=3)
+"""
+
+import argparse
+import os
+import pickle
+import re
+import shlex
+import time
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from corpus_store import COMPANIES, resolve_company_file
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_PATH = os.path.join(DATA_DIR, '.search_index.pkl')
+
+# 색인 형식이 바뀌면 올려서 기존 색인 무효화
+INDEX_VERSION = 1
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+SNIPPET_CHARS = 40      # 검색 결과 스니펫의 매치 앞뒤 글자 수
+
+_WHITESPACE = re.compile(r'\s+')
+_UNIGRAM = np.uint64(0xFFFFFFFF)    # 유니그램 키의 두 번째 글자 자리 (실제 코드포인트와 겹치지 않음)
+_SHIFT = np.uint64(32)
+
+
+def normalize(text):
+    """색인/검색 공통 정규화 (NFC + 소문자 + 공백 정리)"""
+    if not isinstance(text, str):
+        return ''
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFC', text).lower()).strip()
+
+
+def _codes(text):
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+
+
+def gram_keys(text):
+    """정규화된 텍스트의 유니그램 + 바이그램 키 (uint64, 중복 제거)"""
+    codes = _codes(text)
+    if len(codes) == 0:
+        return np.zeros(0, dtype=np.uint64)
+    unigrams = (codes << _SHIFT) | _UNIGRAM
+    bigrams = (codes[:-1] << _SHIFT) | codes[1:]
+    return np.unique(np.concatenate([unigrams, bigrams]))
+
+
+def _query_keys(term):
+    """검색어를 덮는 n-gram 키 (1글자면 유니그램, 아니면 바이그램)"""
+    codes = _codes(term)
+    if len(codes) == 1:
+        return (codes << _SHIFT) | _UNIGRAM
+    return np.unique((codes[:-1] << _SHIFT) | codes[1:])
+
+
+def _source_signature(data_dir, companies):
+    """원본 파일 서명 (경로, 수정 시각, 크기)"""
+    signature = []
+    for company in companies:
+        path, _ = resolve_company_file(company, data_dir)
+        if path is not None:
+            stat = os.stat(path)
+            signature.append((os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+    return signature
+
+
+def build_index(df, text_column='text', meta_columns=('company', 'source_platform', 'rating', 'date')):
+    """DataFrame → 색인 dict
+
+    postings: 키별 문서 id (CSR - keys 정렬, indptr, doc_ids)
+    """
+    texts = [normalize(t) for t in df[text_column]]
+
+    per_doc = [gram_keys(t) for t in texts]
+    lengths = np.array([len(k) for k in per_doc], dtype=np.int64)
+    all_keys = np.concatenate(per_doc) if per_doc else np.zeros(0, dtype=np.uint64)
+    doc_ids = np.repeat(np.arange(len(texts), dtype=np.int32), lengths)
+
+    # 키 기준 정렬 (같은 키 안에서는 문서 id 오름차순 유지)
+    order = np.argsort(all_keys, kind='stable')
+    all_keys = all_keys[order]
+    doc_ids = doc_ids[order]
+    keys, starts = np.unique(all_keys, return_index=True)
+    indptr = np.append(starts, len(all_keys)).astype(np.int64)
+
+    meta = pd.DataFrame({col: df[col].to_numpy() for col in meta_columns if col in df.columns})
+    for col in ('company', 'source_platform'):
+        if col in meta.columns:
+            meta[col] = meta[col].astype(str).str.lower()
+
+    return {
+        'version': INDEX_VERSION,
+        'keys': keys,
+        'indptr': indptr,
+        'doc_ids': doc_ids,
+        'texts': texts,
+        'raw_texts': [t if isinstance(t, str) else '' for t in df[text_column]],
+        'doc_lengths': np.array([len(t) for t in texts], dtype=np.int64),
+        'meta': meta,
+    }
+
+
+def save_index(index, path=INDEX_PATH, signature=None):
+    """색인 저장 (임시 파일 → rename 으로 원자적 교체)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({**index, 'signature': signature}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_index(path=INDEX_PATH, data_dir=DATA_DIR, companies=COMPANIES, rebuild=True):
+    """디스크 색인 로드 (없거나 원본이 바뀌었으면 rebuild=True 일 때 코퍼스에서 다시 생성)"""
+    signature = _source_signature(data_dir, companies)
+    if os.path.exists(path):
+        try:
+            with open(path, 'rb') as f:
+                index = pickle.load(f)
+            if index.get('version') == INDEX_VERSION and index.get('signature') == signature:
+                return index
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            pass
+    if not rebuild:
+        return None
+
+    from corpus_loader import load_corpus
+    index = build_index(load_corpus(data_dir, companies))
+    save_index(index, path, signature)
+    return index
+
+
+def postings(index, key):
+    """n-gram 키 하나의 문서 id 배열"""
+    pos = np.searchsorted(index['keys'], key)
+    if pos == len(index['keys']) or index['keys'][pos] != key:
+        return np.zeros(0, dtype=np.int32)
+    return index['doc_ids'][index['indptr'][pos]:index['indptr'][pos + 1]]
+
+
+def match_term(index, term, candidates=None):
+    """검색어(또는 구문)를 포함한 문서 → (문서 id 배열, 출현 횟수 배열)
+
+    n-gram 포스팅 리스트를 짧은 것부터 교집합 → 원문 부분 문자열 확인
+    """
+    term = normalize(term)
+    if not term:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int64)
+
+    lists = sorted((postings(index, key) for key in _query_keys(term)), key=len)
+    docs = lists[0] if candidates is None else np.intersect1d(lists[0], candidates, assume_unique=True)
+    for posting in lists[1:]:
+        if len(docs) == 0:
+            break
+        docs = np.intersect1d(docs, posting, assume_unique=True)
+
+    texts = index['texts']
+    tf = np.array([texts[d].count(term) for d in docs], dtype=np.int64)
+    found = tf > 0
+    return docs[found], tf[found]
+
+
+def parse_query(query):
+    """질의 문자열 → 절 리스트 [(제외 여부, [검색어, ...]), ...]
+
+    공백으로 구분된 절은 AND, 'A OR B' 는 한 절 안의 대안, '-A' 는 제외, "따옴표" 는 구문
+    작은따옴표는 일반 문자로 취급 ("don't"), 큰따옴표 짝이 안 맞으면 따옴표를 무시하고 공백으로만 분리
+    """
+    clauses = []
+    lexer = shlex.shlex(query, posix=True)
+    lexer.whitespace_split = True
+    lexer.quotes = '"'
+    lexer.commenters = ''
+    try:
+        tokens = list(lexer)
+    except ValueError:
+        tokens = query.replace('"', ' ').split()
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        negate = token.startswith('-') and len(token) > 1
+        alternatives = [token[1:] if negate else token]
+        while i + 2 < len(tokens) and tokens[i + 1] == 'OR':
+            alternatives.append(tokens[i + 2])
+            i += 2
+        clauses.append((negate, alternatives))
+        i += 1
+    return clauses
+
+
+def _bm25(index, tf, docs, df_count, population=None):
+    """BM25 점수 (population: 필터로 좁힌 문서 id - 문서 빈도와 같은 모집단으로 N/평균 길이 계산)"""
+    lengths = index['doc_lengths'][docs]
+    population_lengths = index['doc_lengths'] if population is None else index['doc_lengths'][population]
+    n_docs = len(population_lengths)
+    avg_length = max(population_lengths.mean(), 1) if n_docs else 1
+    idf = np.log(1 + (n_docs - df_count + 0.5) / (df_count + 0.5))
+    return idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * lengths / avg_length))
+
+
+def _filter_docs(index, company=None, platform=None):
+    """메타데이터 조건에 맞는 문서 id (조건이 없으면 None)"""
+    meta = index['meta']
+    mask = np.ones(len(meta), dtype=bool)
+    if company:
+        mask &= meta['company'].isin([c.lower() for c in np.atleast_1d(company)]).to_numpy()
+    if platform:
+        mask &= meta['source_platform'].isin([p.lower() for p in np.atleast_1d(platform)]).to_numpy()
+    if company or platform:
+        return np.flatnonzero(mask).astype(np.int32)
+    return None
+
+
+def search(index, query, company=None, platform=None, limit=20):
+    """불리언/구문 질의 → BM25 순위 결과 DataFrame (doc_id, score, 메타데이터, snippet)"""
+    candidates = _filter_docs(index, company, platform)
+    clauses = parse_query(query)
+    scores = {}
+    matched = None
+    excluded = []
+
+    for negate, alternatives in clauses:
+        clause_docs = []
+        for term in alternatives:
+            docs, tf = match_term(index, term, candidates)
+            clause_docs.append(docs)
+            if not negate:
+                for doc, score in zip(docs, _bm25(index, tf, docs, len(docs), candidates)):
+                    scores[doc] = scores.get(doc, 0.0) + score
+        docs = np.unique(np.concatenate(clause_docs)) if clause_docs else np.zeros(0, dtype=np.int32)
+        if negate:
+            excluded.append(docs)
+        else:
+            matched = docs if matched is None else np.intersect1d(matched, docs, assume_unique=True)
+
+    if matched is None:
+        matched = np.zeros(0, dtype=np.int32)
+    for docs in excluded:
+        matched = np.setdiff1d(matched, docs, assume_unique=True)
+
+    ranked = sorted(matched, key=lambda d: (-scores.get(d, 0.0), d))[:limit]
+    positive_terms = [normalize(t) for negate, alts in clauses if not negate for t in alts]
+    results = index['meta'].iloc[ranked].copy()
+    results.insert(0, 'score', [round(scores.get(d, 0.0), 4) for d in ranked])
+    results.insert(0, 'doc_id', ranked)
+    results['snippet'] = [_snippet(index['texts'][d], positive_terms) for d in ranked]
+    return results.reset_index(drop=True)
+
+
+def _snippet(text, terms):
+    """첫 번째 매치 주변 텍스트"""
+    positions = [text.find(t) for t in terms if t and t in text]
+    if not positions:
+        return text[:SNIPPET_CHARS * 2]
+    start = max(min(positions) - SNIPPET_CHARS, 0)
+    return ('…' if start else '') + text[start:start + SNIPPET_CHARS * 2 + max(len(t) for t in terms)]
+
+
+def find_quotes(index, query, company=None, platform=None, limit=3, max_len=200):
+    """리포트용 인용문: 질의에 맞는 상위 문서의 원문 (max_len 자로 자름)"""
+    results = search(index, query, company, platform, limit)
+    return [index['raw_texts'][d][:max_len] for d in results['doc_id']]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='n-gram 역색인 검색')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('build', help='코퍼스 색인 생성')
+    s = sub.add_parser('search', help='검색')
+    s.add_argument('query', help="예: '환불 OR 취소 -광고', '\"수업 시간\"'")
+    s.add_argument('--company', nargs='+')
+    s.add_argument('--platform', nargs='+')
+    s.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        if os.path.exists(INDEX_PATH):
+            os.remove(INDEX_PATH)
+        index = load_index()
+        print(f"✅ 색인 생성: 문서 {len(index['texts']):,}개, n-gram {len(index['keys']):,}개 → {INDEX_PATH}")
+        return
+
+    index = load_index()
+    started = time.time()
+    results = search(index, args.query, args.company, args.platform, args.limit)
+    elapsed = (time.time() - started) * 1000
+    for row in results.itertuples(index=False):
+        print(f"[{row.score:.2f}] {row.company}/{row.source_platform}: {row.snippet}")
+    print(f"⏱️ {len(results)}건 ({elapsed:.0f}ms)")
+
+
+if __name__ == '__main__':
+    main()
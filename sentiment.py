@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+사전 기반 감정 점수 엔진
+- 표제어 스트림(lemmatizer, 캐시 사용) 위에서 가중치 극성 사전으로 점수 계산
+- 부정어('안 좋다', '좋지 않다', '문제 없다') 는 극성 반전 ('안 되다' 는 '안되다' 로 채점), 강조어('너무', '정말') / 완화어('조금') 는 가중
+- 코퍼스 전체 토큰을 하나의 배열로 펼쳐 NumPy 로 한 번에 계산 (행 단위 루프 없음)
+- 텍스트 점수와 별점을 결합(rating fusion)해 긍정/부정/중립 판정
+- 회사별 분포표 = sentiment_distribution.csv 형식
+- 회사별 텍스트 요약 = company_text_analysis_summary.csv 형식 (감정 분포 + 제안 리뷰 수 + 주요 페인포인트)
+
+점수:
+    텍스트 점수 = s / sqrt(s² + NORMALIZE_ALPHA)   (s = 토큰 극성 합, -1 ~ 1)
+    별점 점수   = (rating - 3) / 2                  (-1 ~ 1)
+    최종 점수   = RATING_WEIGHT × 별점 점수 + (1 - RATING_WEIGHT) × 텍스트 점수 (별점이 없으면 텍스트 점수)
+    |최종 점수| < NEUTRAL_BAND 이면 중립
+
+사용법:
+    python sentiment.py                               # sentiment_distribution.csv / company_text_analysis_summary.csv 재생성
+    python sentiment.py --by source_type --output-dir /tmp/senti
+    python sentiment.py --scores /tmp/scores.csv      # 행별 점수도 저장
+    python sentiment.py --check                       # 회귀 예시 문장 판정 확인
+"""
+
+import argparse
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from corpus_store import COMPANIES
+from lemmatizer import DEFAULT_WORKERS, analyze_batch, lemma_streams
+from painpoint_analysis import PAINPOINT_KEYWORDS, tag_painpoints
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 극성 사전 (표제어 기준, 명사/어근은 '하다'/'스럽다'/'되다' 파생형까지 같은 가중치)
+POSITIVE_WORDS = {
+    '좋다': 1.0, '최고': 2.0, '만족': 1.5, '추천': 1.0, '강추': 2.0, '편리': 1.0, '편하다': 1.0,
+    '재밌다': 1.0, '재미있다': 1.0, '유익': 1.0, '도움': 0.5, '효과적': 1.0, '친절': 1.0,
+    '감사': 1.0, '고맙다': 1.0, '훌륭하다': 1.5, '완벽': 1.5, '꼼꼼': 1.0, '저렴': 0.5,
+    '괜찮다': 0.5, '즐겁다': 1.0, '쉽다': 0.5, '자신감': 0.5, '성장': 0.5, '향상': 0.5,
+    '감동': 1.5, '대박': 1.5, '짱': 1.5, '사랑': 1.0, '멋지다': 1.0, '알차다': 1.0, '깔끔': 1.0,
+    '행복': 1.0, '뿌듯': 1.0, '든든': 1.0, '신기': 0.5, '꾸준': 0.5, '최상': 1.5, '유용': 1.0,
+}
+NEGATIVE_WORDS = {
+    '불편': -1.0, '오류': -1.0, '버그': -1.0, '환불': -1.0, '느리다': -1.0, '문제': -0.5,
+    '최악': -2.0, '별로': -1.0, '실망': -1.5, '짜증': -1.5, '짜증나다': -1.5, '답답': -1.0,
+    '불만': -1.0, '아쉽다': -0.5, '아쉬움': -0.5, '비싸다': -0.5, '어렵다': -0.5, '힘들다': -0.5,
+    '싫다': -1.0, '나쁘다': -1.0, '후회': -1.5, '화나다': -1.5, '불친절': -1.5, '안되다': -1.0,
+    '끊기다': -1.0, '튕기다': -1.0, '렉': -1.0, '지루': -1.0, '귀찮다': -0.5, '부족': -0.5,
+    '비추': -1.5, '사기': -2.0, '먹통': -1.5, '불안정': -1.0, '엉망': -1.5, '형편없다': -2.0,
+    '스트레스': -1.0, '불쾌': -1.5, '무성의': -1.5, '황당': -1.5, '어이없다': -1.5, '재미없다': -1.0,
+}
+DERIVED_SUFFIXES = ('다', '하다', '스럽다', '되다')
+
+# 부정어: 앞에 오면 바로 뒤 토큰을, 뒤에 오면 NEGATION_WINDOW 토큰 앞까지 반전 ('안 좋다', '좋다 않다')
+# '안'/'못' 은 뒤의 용언만 부정 ('환불 안 되다' 의 '환불' 은 반전하지 않음)
+NEGATORS_BEFORE = frozenset({'안', '못'})
+NEGATORS_AFTER = frozenset({'않다', '못하다', '아니다', '없다'})
+# '안'/'못' + 용언을 붙여 쓴 한 단어로 채점 ('도움 안 되다' → '안되다' 의 극성, 반전하지 않음)
+FUSED_NEGATIONS = {'되다': '안되다'}
+NEGATION_WINDOW = 2
+NEGATION_FACTOR = -0.75     # 반전 시 크기도 약간 줄임 ('안 좋다' 는 '나쁘다' 보다 약함)
+
+# 강조어 / 완화어 (바로 뒤 토큰에 곱함)
+MODIFIERS = {
+    '너무': 1.5, '정말': 1.5, '진짜': 1.5, '매우': 1.5, '완전': 1.5, '엄청': 1.5, '아주': 1.5,
+    '정말로': 1.5, '되게': 1.5, '굉장히': 1.5, '가장': 1.5, '제일': 1.5, '훨씬': 1.5, '넘': 1.5,
+    '조금': 0.5, '약간': 0.5, '좀': 0.5, '다소': 0.5, '살짝': 0.5,
+}
+
+NORMALIZE_ALPHA = 15.0      # 텍스트 점수 정규화 상수 (토큰 극성 합 → -1 ~ 1)
+RATING_WEIGHT = 0.7         # 별점이 있을 때 최종 점수에서 별점 비중
+NEUTRAL_BAND = 0.05         # |최종 점수| 가 이보다 작으면 중립
+
+LABELS = ('positive', 'negative', 'neutral')
+
+# 회귀 예시 (문장 → 텍스트 점수 판정), python sentiment.py --check 로 확인
+SENTIMENT_EXAMPLES = (
+    ('환불 안 돼요', 'negative'),
+    ('환불 안 해줘요', 'negative'),
+    ('별로 안 좋아요', 'negative'),
+    ('좋지 않아요', 'negative'),
+    ('실망 없이 좋았어요', 'positive'),
+    ('문제 없어요', 'positive'),
+    ('도움이 안 돼요', 'negative'),
+    ('너무 좋아요', 'positive'),
+    ('수업을 들었어요', 'neutral'),
+)
+
+# 제안/요청 표현 (하나라도 있으면 제안 리뷰로 카운트)
+SUGGESTION_INDICATORS = [
+    '했으면', '하면 좋겠', '좋겠', '바랍니다', '바래요', '바라요', '개선', '추가해', '추가되',
+    '생겼으면', '있었으면', '제안', '건의', '아쉬운 점',
+]
+
+OUTPUT_DIRS = ['phase/02_company_comparison/data', 'analysis/05_data']
+SUMMARY_OUTPUT_DIRS = ['phase', 'analysis/05_data']
+
+
+def build_lexicon(positive=POSITIVE_WORDS, negative=NEGATIVE_WORDS):
+    """극성 사전 → {표제어: 가중치} (명사/어근은 파생 용언형까지 확장, 명시된 형태가 우선)"""
+    lexicon = {}
+    for words in (positive, negative):
+        for word, weight in words.items():
+            if not word.endswith('다'):
+                for suffix in DERIVED_SUFFIXES:
+                    lexicon.setdefault(word + suffix, weight)
+    for words in (positive, negative):
+        lexicon.update(words)
+    return lexicon
+
+
+LEXICON = build_lexicon()
+
+
+def _flatten(streams):
+    """행별 토큰 리스트 → (토큰 코드 배열, 코드별 토큰, 토큰별 행 번호)"""
+    lengths = np.fromiter((len(s) for s in streams), dtype=np.int64, count=len(streams))
+    codes, uniques = pd.factorize(pd.Series([t for s in streams for t in s], dtype=object))
+    return codes, list(uniques), np.repeat(np.arange(len(streams)), lengths)
+
+
+def _shift(values, doc_ids, offset, fill):
+    """같은 행 안에서 offset 만큼 떨어진 토큰의 값 (행 경계를 넘으면 fill)"""
+    shifted = np.full(len(values), fill, dtype=values.dtype)
+    if offset > 0 and len(values) > offset:
+        same = doc_ids[offset:] == doc_ids[:-offset]
+        shifted[offset:][same] = values[:-offset][same]
+    elif offset < 0 and len(values) > -offset:
+        same = doc_ids[:offset] == doc_ids[-offset:]
+        shifted[:offset][same] = values[-offset:][same]
+    return shifted
+
+
+def text_scores(streams, lexicon=LEXICON):
+    """행별 표제어 리스트 → 텍스트 감정 점수 배열 (-1 ~ 1, 극성 토큰이 없으면 0)"""
+    codes, uniques, doc_ids = _flatten(streams)
+    polarity = np.array([lexicon.get(t, 0.0) for t in uniques], dtype=np.float64)[codes]
+    modifier = np.array([MODIFIERS.get(t, 1.0) for t in uniques], dtype=np.float64)[codes]
+    before = np.array([t in NEGATORS_BEFORE for t in uniques], dtype=bool)[codes]
+    after = np.array([t in NEGATORS_AFTER for t in uniques], dtype=bool)[codes]
+    fused_polarity = np.array([lexicon.get(FUSED_NEGATIONS.get(t), np.nan) for t in uniques],
+                              dtype=np.float64)[codes]
+
+    negated = _shift(before, doc_ids, 1, False)
+    fused = negated & ~np.isnan(fused_polarity)
+    polarity = np.where(fused, fused_polarity, polarity)
+    negated &= ~fused
+    for offset in range(1, NEGATION_WINDOW + 1):
+        negated |= _shift(after, doc_ids, -offset, False)
+
+    weights = polarity * _shift(modifier, doc_ids, 1, 1.0) * np.where(negated, NEGATION_FACTOR, 1.0)
+    raw = np.bincount(doc_ids, weights=weights, minlength=len(streams))
+    return raw / np.sqrt(raw ** 2 + NORMALIZE_ALPHA)
+
+
+def check_examples():
+    """SENTIMENT_EXAMPLES 회귀 확인 → 기대와 다른 (문장, 기대 판정, 실제 판정, 텍스트 점수) 리스트"""
+    sentences = [sentence for sentence, _ in SENTIMENT_EXAMPLES]
+    scores = text_scores(analyze_batch(sentences))
+    labels = classify(scores)
+    return [(sentence, expected, label, score)
+            for (sentence, expected), label, score in zip(SENTIMENT_EXAMPLES, labels, scores)
+            if label != expected]
+
+
+def fuse(scores, ratings, rating_weight=RATING_WEIGHT):
+    """텍스트 점수 + 별점 (1~5) → 최종 점수 (별점이 없는 행은 텍스트 점수 그대로)"""
+    ratings = np.asarray(ratings, dtype=np.float64)
+    rating_scores = np.clip((ratings - 3) / 2, -1, 1)
+    fused = rating_weight * rating_scores + (1 - rating_weight) * scores
+    return np.where(np.isnan(ratings), scores, fused)
+
+
+def classify(scores, band=NEUTRAL_BAND):
+    """최종 점수 → 'positive' / 'negative' / 'neutral'"""
+    return np.where(scores >= band, 'positive', np.where(scores <= -band, 'negative', 'neutral'))
+
+
+def score_corpus(df, lemmas=None, workers=DEFAULT_WORKERS, use_cache=True):
+    """코퍼스 → 행별 점수 DataFrame (text_score, score, sentiment 추가, 원본 컬럼 일부 유지)"""
+    if lemmas is None:
+        lemmas = lemma_streams(df['text'], workers, use_cache=use_cache)
+    columns = [c for c in ('data_id', 'company', 'source_type', 'source_platform', 'rating') if c in df.columns]
+    scored = df[columns].copy()
+    scored['text_score'] = text_scores(lemmas)
+    ratings = df['rating'] if 'rating' in df.columns else np.full(len(df), np.nan)
+    scored['score'] = fuse(scored['text_score'].to_numpy(), pd.to_numeric(ratings, errors='coerce'))
+    scored['sentiment'] = classify(scored['score'].to_numpy())
+    return scored
+
+
+def distribution(scored, by='company'):
+    """행별 점수 → 그룹별 감정 분포표 (sentiment_distribution.csv 형식, 긍정률 내림차순)"""
+    groups = scored[by].astype(str).str.lower()
+    counts = pd.crosstab(groups, scored['sentiment']).reindex(columns=LABELS, fill_value=0)
+    table = counts.copy()
+    table.insert(0, 'total', counts.sum(axis=1))
+    for label in LABELS:
+        table[f'{label}_pct'] = (counts[label] / table['total'] * 100).round(1)
+
+    if 'rating' in scored.columns:
+        table['avg_rating'] = pd.to_numeric(scored['rating'], errors='coerce').groupby(groups).mean().round(2)
+    if 'source_type' in scored.columns and by != 'source_type':
+        sources = scored['source_type'].astype(str)
+        table['source_distribution'] = [
+            str(sources[groups == group].value_counts().to_dict()) for group in table.index
+        ]
+
+    table = table.rename_axis(by).reset_index()
+    table.columns.name = None
+    return table.sort_values('positive_pct', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def suggestion_mask(texts):
+    """행별 제안/요청 표현 포함 여부 (불리언 배열)"""
+    pattern = '|'.join(re.escape(word) for word in SUGGESTION_INDICATORS)
+    return pd.Series(texts, dtype='string').fillna('').str.contains(pattern, regex=True).to_numpy(dtype=bool)
+
+
+def top_painpoints(texts, groups, sentiments, use_cache=True):
+    """그룹별 최다 페인포인트 카테고리 (부정 리뷰 기준, 부정 리뷰에 태그가 없으면 전체 리뷰 기준)"""
+    hits, _ = tag_painpoints(texts, use_cache)
+    categories = list(PAINPOINT_KEYWORDS)
+    negative = np.asarray(sentiments) == 'negative'
+    groups = np.asarray(groups)
+
+    top = {}
+    for group in pd.unique(groups):
+        rows = groups == group
+        counts = hits[rows & negative].sum(axis=0)
+        if not counts.any():
+            counts = hits[rows].sum(axis=0)
+        top[group] = categories[int(np.argmax(counts))] if counts.any() else ''
+    return top
+
+
+def text_summary(df, scored, use_cache=True):
+    """행별 점수 → 회사별 텍스트 요약표 (company_text_analysis_summary.csv 형식, COMPANIES 순서)"""
+    groups = scored['company'].astype(str).str.lower().to_numpy()
+    counts = pd.crosstab(groups, scored['sentiment']).reindex(columns=LABELS, fill_value=0)
+    order = [c for c in COMPANIES if c in counts.index] + [c for c in counts.index if c not in COMPANIES]
+    counts = counts.loc[order]
+
+    suggestions = pd.Series(suggestion_mask(df['text']), index=groups).groupby(level=0).sum()
+    painpoints = top_painpoints(df['text'], groups, scored['sentiment'], use_cache)
+
+    total = counts.sum(axis=1)
+    return pd.DataFrame({
+        'company': [c.upper() for c in order],
+        'total': total.to_numpy(),
+        'positive': counts['positive'].to_numpy(),
+        'negative': counts['negative'].to_numpy(),
+        'neutral': counts['neutral'].to_numpy(),
+        'suggestions': suggestions.reindex(order, fill_value=0).to_numpy(),
+        'top_painpoint': [painpoints[c] for c in order],
+        'positive_rate': [f"{p / t * 100:.1f}%" for p, t in zip(counts['positive'], total)],
+        'negative_rate': [f"{n / t * 100:.1f}%" for n, t in zip(counts['negative'], total)],
+    })
+
+
+def main():
+    from corpus_loader import load_corpus
+
+    parser = argparse.ArgumentParser(description='사전 기반 감정 분포')
+    parser.add_argument('--by', default='company', help='분포를 나눌 컬럼 (기본: company)')
+    parser.add_argument('--scores', help='행별 점수를 저장할 CSV 경로')
+    parser.add_argument('--output-dir', help='저장 위치 (기본: 기존 산출물 위치)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='표제어 분석 프로세스 수')
+    parser.add_argument('--no-cache', action='store_true', help='표제어 캐시를 쓰지 않고 다시 분석')
+    parser.add_argument('--check', action='store_true', help='회귀 예시 문장(SENTIMENT_EXAMPLES) 판정 확인')
+    args = parser.parse_args()
+
+    if args.check:
+        failures = check_examples()
+        for sentence, expected, label, score in failures:
+            print(f"❌ {sentence}: 기대 {expected}, 실제 {label} ({score:+.3f})")
+        print(f"{'✅' if not failures else '⚠️'} 회귀 예시 {len(SENTIMENT_EXAMPLES) - len(failures)}/{len(SENTIMENT_EXAMPLES)} 통과")
+        if failures:
+            raise SystemExit(1)
+        return
+
+    df = load_corpus()
+    print(f"📊 코퍼스: {len(df):,}건")
+
+    scored = score_corpus(df, workers=args.workers, use_cache=not args.no_cache)
+    table = distribution(scored, args.by)
+    print(table.drop(columns=['source_distribution'], errors='ignore').to_string(index=False))
+
+    name = 'sentiment_distribution.csv' if args.by == 'company' else f'sentiment_distribution_by_{args.by}.csv'
+    dirs = [args.output_dir] if args.output_dir else [os.path.join(DATA_DIR, d) for d in OUTPUT_DIRS]
+    for out_dir in dirs:
+        os.makedirs(out_dir, exist_ok=True)
+        path = os.path.join(out_dir, name)
+        table.to_csv(path, index=False, encoding='utf-8')
+        print(f"✅ {path} ({len(table)}행)")
+
+    summary = text_summary(df, scored, use_cache=not args.no_cache)
+    dirs = [args.output_dir] if args.output_dir else [os.path.join(DATA_DIR, d) for d in SUMMARY_OUTPUT_DIRS]
+    for out_dir in dirs:
+        os.makedirs(out_dir, exist_ok=True)
+        path = os.path.join(out_dir, 'company_text_analysis_summary.csv')
+        summary.to_csv(path, index=False, encoding='utf-8-sig')
+        print(f"✅ {path} ({len(summary)}행)")
+
+    if args.scores:
+        scored.to_csv(args.scores, index=False, encoding='utf-8-sig')
+        print(f"✅ 행별 점수: {args.scores} ({len(scored):,}행)")
+
+
+if __name__ == '__main__':
+    main()
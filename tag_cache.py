@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+본문 해시 기반 증분 태그 캐시
+- (택소노미, 본문 해시) → 태깅 결과 를 SQLite 에 저장해 두고, 새로 들어왔거나 바뀐 본문만 다시 태깅
+- 택소노미 버전 = 패턴 정의의 해시 → 키워드 사전을 고치면 그 택소노미 캐시만 자동 무효화
+- 태깅 결과는 JSON 으로 저장 (라벨 리스트, 부정 표현 개수 등)
+
+사용법:
+    from tag_cache import cached_tags, taxonomy_version
+    version = taxonomy_version(PAINPOINT_KEYWORDS)
+    labels = cached_tags('painpoint', version, texts, tag_function)
+
+    python tag_cache.py info      # 택소노미별 캐시 현황
+    python tag_cache.py prune     # 현재 버전이 아닌 항목 정리 (가장 최근 버전만 남김)
+    python tag_cache.py clear     # 전체 삭제
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(DATA_DIR, '.tag_cache.sqlite')
+
+_conn = None
+_conn_path = None
+_lock = threading.Lock()
+
+
+def taxonomy_version(*definitions):
+    """택소노미 정의(패턴 dict/list 등) → 버전 문자열 (정의가 바뀌면 달라짐)"""
+    payload = json.dumps(definitions, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def text_key(text):
+    """태그 캐시 키 (원문 그대로의 해시 - 공백/대소문자가 달라도 매칭 결과가 달라질 수 있으므로 정규화하지 않음)"""
+    if not isinstance(text, str):
+        return None
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _get_conn(path):
+    """캐시 DB 연결 (호출 측에서 _lock 보유)"""
+    global _conn, _conn_path
+    if _conn is None or _conn_path != path:
+        if _conn is not None:
+            _conn.close()
+        _conn = sqlite3.connect(path, check_same_thread=False)
+        _conn_path = path
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS tags (
+                taxonomy TEXT,
+                hash TEXT,
+                version TEXT,
+                value TEXT,
+                updated_at REAL,
+                PRIMARY KEY (taxonomy, hash)
+            ) WITHOUT ROWID
+        """)
+        _conn.commit()
+    return _conn
+
+
+def lookup(taxonomy, version, keys, path=CACHE_PATH):
+    """현재 버전으로 캐시된 항목 → {해시: 값}"""
+    keys = list({k for k in keys if k})
+    found = {}
+    with _lock:
+        conn = _get_conn(path)
+        # SQLite 바인딩 변수 개수 제한 안에서 나눠 조회
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ','.join('?' * len(batch))
+            for key, value in conn.execute(
+                f"SELECT hash, value FROM tags WHERE taxonomy = ? AND version = ? "
+                f"AND hash IN ({placeholders})", [taxonomy, version] + batch
+            ):
+                found[key] = json.loads(value)
+    return found
+
+
+def store(taxonomy, version, items, path=CACHE_PATH):
+    """{해시: 값} 저장 (같은 해시의 이전 버전 항목은 덮어씀)"""
+    now = time.time()
+    rows = [(taxonomy, key, version, json.dumps(value, ensure_ascii=False), now)
+            for key, value in items.items() if key]
+    with _lock:
+        conn = _get_conn(path)
+        conn.executemany("INSERT OR REPLACE INTO tags VALUES (?, ?, ?, ?, ?)", rows)
+        conn.commit()
+
+
+def cached_tags(taxonomy, version, texts, tag_function, path=CACHE_PATH, verbose=True):
+    """텍스트별 태깅 결과 (캐시에 없는 본문만 tag_function 으로 태깅 후 저장)
+
+    Args:
+        tag_function: 텍스트 리스트 → 같은 길이의 결과 리스트 (JSON 직렬화 가능한 값)
+
+    Returns:
+        texts 와 같은 순서의 결과 리스트
+    """
+    texts = list(texts)
+    keys = [text_key(t) for t in texts]
+    found = lookup(taxonomy, version, keys, path)
+    reused = sum(1 for key in keys if key in found)
+
+    # 캐시에 없는 본문은 한 번씩만 태깅 (해시가 없는 비문자열 값은 행마다 태깅)
+    missing = {}
+    for i, key in enumerate(keys):
+        if key not in found:
+            missing.setdefault(key if key is not None else ('row', i), i)
+
+    computed = {}
+    if missing:
+        rows = list(missing.values())
+        values = tag_function([texts[i] for i in rows])
+        new_items = {key: value for key, value in zip(missing, values) if isinstance(key, str)}
+        store(taxonomy, version, new_items, path)
+        found.update(new_items)
+        computed = dict(zip(rows, values))
+
+    if verbose:
+        print(f"   🗂️ 태그 캐시 [{taxonomy}]: {reused:,}건 재사용, {len(missing):,}건 새로 태깅")
+
+    return [found[key] if key is not None else computed[i] for i, key in enumerate(keys)]
+
+
+def prune(path=CACHE_PATH):
+    """택소노미마다 가장 최근에 기록된 버전만 남기고 삭제 → 삭제된 행 수"""
+    with _lock:
+        conn = _get_conn(path)
+        before = conn.total_changes
+        conn.execute("""
+            DELETE FROM tags WHERE version != (
+                SELECT t.version FROM tags t WHERE t.taxonomy = tags.taxonomy
+                ORDER BY t.updated_at DESC LIMIT 1
+            )
+        """)
+        conn.commit()
+        return conn.total_changes - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description='증분 태그 캐시')
+    parser.add_argument('command', choices=['info', 'prune', 'clear'])
+    args = parser.parse_args()
+
+    if args.command == 'prune':
+        print(f"✅ 이전 버전 항목 {prune():,}개 삭제")
+    elif args.command == 'clear':
+        with _lock:
+            conn = _get_conn(CACHE_PATH)
+            conn.execute("DELETE FROM tags")
+            conn.commit()
+        print(f"✅ 캐시 비움: {CACHE_PATH}")
+    else:
+        with _lock:
+            rows = _get_conn(CACHE_PATH).execute(
+                "SELECT taxonomy, version, COUNT(*) FROM tags GROUP BY taxonomy, version ORDER BY 1, 3 DESC"
+            ).fetchall()
+        if not rows:
+            print("캐시가 비어 있습니다.")
+        for taxonomy, version, count in rows:
+            print(f"   - {taxonomy} ({version}): {count:,}개")
+
+
+if __name__ == '__main__':
+    main()
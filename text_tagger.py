@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+정규식 택소노미 태깅 엔진
+- 여러 택소노미(여정 단계/동기/장벽 등)의 패턴을 한 번만 컴파일
+- 코퍼스를 한 번 순회하며 모든 택소노미를 동시에 태깅
+- 결과는 (문서 × 라벨) 희소 행렬로 반환
+"""
+
+import re
+
+import numpy as np
+from scipy import sparse
+
+
+def build_tagger(taxonomies, flags=re.IGNORECASE):
+    """택소노미 패턴을 미리 컴파일한 태거 생성
+
+    패턴을 하나의 거대한 alternation 으로 합치면 CPython re 의 리터럴 접두어 고속 탐색이
+    꺼져 오히려 느려지므로, 패턴 단위로 한 번만 컴파일해 두고 라벨 단위로 short-circuit 한다.
+
+    Args:
+        taxonomies: {택소노미명: {라벨: [정규식 패턴, ...]}}
+
+    Returns:
+        태거 dict ('labels': [(택소노미, 라벨), ...] 컬럼 순서)
+    """
+    labels = []
+    compiled = []
+    for taxonomy, label_patterns in taxonomies.items():
+        for label, patterns in label_patterns.items():
+            labels.append((taxonomy, label))
+            compiled.append([re.compile(p, flags) for p in patterns])
+
+    return {
+        'labels': labels,
+        'taxonomies': list(taxonomies.keys()),
+        'compiled': compiled,
+    }
+
+
+def tag_text(tagger, text):
+    """텍스트 하나에서 매칭된 라벨 컬럼 인덱스 리스트 반환 (컬럼 순서)"""
+    if not isinstance(text, str):
+        return []
+    return [
+        column for column, patterns in enumerate(tagger['compiled'])
+        if any(p.search(text) for p in patterns)
+    ]
+
+
+def tag_corpus(tagger, texts):
+    """코퍼스 전체를 한 번 순회하며 태깅
+
+    Returns:
+        (문서 수 × 라벨 수) scipy.sparse.csr_matrix (bool)
+    """
+    indptr = [0]
+    indices = []
+    for text in texts:
+        indices.extend(tag_text(tagger, text))
+        indptr.append(len(indices))
+
+    data = np.ones(len(indices), dtype=bool)
+    return sparse.csr_matrix(
+        (data, np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(tagger['labels']))
+    )
+
+
+def label_columns(tagger, taxonomy):
+    """특정 택소노미에 속한 (컬럼 인덱스, 라벨) 리스트"""
+    return [(i, label) for i, (tax, label) in enumerate(tagger['labels']) if tax == taxonomy]